@@ -1,12 +1,103 @@
-from fastapi import FastAPI
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from routers import calendar_events
+from fastapi.responses import JSONResponse, PlainTextResponse
+from deps import close_principal_cache, get_current_user
+from routers import calendar_events, meetings, recall_webhooks
+from utils.logging.logging_utils import get_logger
+from utils.metrics.metrics_utils import REGISTRY
+from utils.monitoring.loop_monitor import EventLoopMonitor
+from utils.tracing.tracing_utils import TRACER, TracingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the database engine, clients and scheduler, and tear them down.
+
+    Nothing that opens a connection or starts a thread runs at import time;
+    the database, Nylas, Redis and Slack modules are imported here so that
+    importing the app costs little more than importing FastAPI. The time
+    spent in each step is logged and kept on ``app.state.startup_report``.
+
+    Each step registers its teardown as soon as it has started, so a step
+    that raises unwinds the ones before it in reverse order.
+    """
+    logger = get_logger("AppLifespan")
+    report = {}
+    started = time.perf_counter()
+
+    async with AsyncExitStack() as stack:
+        stack.callback(logger.info, "Application shutdown complete")
+
+        step_started = time.perf_counter()
+        TRACER.configure()
+        stack.callback(TRACER.shutdown)
+        report["tracing_seconds"] = round(time.perf_counter() - step_started, 4)
+
+        step_started = time.perf_counter()
+        app.state.loop_monitor.start()
+        stack.push_async_callback(app.state.loop_monitor.stop)
+        report["loop_monitor_seconds"] = round(time.perf_counter() - step_started, 4)
+
+        step_started = time.perf_counter()
+        from db.sessions import dispose_async_engine, get_async_engine
+        from utils.metrics.pipeline_metrics import watch_db_pool, watch_redis_pool
+
+        stack.push_async_callback(dispose_async_engine)
+        stack.callback(watch_db_pool(get_async_engine()))
+        report["database_seconds"] = round(time.perf_counter() - step_started, 4)
+
+        step_started = time.perf_counter()
+        from src.cron_scheduler.scheduler_service import SchedulerService
+
+        scheduler_service = SchedulerService()
+        await scheduler_service.start()
+        stack.callback(setattr, app.state, "scheduler_service", None)
+        stack.push_async_callback(scheduler_service.shutdown)
+        app.state.scheduler_service = scheduler_service
+        report["scheduler_seconds"] = round(time.perf_counter() - step_started, 4)
+
+        step_started = time.perf_counter()
+        from src.meetings.meeting_versions import MeetingVersions
+        from src.meetings.meetings_service import MeetingsService
+        from src.recall.bot_status_service import BotStatusService
+        from utils.redis.redis_utils import RedisManager
+
+        stack.push_async_callback(close_principal_cache)
+        cache_manager = RedisManager()
+        stack.push_async_callback(cache_manager.close)
+        stack.callback(watch_redis_pool("api", cache_manager.pool))
+        meeting_versions = MeetingVersions(cache_manager)
+        app.state.meetings_service = MeetingsService(meeting_versions)
+        stack.callback(setattr, app.state, "meetings_service", None)
+        bot_status_service = BotStatusService(meeting_versions)
+        bot_status_service.start()
+        stack.callback(setattr, app.state, "bot_status_service", None)
+        stack.push_async_callback(bot_status_service.stop)
+        app.state.bot_status_service = bot_status_service
+        report["api_services_seconds"] = round(time.perf_counter() - step_started, 4)
+
+        report["total_seconds"] = round(time.perf_counter() - started, 4)
+        app.state.startup_report = report
+        logger.info("Application startup complete", **report)
+
+        yield
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Editor Worker FastAPI Backend")
+    app = FastAPI(title="Editor Worker FastAPI Backend", lifespan=lifespan)
 
     app.include_router(calendar_events.router)
+    app.include_router(recall_webhooks.router)
+    app.include_router(meetings.router)
+
+    loop_monitor = EventLoopMonitor()
+    app.state.loop_monitor = loop_monitor
+    app.state.scheduler_service = None
+    app.state.bot_status_service = None
+    app.state.meetings_service = None
+    app.state.startup_report = {}
 
     # For local development
     origins = [
@@ -20,10 +111,52 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(TracingMiddleware)
 
     # Generic health route to sanity check the API
     @app.get("/health")
     async def health() -> str:
         return "ok"
 
+    # Readiness degrades while the event loop is persistently lagging
+    @app.get("/ready")
+    async def ready() -> JSONResponse:
+        if loop_monitor.is_degraded():
+            return JSONResponse(
+                {"status": "degraded", "lag_seconds": loop_monitor.percentiles()},
+                status_code=503,
+            )
+        return JSONResponse({"status": "ok"})
+
+    # Blocking-call stack traces; only for authenticated users
+    @app.get("/debug/event-loop", dependencies=[Depends(get_current_user)])
+    async def event_loop_status() -> dict:
+        return loop_monitor.status()
+
+    @app.get("/debug/startup")
+    async def startup_report() -> dict:
+        return app.state.startup_report
+
+    # Traces kept in memory by the tracer, slowest first. Span attributes
+    # carry user and event ids, so these require an authenticated user.
+    @app.get("/debug/traces", dependencies=[Depends(get_current_user)])
+    async def list_traces() -> dict:
+        if not TRACER.enabled:
+            raise HTTPException(status_code=404, detail="Tracing is disabled")
+        return {"sample_ratio": TRACER.sample_ratio, "traces": TRACER.memory.traces()}
+
+    @app.get("/debug/traces/{trace_id}", dependencies=[Depends(get_current_user)])
+    async def get_trace(trace_id: str) -> dict:
+        spans = TRACER.memory.get_trace(trace_id) if TRACER.enabled else []
+        if not spans:
+            raise HTTPException(status_code=404, detail="Trace not found")
+        return {"trace_id": trace_id, "spans": spans}
+
+    # Prometheus scrape target; metrics are only rendered on request
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(
+            REGISTRY.render(), media_type="text/plain; version=0.0.4"
+        )
+
     return app
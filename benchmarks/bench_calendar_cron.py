@@ -0,0 +1,252 @@
+"""Benchmark process_fetch_calendar_events against local provider stand-ins.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.bench_calendar_cron --scenario small
+    python -m benchmarks.bench_calendar_cron --scenario default --ticks 3
+    python -m benchmarks.bench_calendar_cron --scenario small --update-baseline
+
+Nylas, Recall and Slack are served by a fake API process (see
+``benchmarks/fake_providers.py``); Postgres and Redis are replaced by
+in-process fakes. The run reports tick latency, event throughput, API call
+counts and peak RSS, and exits non-zero when a result regresses against
+``benchmarks/baseline.json`` by more than the tolerance.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+SCENARIOS = {
+    "small": {
+        "users": 500,
+        "events": 2500,
+        "latency_ms": "nylas=5,recall=10,slack=5",
+    },
+    "default": {
+        "users": 10000,
+        "events": 50000,
+        "latency_ms": "nylas=2,recall=5,slack=2",
+    },
+}
+
+PROVIDERS = ("nylas", "recall", "slack")
+
+
+def _parse_provider_values(spec: str) -> dict:
+    values = {}
+    for item in (spec or "").split(","):
+        provider, _, value = item.strip().partition("=")
+        if provider and value:
+            values[provider.strip()] = float(value)
+    return values
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(base_url: str, timeout: float = 120.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/__bench/calls", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("Fake provider server did not start")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _run_ticks(service, ticks: int, tick_interval: float):
+    durations = []
+    try:
+        for tick in range(ticks):
+            if tick and tick_interval:
+                await asyncio.sleep(tick_interval)
+            started = time.perf_counter()
+            await service.process_fetch_calendar_events(session=None)
+            durations.append(time.perf_counter() - started)
+    finally:
+        await service.aclose()
+    return durations
+
+
+def run_benchmark(args) -> dict:
+    from benchmarks.fake_providers import serve_fake_providers
+    from benchmarks.population import generate_population
+
+    now = int(datetime.now(timezone.utc).timestamp())
+    population_options = {"users": args.users, "events": args.events, "seed": args.seed, "now": now}
+    latency = _parse_provider_values(args.latency_ms)
+    error_rate = _parse_provider_values(args.error_rate)
+    rate_limit_rate = _parse_provider_values(args.rate_limit_rate)
+    behaviours = {
+        provider: {
+            "latency_ms": latency.get(provider, 0.0),
+            "error_rate": error_rate.get(provider, 0.0),
+            "rate_limit_rate": rate_limit_rate.get(provider, 0.0),
+        }
+        for provider in PROVIDERS
+    }
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(
+        target=serve_fake_providers,
+        args=(port, population_options, behaviours, args.seed),
+        daemon=True,
+    )
+    server.start()
+    try:
+        # The service reads its configuration from the environment
+        os.environ.update(
+            {
+                "NYLAS_API_URI": f"{base_url}/nylas",
+                "NYLAS_API_KEY": "bench",
+                "RECALL_API_BASE": f"{base_url}/recall/api",
+                "RECALL_API_KEY": "bench",
+                "SLACK_BOT_TOKEN": "xoxb-bench",
+                "SLACK_API_BASE_URL": f"{base_url}/slack/api/",
+                "CALENDAR_TICK_BUDGET_SECONDS": str(args.tick_budget),
+            }
+        )
+        os.environ.setdefault("LOG_LEVEL", "ERROR")
+        from benchmarks.fakes import BenchmarkCalendarCronService
+
+        population = generate_population(**population_options)
+        _wait_for_server(base_url)
+
+        calls: Counter = Counter()
+        service = BenchmarkCalendarCronService(
+            population, calls, db_latency_ms=args.db_latency_ms, redis_latency_ms=args.redis_latency_ms
+        )
+        durations = asyncio.run(_run_ticks(service, args.ticks, args.tick_interval))
+        calls.update(httpx.get(f"{base_url}/__bench/calls", timeout=10.0).json())
+    finally:
+        server.terminate()
+        server.join(timeout=10)
+
+    total_time = sum(durations)
+    return {
+        "users": args.users,
+        "events": population.event_count,
+        "ticks": len(durations),
+        "tick_seconds": [round(duration, 4) for duration in durations],
+        "first_tick_seconds": round(durations[0], 4),
+        "tick_p50_seconds": round(statistics.median(durations), 4),
+        "tick_max_seconds": round(max(durations), 4),
+        "events_per_second": round(population.event_count / durations[0], 1) if durations[0] else 0.0,
+        "total_seconds": round(total_time, 4),
+        "api_calls": dict(sorted(calls.items())),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def compare_with_baseline(result: dict, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of ``result`` against ``baseline``."""
+    regressions = []
+    for key in ("first_tick_seconds", "tick_p50_seconds", "peak_rss_mb"):
+        if key in baseline and result[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f"{key}: {result[key]} > {baseline[key]} (+{tolerance:.0%})")
+    if "events_per_second" in baseline and result["events_per_second"] < baseline["events_per_second"] * (1 - tolerance):
+        regressions.append(
+            f"events_per_second: {result['events_per_second']} < {baseline['events_per_second']} (-{tolerance:.0%})"
+        )
+    for name, count in result["api_calls"].items():
+        expected = baseline.get("api_calls", {}).get(name)
+        if expected is not None and count > expected * (1 + tolerance):
+            regressions.append(f"api_calls[{name}]: {count} > {expected}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--events", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ticks", type=int, default=3)
+    parser.add_argument("--tick-interval", type=float, default=0.0, help="Seconds to wait between ticks")
+    parser.add_argument("--tick-budget", type=float, default=3600.0, help="CALENDAR_TICK_BUDGET_SECONDS for the run")
+    parser.add_argument("--latency-ms", help="Per-provider latency, e.g. nylas=5,recall=10,slack=5")
+    parser.add_argument("--error-rate", default="", help="Per-provider 5xx rate, e.g. nylas=0.01")
+    parser.add_argument("--rate-limit-rate", default="", help="Per-provider 429 rate, e.g. slack=0.05")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    parser.add_argument("--redis-latency-ms", type=float, default=0.2)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print the raw result as JSON")
+    args = parser.parse_args(argv)
+
+    scenario = SCENARIOS[args.scenario]
+    args.users = args.users or scenario["users"]
+    args.events = args.events or scenario["events"]
+    args.latency_ms = args.latency_ms if args.latency_ms is not None else scenario["latency_ms"]
+
+    result = run_benchmark(args)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"scenario            {args.scenario} ({result['users']} users, {result['events']} events)")
+        print(f"first tick          {result['first_tick_seconds']}s")
+        print(f"tick p50 / max      {result['tick_p50_seconds']}s / {result['tick_max_seconds']}s")
+        print(f"throughput          {result['events_per_second']} events/s")
+        print(f"peak RSS            {result['peak_rss_mb']} MiB")
+        print("api calls")
+        for name, count in result["api_calls"].items():
+            print(f"  {name:<32}{count}")
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    # Only the preset configurations are comparable to a stored baseline
+    is_preset = (
+        (args.users, args.events, args.latency_ms) == (scenario["users"], scenario["events"], scenario["latency_ms"])
+        and not args.error_rate
+        and not args.rate_limit_rate
+    )
+    scenario_key = args.scenario if is_preset else None
+
+    if args.update_baseline:
+        if scenario_key is None:
+            print("Refusing to store a baseline for a customised scenario", file=sys.stderr)
+            return 2
+        baselines[scenario_key] = {key: value for key, value in result.items() if key != "tick_seconds"}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline for '{scenario_key}' written to {args.baseline}")
+        return 0
+
+    if scenario_key and scenario_key in baselines:
+        regressions = compare_with_baseline(result, baselines[scenario_key], args.tolerance)
+        if regressions:
+            print("REGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against baseline '{scenario_key}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import asyncio
+import random
+import uuid
+from urllib.parse import parse_qs
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from benchmarks.population import Population
+
+
+@dataclass
+class ProviderBehaviour:
+    """How a fake provider responds: latency, failures and rate limiting."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+
+
+def _nylas_error(status_code: int, error_type: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        {"request_id": uuid.uuid4().hex, "error": {"type": error_type, "message": message}},
+        status_code=status_code,
+    )
+
+
+def _slack_error(status_code: int, error: str) -> JSONResponse:
+    return JSONResponse({"ok": False, "error": error}, status_code=status_code)
+
+
+def _recall_error(status_code: int, detail: str) -> JSONResponse:
+    return JSONResponse({"detail": detail}, status_code=status_code)
+
+
+def create_fake_providers_app(
+    population: Population,
+    behaviours: Dict[str, ProviderBehaviour],
+    seed: int = 42,
+) -> FastAPI:
+    """Build one app that stands in for the Nylas, Recall and Slack APIs.
+
+    Routes are mounted under ``/nylas``, ``/recall/api`` and ``/slack/api``
+    so the real clients can be pointed at them through NYLAS_API_URI,
+    RECALL_API_BASE and SLACK_API_BASE_URL. Every call is counted per
+    provider and endpoint; ``GET /__bench/calls`` returns the counts and
+    ``POST /__bench/reset`` clears them.
+    """
+    app = FastAPI()
+    rng = random.Random(seed)
+    calls: Counter = Counter()
+    users_by_email = {user.email: user for user in population.users}
+
+    async def simulate(provider: str, endpoint: str) -> Optional[str]:
+        calls[f"{provider}.{endpoint}"] += 1
+        behaviour = behaviours.get(provider, ProviderBehaviour())
+        delay = behaviour.latency_ms + rng.uniform(0, behaviour.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        roll = rng.random()
+        if roll < behaviour.rate_limit_rate:
+            calls[f"{provider}.{endpoint}.429"] += 1
+            return "rate_limited"
+        if roll < behaviour.rate_limit_rate + behaviour.error_rate:
+            calls[f"{provider}.{endpoint}.error"] += 1
+            return "error"
+        return None
+
+    def retry_after(provider: str) -> Dict[str, str]:
+        return {"Retry-After": str(behaviours.get(provider, ProviderBehaviour()).retry_after_seconds)}
+
+    @app.get("/nylas/v3/grants/{grant_id}/calendars/{calendar_id}")
+    async def find_calendar(grant_id: str, calendar_id: str):
+        failure = await simulate("nylas", "calendars.find")
+        if failure == "rate_limited":
+            response = _nylas_error(429, "rate_limit_error", "Too many requests")
+            response.headers.update(retry_after("nylas"))
+            return response
+        if failure:
+            return _nylas_error(500, "api_error", "Internal error")
+        return {
+            "request_id": uuid.uuid4().hex,
+            "data": {
+                "id": f"cal-{grant_id}",
+                "grant_id": grant_id,
+                "name": "Primary",
+                "read_only": False,
+                "is_owned_by_user": True,
+                "is_primary": True,
+                "timezone": "UTC",
+                "object": "calendar",
+            },
+        }
+
+    @app.get("/nylas/v3/grants/{grant_id}/events")
+    async def list_events(grant_id: str, start: int, end: int, calendar_id: str = None, limit: int = 200):
+        failure = await simulate("nylas", "events.list")
+        if failure == "rate_limited":
+            response = _nylas_error(429, "rate_limit_error", "Too many requests")
+            response.headers.update(retry_after("nylas"))
+            return response
+        if failure:
+            return _nylas_error(500, "api_error", "Internal error")
+        events = [
+            event
+            for event in population.events_by_grant.get(grant_id, [])
+            if event["when"]["end_time"] > start and event["when"]["start_time"] < end
+        ]
+        return {"request_id": uuid.uuid4().hex, "data": events[:limit], "next_cursor": None}
+
+    @app.post("/recall/api/v1/bot/")
+    async def create_bot(request: Request):
+        failure = await simulate("recall", "bot.create")
+        if failure == "rate_limited":
+            response = _recall_error(429, "Request was throttled.")
+            response.headers.update(retry_after("recall"))
+            return response
+        if failure:
+            return _recall_error(500, "Internal server error")
+        body = await request.json()
+        return JSONResponse(
+            {
+                "id": str(uuid.uuid4()),
+                "meeting_url": body.get("meeting_url"),
+                "bot_name": body.get("bot_name"),
+                "join_at": body.get("join_at"),
+                "status_changes": [],
+            },
+            status_code=201,
+        )
+
+    @app.api_route("/slack/api/users.lookupByEmail", methods=["GET", "POST"])
+    async def lookup_by_email(request: Request):
+        failure = await simulate("slack", "users.lookupByEmail")
+        if failure == "rate_limited":
+            response = _slack_error(429, "ratelimited")
+            response.headers.update(retry_after("slack"))
+            return response
+        if failure:
+            return _slack_error(200, "internal_error")
+        params = dict(request.query_params)
+        if request.method == "POST":
+            # slack_sdk posts form-encoded bodies; parse them without python-multipart
+            params.update({key: values[0] for key, values in parse_qs((await request.body()).decode()).items()})
+        email = params.get("email", "")
+        user = users_by_email.get(email)
+        if user is None:
+            return _slack_error(200, "users_not_found")
+        return {
+            "ok": True,
+            "user": {
+                "id": f"U{user.id:08d}",
+                "profile": {"first_name": user.displayname.split(" ")[0], "email": email},
+            },
+        }
+
+    @app.post("/slack/api/chat.postMessage")
+    async def post_message():
+        failure = await simulate("slack", "chat.postMessage")
+        if failure == "rate_limited":
+            response = _slack_error(429, "ratelimited")
+            response.headers.update(retry_after("slack"))
+            return response
+        if failure:
+            return _slack_error(200, "internal_error")
+        return {"ok": True, "channel": "D0000000", "ts": f"{rng.random():.6f}"}
+
+    @app.get("/__bench/calls")
+    async def get_calls():
+        return dict(calls)
+
+    @app.post("/__bench/reset")
+    async def reset_calls():
+        calls.clear()
+        return {"ok": True}
+
+    return app
+
+
+def serve_fake_providers(port: int, population_options: dict, behaviours: Dict[str, dict], seed: int):
+    """Process entry point: rebuild the population and serve the fake APIs."""
+    import uvicorn
+    from benchmarks.population import generate_population
+
+    population = generate_population(**population_options)
+    app = create_fake_providers_app(
+        population,
+        {provider: ProviderBehaviour(**options) for provider, options in behaviours.items()},
+        seed=seed,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
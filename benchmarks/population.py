@@ -0,0 +1,191 @@
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from db.models.models import User, UserMeetings
+
+DOMAINS = ["acme.io", "globex.com", "initech.com", "umbrella.org", "hooli.xyz"]
+EXTERNAL_DOMAINS = ["gmail.com", "partner.dev", "client.co", "vendor.net"]
+TIMEZONES = ["UTC", "America/New_York", "Europe/London", "Asia/Kolkata", "America/Los_Angeles"]
+# Meeting sizes and how often they occur
+PARTICIPANT_COUNTS = [1, 2, 3, 4, 6, 8, 12, 20, 40]
+PARTICIPANT_WEIGHTS = [20, 30, 18, 10, 8, 6, 4, 3, 1]
+PROVIDERS = ["Zoom Meeting", "Google Meet", "Microsoft Teams"]
+
+
+@dataclass
+class Population:
+    """A synthetic set of users, their UserMeetings rows and their Nylas events."""
+
+    now: int
+    users: List[User] = field(default_factory=list)
+    meetings: List[UserMeetings] = field(default_factory=list)
+    # grant_id -> Nylas event payloads, as the events endpoint returns them
+    events_by_grant: Dict[str, List[dict]] = field(default_factory=dict)
+
+    @property
+    def event_count(self) -> int:
+        return sum(len(events) for events in self.events_by_grant.values())
+
+
+def _meeting_url(rng: random.Random, provider: str, meeting_number: int) -> Tuple[str, Optional[str]]:
+    """Return a join URL and the identifier the cron derives from it."""
+    if provider == "Zoom Meeting":
+        code = str(80000000000 + meeting_number)
+        return f"https://acme.zoom.us/j/{code}?pwd={rng.getrandbits(32):x}", code
+    if provider == "Google Meet":
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        n = meeting_number
+        chars = []
+        for _ in range(10):
+            n, index = divmod(n, 26)
+            chars.append(letters[index])
+        code = f"{''.join(chars[:3])}-{''.join(chars[3:7])}-{''.join(chars[7:])}"
+        return f"https://meet.google.com/{code}", code
+    thread = f"19:meeting_{meeting_number:012d}@thread.v2"
+    return (
+        f"https://teams.microsoft.com/l/meetup-join/{thread.replace(':', '%3a').replace('@', '%40')}/0",
+        thread,
+    )
+
+
+def generate_population(
+    users: int = 10000,
+    events: int = 50000,
+    seed: int = 42,
+    now: int = None,
+    grant_ratio: float = 0.9,
+    conferencing_ratio: float = 0.7,
+    stored_meeting_ratio: float = 0.4,
+    disabled_bot_ratio: float = 0.03,
+) -> Population:
+    """Build a deterministic population for the given seed and ``now``.
+
+    Meetings are generated one at a time: an organizer picked with a
+    long-tailed weight, plus participants drawn mostly from the organizer's
+    company. Every participant with a grant gets a copy of the event on
+    their calendar, so one meeting shows up under several grants exactly
+    like it does in Nylas. Generation stops once ``events`` copies exist.
+    """
+    rng = random.Random(seed)
+    now = now or int(datetime.now(timezone.utc).timestamp())
+    population = Population(now=now)
+
+    by_domain: Dict[str, List[User]] = {domain: [] for domain in DOMAINS}
+    for user_id in range(1, users + 1):
+        domain = DOMAINS[user_id % len(DOMAINS)]
+        has_grant = rng.random() < grant_ratio
+        bot_config = {"bot_name": "Supaloops.app"}
+        if rng.random() < 0.05:
+            bot_config.update(
+                {
+                    "isDisabled": True,
+                    "startTime": now + rng.randint(-3600, 1200),
+                    "endTime": now + rng.randint(1200, 7200),
+                }
+            )
+        user = User(
+            id=user_id,
+            displayname=f"User {user_id}",
+            email=f"user{user_id}@{domain}",
+            tagTree={},
+            sl_id=f"sl-{user_id}",
+            external_id=f"ext-{user_id}",
+            provider="SUPABASE",
+            grant_id=f"grant-{user_id}" if has_grant else None,
+            bot_config=bot_config,
+            timezone=rng.choice(TIMEZONES),
+        )
+        population.users.append(user)
+        by_domain[domain].append(user)
+
+    grant_users = [user for user in population.users if user.grant_id]
+    # Long tail: a few very busy calendars, most nearly empty
+    organizer_weights = [rng.paretovariate(1.2) for _ in grant_users]
+    users_by_email = {user.email: user for user in population.users}
+
+    meeting_number = 0
+    event_number = 0
+    while event_number < events and grant_users:
+        meeting_number += 1
+        organizer = rng.choices(grant_users, organizer_weights)[0]
+        colleagues = by_domain[organizer.email.split("@")[1]]
+        size = rng.choices(PARTICIPANT_COUNTS, PARTICIPANT_WEIGHTS)[0]
+
+        attendee_emails = {organizer.email}
+        for _ in range(size):
+            if rng.random() < 0.8:
+                attendee_emails.add(rng.choice(colleagues).email)
+            else:
+                attendee_emails.add(
+                    f"guest{rng.randint(1, 100000)}@{rng.choice(EXTERNAL_DOMAINS)}"
+                )
+        participants = [
+            {"email": email, "name": None if rng.random() < 0.5 else email.split("@")[0], "status": "yes"}
+            for email in sorted(attendee_emails)
+        ]
+
+        start_time = now + rng.randint(-9, 29) * 60
+        end_time = start_time + rng.choice([15, 30, 45, 60]) * 60
+        ical_uid = f"ical-{meeting_number}@bench"
+        conferencing = None
+        uniq_identifier = None
+        provider = None
+        if rng.random() < conferencing_ratio:
+            provider = rng.choice(PROVIDERS)
+            url, uniq_identifier = _meeting_url(rng, provider, meeting_number)
+            conferencing = {"provider": provider, "details": {"url": url}}
+
+        for email in sorted(attendee_emails):
+            attendee = users_by_email.get(email)
+            if attendee is None or not attendee.grant_id or event_number >= events:
+                continue
+            event_number += 1
+            event = {
+                "id": f"evt-{event_number}",
+                "grant_id": attendee.grant_id,
+                "calendar_id": f"cal-{attendee.grant_id}",
+                "busy": True,
+                "object": "event",
+                "ical_uid": ical_uid,
+                "title": f"Meeting {meeting_number}",
+                "participants": participants,
+                "organizer": {"email": organizer.email, "name": organizer.displayname},
+                "when": {
+                    "object": "timespan",
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "start_timezone": "UTC",
+                    "end_timezone": "UTC",
+                },
+                "created_at": now - 86400,
+                "updated_at": now - rng.randint(60, 86400),
+            }
+            if conferencing:
+                event["conferencing"] = conferencing
+            population.events_by_grant.setdefault(attendee.grant_id, []).append(event)
+
+            if conferencing and rng.random() < stored_meeting_ratio:
+                population.meetings.append(
+                    UserMeetings(
+                        id=len(population.meetings) + 1,
+                        userId=attendee.id,
+                        calendar_uid=ical_uid,
+                        event_url=conferencing["details"]["url"],
+                        title=event["title"],
+                        participants=json.dumps([p["email"] for p in participants]),
+                        start_time=start_time,
+                        end_time=end_time,
+                        timezone=attendee.timezone,
+                        provider=provider,
+                        disable_bot=rng.random() < disabled_bot_ratio,
+                        type="one_time",
+                        createdAt=datetime.fromtimestamp(now - 86400, timezone.utc),
+                        updatedAt=datetime.fromtimestamp(now - 3600, timezone.utc),
+                        start_date=datetime.fromtimestamp(start_time, timezone.utc).date(),
+                        uniq_identifier=uniq_identifier,
+                    )
+                )
+
+    return population
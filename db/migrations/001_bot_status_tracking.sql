@@ -0,0 +1,31 @@
+-- Bot status tracking from Recall webhooks and keyset pagination of /meetings.
+--
+-- Apply once per database with psql, outside a transaction block, since
+-- neither ALTER TYPE ... ADD VALUE (before Postgres 12) nor
+-- CREATE INDEX CONCURRENTLY can run inside one:
+--
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f db/migrations/001_bot_status_tracking.sql
+--
+-- Every statement is idempotent, so the script can be re-run. The service
+-- stores no bot status until the enum values and bot_status_at exist (see
+-- BotStatusSchemaCheck in src/recall/bot_status_service.py).
+
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'SCHEDULED';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'JOINING';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'IN_WAITING_ROOM';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'IN_CALL';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'RECORDING';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'CALL_ENDED';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'DONE';
+ALTER TYPE meetingbotstatus ADD VALUE IF NOT EXISTS 'FAILED';
+
+-- Recall created_at of the stored status; older webhooks do not overwrite it
+ALTER TABLE public."UserMeetings_python" ADD COLUMN IF NOT EXISTS bot_status_at TIMESTAMP WITH TIME ZONE;
+
+-- Recall webhooks update bot_status by bot_id
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "ix_public_UserMeetings_python_bot_id"
+    ON public."UserMeetings_python" (bot_id);
+
+-- Keyset pagination of /meetings on ("userId", start_time, id)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "ix_UserMeetings_python_user_start_id"
+    ON public."UserMeetings_python" ("userId", start_time, id);
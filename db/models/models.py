@@ -9,6 +9,7 @@ from sqlalchemy import (
     Boolean,
     Enum,
     JSON,
+    Index,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -21,7 +22,15 @@ Base = declarative_base()
 # Enum for MeetingBotStatus
 class MeetingBotStatus(enum.Enum):
     NOT_ADDED = "NOT_ADDED"
-    # Add other statuses if needed
+    # A Recall bot was created and is waiting for the meeting
+    SCHEDULED = "SCHEDULED"
+    JOINING = "JOINING"
+    IN_WAITING_ROOM = "IN_WAITING_ROOM"
+    IN_CALL = "IN_CALL"
+    RECORDING = "RECORDING"
+    CALL_ENDED = "CALL_ENDED"
+    DONE = "DONE"
+    FAILED = "FAILED"
 
 
 # User Model
@@ -48,7 +57,11 @@ class User(Base):
 # UserMeetings Model
 class UserMeetings(Base):
     __tablename__ = "UserMeetings_python"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        # Backs the keyset pagination of /meetings
+        Index("ix_UserMeetings_python_user_start_id", "userId", "start_time", "id"),
+        {"schema": "public"},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     userId = Column(
@@ -79,11 +92,14 @@ class UserMeetings(Base):
     end_time = Column(Integer)
     uniq_identifier = Column(Text)
     Agenda = Column(Text)
-    bot_id = Column(Text)
+    # Recall webhooks update bot_status by bot_id
+    bot_id = Column(Text, index=True)
     rough_notes = Column(JSON)
     bot_status = Column(
         Enum(MeetingBotStatus), nullable=False, default=MeetingBotStatus.NOT_ADDED
     )
+    # Recall created_at of the stored bot_status; older webhooks are ignored
+    bot_status_at = Column(DateTime(timezone=True))
 
     # Define relationship to User
     user = relationship("User", back_populates="meetings")
@@ -4,16 +4,11 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.schema import Sequence
-import enum
 from datetime import datetime
 
 
 from db.sessions import Base
-
-# Define Enum for MeetingBotStatus if it's used
-class MeetingBotStatus(enum.Enum):
-    NOT_ADDED = 'NOT_ADDED'
-    # Add other possible values if needed
+from db.models.models import MeetingBotStatus
 
 class UserMeetings(Base):
     __tablename__ = 'UserMeetings'
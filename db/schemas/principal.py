@@ -0,0 +1,18 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class Principal(BaseModel):
+    """The authenticated user as resolved from a token.
+
+    Only columns of the ``User`` row and no relationships, so it is built
+    from a row loaded on an async session without lazy loads and is cheap
+    to cache between requests.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+    displayname: str
+    timezone: Optional[str] = None
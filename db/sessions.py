@@ -1,37 +1,50 @@
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
 )
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Optional
 from asyncio import current_task
 import os
 
-# Static PostgreSQL Database URL
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
+# The engine and session factory are created on first use so importing this
+# module does not open a pool; the app builds them during startup.
+_async_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    # SQL statements are logged through the "sqlalchemy.engine" logger;
+    # enable them with LOG_LEVELS=sqlalchemy.engine=INFO
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(os.getenv("DATABASE_URL"), future=True)
+    return _async_engine
 
-# Create the async engine
-async_engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, echo=True, future=True  # Optional: logs SQL statements
-)
+
+async def dispose_async_engine():
+    global _async_engine, _session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _session_factory = None
 
 
 # Create an async session
 async def create_async_session() -> async_scoped_session[AsyncSession]:
-    async_session = async_scoped_session(
-        async_sessionmaker(
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(
             autocommit=False,
             autoflush=False,
             class_=AsyncSession,
-            bind=async_engine,
+            bind=get_async_engine(),
             expire_on_commit=False,
-        ),
-        scopefunc=current_task,
-    )
-
-    return async_session
+        )
+    return async_scoped_session(_session_factory, scopefunc=current_task)
 
 
 # Dependency to get async session
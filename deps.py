@@ -1,27 +1,59 @@
+import os
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncGenerator
+from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from .utils import ALGORITHM, JWT_SECRET_KEY
-
-from jose import jwt
-from jose.exceptions import JWTError
 from pydantic import ValidationError
-from sqlalchemy import select
-from app.db.models import Users
-from app.db.schemas import users as user_schemas
-from app.db.schemas import auth as auth_schemas
-from app.db import sessions
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-)
+from db.schemas import auth as auth_schemas
+from db.schemas.principal import Principal
+from utils.auth.principal_cache import PrincipalCache
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# python-jose, SQLAlchemy and the models are imported on the first request
+# rather than here, so importing the app and its routers stays cheap
+
+load_dotenv()
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 
 reuseable_oauth = OAuth2PasswordBearer(tokenUrl="/auth/login", scheme_name="JWT")
 
+# Resolved users keyed by token subject; see PrincipalCache for the TTLs
+principal_cache = PrincipalCache(Principal)
+
+
+async def invalidate_current_user(email: str):
+    """Call after a user is updated or deleted so tokens stop resolving to the old row.
+
+    Every code path that writes the ``User`` table must call this. Rows
+    changed outside this service are picked up once the cache TTLs expire.
+    """
+    await principal_cache.invalidate(email)
+
+
+async def close_principal_cache():
+    """Close the principal cache's Redis pool; called from the app lifespan."""
+    await principal_cache.close()
+
+
+async def get_db_session() -> AsyncGenerator["AsyncSession", Any]:
+    from db import sessions
+
+    async for session in sessions.get_async_session():
+        yield session
+
 
 async def get_current_user(
     token: str = Depends(reuseable_oauth),
-    db: AsyncSession = Depends(sessions.get_async_session),
-) -> user_schemas.Users:
+    db: "AsyncSession" = Depends(get_db_session),
+) -> Principal:
+    from jose import jwt
+    from jose.exceptions import JWTError
+
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
         token_data = auth_schemas.TokenPayload(**payload)
@@ -42,13 +74,22 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    q = await db.scalars(select(Users).filter(Users.email == token_data.sub))
-    user = q.first()
+    user = await principal_cache.get(token_data.sub, token_data.exp)
+    if user is not None:
+        return user
+
+    from sqlalchemy import select
+    from db.models.models import User
+
+    q = await db.scalars(select(User).filter(User.email == token_data.sub))
+    db_user = q.first()
 
-    if user is None:
+    if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Could not find user",
         )
 
+    user = Principal.model_validate(db_user, from_attributes=True)
+    await principal_cache.set(token_data.sub, user, token_data.exp)
     return user
@@ -1,13 +1,84 @@
-from fastapi import APIRouter
-from src.cron_scheduler.scheduler_service import SchedulerService
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+from deps import get_current_user
 
 router = APIRouter()
 
-# Create a global instance of SchedulerService
-scheduler_service = SchedulerService()
 
-@router.get("/cron/handle-calendar-events")
-async def handle_calendar_events():
-    # Directly call the async method
-    await scheduler_service.handle_calendar_events_cron()
-    return {"message": "Calendar events handled 2"}
+def _get_scheduler_service(request: Request):
+    # Created and started by the app lifespan, see app.py
+    scheduler_service = getattr(request.app.state, "scheduler_service", None)
+    if scheduler_service is None:
+        raise HTTPException(status_code=503, detail="Scheduler is not running")
+    return scheduler_service
+
+
+@router.get("/cron/handle-calendar-events", status_code=202)
+async def handle_calendar_events(request: Request):
+    scheduler_service = _get_scheduler_service(request)
+    if not scheduler_service.enabled:
+        raise HTTPException(status_code=503, detail="Calendar cron is not enabled on this instance")
+    # Queue a run and return at once; concurrent triggers share a run
+    run = scheduler_service.request_run("manual")
+    return {
+        "message": "Calendar events run queued",
+        "run_id": run.id,
+        "status": run.status,
+        "status_url": str(request.url_for("get_calendar_events_run", run_id=run.id)),
+    }
+
+
+@router.get("/cron/runs")
+async def list_calendar_events_runs(request: Request):
+    return {"runs": [run.to_dict() for run in _get_scheduler_service(request).runs.recent()]}
+
+
+@router.get("/cron/runs/{run_id}")
+async def get_calendar_events_run(request: Request, run_id: str):
+    run = _get_scheduler_service(request).runs.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run.to_dict()
+
+
+# Captures hold call stacks and user ids, so the debug routes require a user
+def _get_flight_recorder_capture(request: Request, capture_id: str):
+    flight_recorder = _get_scheduler_service(request).flight_recorder
+    if not flight_recorder.enabled:
+        raise HTTPException(status_code=404, detail="Flight recorder is disabled")
+    capture = flight_recorder.get_capture(capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail="Capture not found")
+    return capture
+
+
+@router.get("/debug/flight-recorder", dependencies=[Depends(get_current_user)])
+async def list_flight_recorder_captures(request: Request):
+    flight_recorder = _get_scheduler_service(request).flight_recorder
+    if not flight_recorder.enabled:
+        raise HTTPException(status_code=404, detail="Flight recorder is disabled")
+    return {
+        "threshold_seconds": flight_recorder.threshold_seconds,
+        "captures": flight_recorder.list_captures(),
+    }
+
+
+@router.get("/debug/flight-recorder/{capture_id}/collapsed", dependencies=[Depends(get_current_user)])
+async def download_flight_recorder_collapsed(request: Request, capture_id: str):
+    capture = _get_flight_recorder_capture(request, capture_id)
+    return PlainTextResponse(
+        capture.collapsed_stacks(),
+        headers={"Content-Disposition": f'attachment; filename="tick-{capture.id}.collapsed"'},
+    )
+
+
+@router.get("/debug/flight-recorder/{capture_id}/pstats", dependencies=[Depends(get_current_user)])
+async def download_flight_recorder_pstats(request: Request, capture_id: str):
+    capture = _get_flight_recorder_capture(request, capture_id)
+    if capture.profile_stats is None:
+        raise HTTPException(status_code=404, detail="Capture has no profile; set CRON_FLIGHT_RECORDER_PROFILE=true")
+    return Response(
+        capture.profile_stats,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="tick-{capture.id}.pstats"'},
+    )
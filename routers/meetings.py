@@ -0,0 +1,43 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from db.schemas.principal import Principal
+from deps import get_current_user
+
+router = APIRouter()
+
+
+def _get_meetings_service(request: Request):
+    # Created by the app lifespan, see app.py
+    meetings_service = getattr(request.app.state, "meetings_service", None)
+    if meetings_service is None:
+        raise HTTPException(status_code=503, detail="Meetings service is not running")
+    return meetings_service
+
+
+@router.get("/meetings")
+async def list_meetings(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma separated columns to return"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order: Literal["asc", "desc"] = "asc",
+    start_from: Optional[int] = Query(None, description="Only meetings starting at or after this unix time"),
+    start_to: Optional[int] = Query(None, description="Only meetings starting before this unix time"),
+    current_user: Principal = Depends(get_current_user),
+):
+    meetings_service = _get_meetings_service(request)
+    user_id = current_user.id
+    selected_fields = meetings_service.parse_fields(fields)
+
+    etag = await meetings_service.etag(
+        user_id, (selected_fields, limit, cursor, order, start_from, start_to)
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    body = await meetings_service.list_meetings(
+        user_id, selected_fields, limit, cursor, order, start_from, start_to
+    )
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from db.schemas.principal import Principal
+from deps import get_current_user
+
+router = APIRouter()
+
+
+def _get_bot_status_service(request: Request):
+    # Created and started by the app lifespan, see app.py
+    bot_status_service = getattr(request.app.state, "bot_status_service", None)
+    if bot_status_service is None:
+        raise HTTPException(status_code=503, detail="Bot status service is not running")
+    return bot_status_service
+
+
+@router.post("/webhooks/recall/bot-status")
+async def recall_bot_status_webhook(request: Request):
+    # Acknowledge quickly; the update is written with the next batch
+    accepted = _get_bot_status_service(request).receive_webhook(request.headers, await request.body())
+    return {"accepted": accepted}
+
+
+@router.get("/bots/{bot_id}/status")
+async def get_bot_status(request: Request, bot_id: str, current_user: Principal = Depends(get_current_user)):
+    # Only the caller's own meetings; another user's bot looks like a missing one
+    meetings = await _get_bot_status_service(request).get_status(bot_id, current_user.id)
+    if not meetings:
+        raise HTTPException(status_code=404, detail="Bot not found")
+    return {"bot_id": bot_id, "meetings": meetings}
@@ -0,0 +1,79 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _config_windows(bot_config: Optional[dict]) -> Tuple[Tuple[int, int], ...]:
+    """The ``(start, end)`` disable windows a user's ``bot_config`` declares.
+
+    ``disableWindows`` is a list of ``{"startTime", "endTime"}`` objects in
+    epoch seconds; a recurring block is stored as its occurrences. The
+    single ``isDisabled``/``startTime``/``endTime`` window is still read.
+    """
+    bot_config = bot_config or {}
+    windows = []
+    if bot_config.get('isDisabled', False):
+        windows.append((bot_config.get('startTime', 0), bot_config.get('endTime', 0)))
+    for window in bot_config.get('disableWindows') or ():
+        windows.append((window.get('startTime', 0), window.get('endTime', 0)))
+    return tuple(windows)
+
+
+class DisableWindowIndex:
+    """A user's disable windows, sorted and merged into disjoint intervals.
+
+    Windows are half-open ``[start, end)``. Because they are disjoint and
+    sorted, ``ends`` is sorted too and the first window that can overlap a
+    range is found by bisecting it.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, windows: Iterable[Tuple[int, int]]):
+        merged: List[List[int]] = []
+        for start, end in sorted(window for window in windows if window[0] < window[1]):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    def enabled_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split ``[start, end)`` into the sub-ranges no window covers."""
+        ranges = []
+        cursor = start
+        index = bisect_right(self.ends, start)
+        while index < len(self.starts) and self.starts[index] < end:
+            if self.starts[index] > cursor:
+                ranges.append((cursor, self.starts[index]))
+            cursor = max(cursor, self.ends[index])
+            index += 1
+        if cursor < end:
+            ranges.append((cursor, end))
+        return ranges
+
+
+class DisableWindowCache:
+    """Compiled disable windows per user, rebuilt only when the config changes."""
+
+    def __init__(self):
+        # user_id -> (windows the index was built from, index)
+        self._indexes: Dict[int, Tuple[Tuple[Tuple[int, int], ...], DisableWindowIndex]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, user_id: int, bot_config: Optional[dict]) -> DisableWindowIndex:
+        windows = _config_windows(bot_config)
+        entry = self._indexes.get(user_id)
+        if entry is None or entry[0] != windows:
+            entry = self._indexes[user_id] = (windows, DisableWindowIndex(windows))
+        return entry[1]
+
+    def enabled_ranges(self, user_id: int, bot_config: Optional[dict], start: int, end: int) -> List[Tuple[int, int]]:
+        return self.get(user_id, bot_config).enabled_ranges(start, end)
+
+    def forget_users(self, active_user_ids: Iterable[int]):
+        active = set(active_user_ids)
+        for user_id in [user_id for user_id in self._indexes if user_id not in active]:
+            del self._indexes[user_id]
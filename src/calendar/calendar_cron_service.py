@@ -1,87 +1,147 @@
-from typing import List
+import asyncio
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
-import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from utils.redis.redis_utils import RedisManager
 from src.calendar.calendar_service import CalendarService
 from sqlalchemy import update
-from db.models.models import User, UserMeetings
+from db.models.models import MeetingBotStatus, UserMeetings
 from nylas import Client
 from src.slack_notifications.slack_notification_service import SlackNotificationService
+from src.slack_notifications.reminder_ledger import ReminderLedger
+from src.meetings.meeting_versions import MeetingVersions
+from src.recall.bot_status_service import BOT_STATUS_SCHEMA
+from src.calendar.calendar_polling_scheduler import CalendarPollingScheduler
+from src.calendar.event_decision_memo import EventDecision, EventDecisionMemo
+from src.calendar.calendar_work_queue import CalendarWorkQueue
+from src.calendar.bot_disable_windows import DisableWindowCache
+from src.calendar.meeting_identifiers import get_legacy_meeting_identifier, get_meeting_unique_identifier_from_url
+from src.calendar.nylas_event_reader import NylasEventReader
+from src.calendar.calendar_snapshots import EventSnapshot, MeetingSnapshot, ParticipantSnapshot, UserSnapshot
+from utils.logging.logging_utils import get_logger
+from utils.metrics.pipeline_metrics import BOTS_CREATED, EVENTS_SEEN, stage, watch_redis_pool
 import os
+import sys
+import time
+
+# Value of sl_cal_<identifier> while a worker is creating the bot
+BOT_CLAIM_PENDING = "pending"
+
 
 class CalendarCronService:
-    def __init__(self, nylas_api_key: str, nylas_api_uri: str):
-        self.logger = logging.getLogger("CalendarService")
-        self.logger.setLevel(logging.DEBUG)  # Set log level to DEBUG
-        handler = logging.StreamHandler()  # Use StreamHandler to log to console
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+    """Polls calendars, schedules Recall bots and sends Slack reminders.
+
+    ``partition`` is ``(index, count)`` when ticks are split across worker
+    processes: only users with ``id % count == index`` are polled, while
+    all users and meetings are still loaded for matching organizers,
+    participants and reminders. Each partition keeps its own polling
+    schedule.
+    """
+
+    def __init__(self, nylas_api_key: str, nylas_api_uri: str, partition: Optional[Tuple[int, int]] = None):
+        self.logger = get_logger("CalendarCronService")
+        self.partition = partition
         self.nylas_api_key = nylas_api_key
         self.nylas_api_uri = nylas_api_uri
-        self.slack_notification_service = SlackNotificationService()
         self.calendar_service = CalendarService(nylas_api_key, nylas_api_uri)
         self.cache_manager = RedisManager()
+        self.slack_notification_service = SlackNotificationService(self.cache_manager)
+        self._unwatch_redis_pool = watch_redis_pool("cache", self.cache_manager.redis.connection_pool)
+        self.polling_scheduler = CalendarPollingScheduler(self.cache_manager, partition=partition)
+        self.event_memo = EventDecisionMemo()
+        self.disable_windows = DisableWindowCache()
+        self.work_queue = CalendarWorkQueue()
+        self.reminder_ledger = ReminderLedger(self.cache_manager)
+        self.meeting_versions = MeetingVersions(self.cache_manager)
+        self.reminder_semaphore = asyncio.Semaphore(int(os.getenv("REMINDER_FANOUT_CONCURRENCY", "10")))
+        self.tick_budget_seconds = float(os.getenv("CALENDAR_TICK_BUDGET_SECONDS", "8"))
+        self.fetch_budget_share = float(os.getenv("CALENDAR_TICK_FETCH_BUDGET_SHARE", "0.6"))
+        self.primary_calendar_ttl_seconds = int(os.getenv("PRIMARY_CALENDAR_CACHE_TTL_SECONDS", "86400"))
+        self.bot_claim_ttl_seconds = int(os.getenv("BOT_CLAIM_TTL_SECONDS", "120"))
         try:
             self.nylas = Client(
             api_uri= os.getenv("NYLAS_API_URI"),
             api_key=os.getenv("NYLAS_API_KEY")
             )   
         except Exception as e:
-            self.logger.error(f"Nylas Init failed: {e}")
+            self.logger.error("Nylas Init failed", error=str(e))
             self.nylas = None  # Set to None if initialization fails
+        self.nylas_reader = NylasEventReader(self.nylas) if self.nylas is not None else None
 
-    async def get_all_users(self, session: AsyncSession) -> List[User]:
+    async def aclose(self):
+        """Release the connections this service opened."""
+        self._unwatch_redis_pool()
+        await self.cache_manager.close()
+        await self.slack_notification_service.aclose()
+
+    async def get_all_users(self, session: AsyncSession) -> List[UserSnapshot]:
         self.logger.debug("Fetching all users from the database.")
         try:
-            query = select(User)
+            # Only the columns the tick reads, as detached snapshots
+            query = select(*UserSnapshot.COLUMNS)
             self.logger.debug("Executing query to fetch users.")
-            result = await session.execute(query)
-            users = result.scalars().all()
-            self.logger.debug(f"Fetched {len(users)} users from the database.")
+            with stage("user_load", provider="postgres"):
+                result = await session.execute(query)
+                users = [UserSnapshot.from_row(row) for row in result]
+            self.logger.debug("Fetched users from the database.", count=len(users))
             return users
-        except Exception as e:
-            self.logger.error(f"Error fetching users from the database: {e}", exc_info=True)
+        except Exception:
+            self.logger.error("Error fetching users from the database", exc_info=True)
             return []
 
-    async def get_user_meetings(self, user_ids: List[int], start_time: datetime, end_time: datetime, session: AsyncSession) -> List[UserMeetings]:
-        self.logger.debug("Fetching user meetings.")
+    async def get_user_meetings(self, user_ids: List[int], start_time: datetime, end_time: datetime, session: AsyncSession) -> List[MeetingSnapshot]:
+        self.logger.debug("Fetching user meetings.", start_time=start_time, end_time=end_time)
         try:
-            self.logger.debug(start_time)
-            self.logger.debug(end_time)
-            query = select(UserMeetings).filter(
+            query = select(*MeetingSnapshot.COLUMNS).filter(
                 UserMeetings.userId.in_(user_ids),
                 UserMeetings.start_time >= start_time,
                 UserMeetings.end_time <= end_time,
             )
-            result = await session.execute(query)
-            user_meetings = result.scalars().all()
-            self.logger.debug(f"Fetched {len(user_meetings)} user meetings.")
+            with stage("meeting_load", provider="postgres"):
+                result = await session.execute(query)
+                user_meetings = [MeetingSnapshot.from_row(row) for row in result]
+            self.logger.debug("Fetched user meetings.", count=len(user_meetings))
             return user_meetings
-        except Exception as e:
-            self.logger.error(f"Error fetching user meetings: {e}", exc_info=True)
+        except Exception:
+            self.logger.error("Error fetching user meetings", exc_info=True)
             return []
 
     async def update_user_meeting(self, meeting_id: int, bot_id: str, session: AsyncSession) -> bool:
-        self.logger.debug(f"Updating user meeting with ID {meeting_id}.")
+        self.logger.debug("Updating user meeting.", meeting_id=meeting_id)
         try:
-            await session.execute(
-                update(UserMeetings)
-                .where(UserMeetings.id == meeting_id)
-                .values(bot_id=bot_id)
-            )
-            await session.commit()
-            self.logger.info(f"Successfully updated meeting ID {meeting_id} with bot ID {bot_id}.")
-            return True
+            with stage("meeting_update", provider="postgres"):
+                await session.execute(
+                    update(UserMeetings)
+                    .where(UserMeetings.id == meeting_id)
+                    .values(bot_id=bot_id)
+                )
+                await session.commit()
+            self.logger.info("Updated user meeting with bot.", meeting_id=meeting_id, bot_id=bot_id)
         except Exception as e:
-            self.logger.error(f"Error updating user meeting: {e}")
+            self.logger.error("Error updating user meeting", meeting_id=meeting_id, error=str(e))
             return False
 
+        # Separate statement: a status the database cannot store must not lose the bot_id
+        try:
+            if await BOT_STATUS_SCHEMA.ready(session):
+                with stage("meeting_update", provider="postgres"):
+                    # A status already stored from a Recall webhook is newer
+                    await session.execute(
+                        update(UserMeetings)
+                        .where(UserMeetings.id == meeting_id, UserMeetings.bot_status_at.is_(None))
+                        .values(bot_status=MeetingBotStatus.SCHEDULED)
+                    )
+                    await session.commit()
+        except Exception as e:
+            await session.rollback()
+            self.logger.error("Error updating meeting bot status", meeting_id=meeting_id, error=str(e))
+        return True
+
     async def process_fetch_calendar_events(self, session: AsyncSession) -> bool:
-        self.logger.debug("Processing fetch calendar events.")
+        """Run one tick over this service's partition of the users."""
+        partition = self.partition
+        self.logger.debug("Processing fetch calendar events.", partition=partition)
         try:
             
             start_time = int((datetime.now(timezone.utc) - timedelta(minutes=10)).timestamp())
@@ -94,222 +154,300 @@ class CalendarCronService:
             # Filter users with grants
             users_with_grants = list(filter(lambda user: user.grant_id, users))
 
-            self.logger.debug("Users with grants: %d", len(users_with_grants))
+            self.logger.debug("Loaded users with grants.", count=len(users_with_grants))
             user_ids = list(map(lambda user: user.id, users_with_grants))
-            self.logger.debug("Users ID with grants: %d", len(user_ids))
 
             user_meetings = await self.get_user_meetings(user_ids, start_time, end_time, session)
-            print("get user_meetings",user_meetings )
 
-           
+            # Only poll the grants whose adaptive interval has elapsed
+            now = datetime.now(timezone.utc).timestamp()
+            polled_users = users_with_grants
+            if partition is not None:
+                index, count = partition
+                polled_users = [user for user in users_with_grants if user.id % count == index]
+            users_by_grant = {user.grant_id: user for user in polled_users}
+            due_grants = await self.polling_scheduler.due_grants(users_by_grant.keys(), now)
+            self.event_memo.forget_grants(users_by_grant.keys())
+            self.work_queue.discard_grants(users_by_grant.keys())
+            self.disable_windows.forget_users(user.id for user in polled_users)
+            meetings_by_id = {meeting.id: meeting for meeting in user_meetings}
+
+            tick_started = time.monotonic()
+            fetch_deadline = tick_started + self.tick_budget_seconds * self.fetch_budget_share
+            tick_deadline = tick_started + self.tick_budget_seconds
+
+            # Poll users with the soonest known meeting first
+            next_meeting_start = {}
+            for meeting in user_meetings:
+                if meeting.start_time >= now and meeting.start_time < next_meeting_start.get(meeting.userId, sys.maxsize):
+                    next_meeting_start[meeting.userId] = meeting.start_time
+            due_users = sorted(
+                (users_by_grant[grant_id] for grant_id in due_grants),
+                key=lambda user: next_meeting_start.get(user.id, sys.maxsize),
+            )
 
-            self.logger.debug(f"Processing events for {len(users_with_grants)} users.")
-            for user in users_with_grants:
+            self.logger.debug("Fetching events for due users.", due=len(due_users), total=len(users_with_grants))
+            for index, user in enumerate(due_users):
+                if time.monotonic() >= fetch_deadline:
+                    self.logger.warning("Tick fetch budget exhausted, deferring users to the next tick.", deferred=len(due_users) - index)
+                    for deferred_user in due_users[index:]:
+                        self.polling_scheduler.defer(deferred_user.grant_id, now)
+                    break
                 try:
-                    user_bot_config = user.bot_config or {}
-                    fetch_start_time = start_time
-                    fetch_end_time = end_time
-
-                    is_bot_disabled = False
-                    if user_bot_config.get('isDisabled', False):
-                        if start_time > user_bot_config.get('startTime', 0) and end_time < user_bot_config.get('endTime', 0):
-                            is_bot_disabled = True
-                        else:
-                            bot_disable_start_time = user_bot_config.get('startTime', 0)
-                            bot_disable_end_time = user_bot_config.get('endTime', 0)
-
-                            if start_time < bot_disable_start_time and end_time > bot_disable_start_time:
-                                fetch_end_time = bot_disable_start_time
-
-                            if start_time < bot_disable_end_time and end_time > bot_disable_end_time:
-                                fetch_start_time = bot_disable_end_time
-
-                    if not is_bot_disabled:
-                        grant_id = user.grant_id
-                        
-
-                        self.logger.debug(grant_id)
-                        
-                        calendars = self.nylas.calendars.find(identifier=grant_id, calendar_id='primary')
-                      
-                        self.logger.debug("Line 128")
-                        primary_calendar_id = calendars.data.id
-                        print("primary calendar id" , primary_calendar_id)
-                        calendar_events_list_response = self.nylas.events.list(
-                        grant_id,
-                        query_params={
-                        "start": str(fetch_start_time),
-                        "end": str(fetch_end_time),
-                        "calendar_id": primary_calendar_id
-                        }
-                        )
-
-
-                        #print(calendar_events_list_response.data , "calendar_events_list_response")
-                        calendar_events_list = calendar_events_list_response.data
-
-                        print(calendar_events_list,"calendar_events_list")
-
-                        if calendar_events_list:
-                            for calendar_meet in calendar_events_list:
-
-                                print(calendar_meet,"calendar_meet")
-                                try:
-                                    event_url = calendar_meet.conferencing.details['url']
-                                    print("event_url",event_url)
-                                except KeyError:
-                                        event_url = None
-                                
-
-                                if event_url:
-                                   
-                                    organizer = calendar_meet.organizer
-                                    participants = calendar_meet.participants
-                                    print(organizer,"organizer")
-                                    print(participants,"participants")
-                                    
-                                   
-
-                                    if not any(p.email.lower() == organizer['email'].lower() for p in participants):
-                                        participants.append({
-                                            'email': organizer['email'],
-                                            'name': organizer['name'],
-                                            'status': 'noreply',
-                                            'comment': None,
-                                            'phoneNumber': None
-                                        })
-                                        print("I m insode evemt URL")
-
-
-                                    emails_arr = [p.email.lower() for p in participants]
-                                   
-                                    print(emails_arr," this is emails_arr")
-
-                                    is_bot_disabled_for_current_meeting = False
-
-                                    print(user.email, "user email")
-
-                                    matching_meeting = next(
-                                        (meeting for meeting in user_meetings if meeting.calendar_uid == calendar_meet.ical_uid and
-                                         meeting.start_time == calendar_meet.when.start_time and
-                                         user.email in emails_arr),
-                                        None
-                                    )
-                                    print(matching_meeting,"matching_meeting")
-
-                                    if matching_meeting and matching_meeting.disable_bot:
-                                        is_bot_disabled_for_current_meeting = True
-                                        print(is_bot_disabled_for_current_meeting,"is_bot_disabled_for_current_meeting")
-
-                                    if not is_bot_disabled_for_current_meeting:
-                                        meeting_unique_identifier = self.calendar_service.get_meeting_unique_identifier_from_url(event_url, calendar_meet.conferencing.provider)
-                                        print(meeting_unique_identifier,"meeting_unique_identifier")
-                                        if not meeting_unique_identifier:
-                                            meeting_unique_identifier = calendar_meet.ical_uid
-                                            print(meeting_unique_identifier,"meeting_unique_identifier")
-
-                                        cal_cache_key = f'sl_cal_{meeting_unique_identifier}'
-                                        print(cal_cache_key,"cal_cache_key")
-                                        cache_obj = await self.cache_manager.get(cal_cache_key)
-                                        print(cache_obj,"cache_obj")
-                                        
-                                        if not cache_obj:
-                                            print("not cache obj",cache_obj)
-                                            event_start_time = (datetime.fromtimestamp(calendar_meet.when.start_time, timezone.utc) - timedelta(seconds=30)).isoformat()
-                                            print(event_start_time,"event_start_time")
-                                            organizer_user = next((u for u in users_with_grants if u.email.lower() == organizer['email'].lower()), None)
-                                            print(organizer_user,"organizer_user")
-                                            bot_config = organizer_user.bot_config if organizer_user else user.bot_config
-                                            print("🚀 ~ bot_config:", bot_config)
-
-                                            transcription_options = self.calendar_service.get_meeting_transcript_options(calendar_meet.conferencing.provider)
-                                            print("🚀 ~ transcription_options:", transcription_options)
-                                            bot_data = await self.calendar_service.connect_bot_to_event(event_url, event_start_time, bot_config, transcription_options)
-                                            print( "HEre I 'm bot_data",bot_data['data'])
-                                            bot_data['data']['eventLastCheckedTime'] = datetime.utcnow().timestamp()
-                                            print("bot data with time", bot_data['data'])
-
-                                            await self.cache_manager.set(cal_cache_key, str(bot_data['data']), 7200)
-
-                                            
-
-                                            participant_user_ids = [u.id for u in users_with_grants if u.email.lower() in emails_arr]
-                                            print(participant_user_ids,"participant_user_ids")
-                                            bot_user_cache_key = f'sl_bot_metadata_{bot_data['data']["id"]}'
-                                            print(bot_user_cache_key,"bot_user_cache_key")
-                                            connected_user_meetings = []
-
-                                            for meeting in user_meetings:
-
-                                                is_matching_identifier = False
-                                                print("my meeting" , meeting)
-                                                print("data1",meeting.uniq_identifier , meeting_unique_identifier)
-
-                                                if meeting.uniq_identifier:
-
-                                                    is_matching_identifier = meeting.uniq_identifier == meeting_unique_identifier
-                                                    print(is_matching_identifier,"is_matching_identifier")
-                                                else:
-                                                    is_matching_identifier = meeting.calendar_uid == calendar_meet.ical_uid
-                                                    print(is_matching_identifier,"is_matching_identifier")
-    
-                                                is_matching_time = meeting.start_time == calendar_meet.when.start_time
-                                                print(is_matching_time,"is_matching_time")
-
-                                                if is_matching_identifier and is_matching_time:
-                                                    connected_user_meetings.append(meeting)
-                                            print(connected_user_meetings,"connected_user_meetings")
-                                            meeting_ids = [meeting.id for meeting in connected_user_meetings]
-                                            print("meeting_ids",meeting_ids)
-
-                                            await self.cache_manager.set(
-                                                bot_user_cache_key,
-                                                str({
-                                                    'user_id': organizer_user.id if organizer_user else user.id,
-                                                    'ical_uid': calendar_meet.ical_uid,
-                                                    'identifier': meeting_unique_identifier,
-                                                    'title': calendar_meet.title,
-                                                    'provider': calendar_meet.conferencing.provider,
-                                                    'userIds': participant_user_ids,
-                                                    'lastStartTime': calendar_meet.when.start_time,
-                                                    'eventStartTime': event_start_time,
-                                                    'userTimeZone': calendar_meet.when.start_timezone,
-                                                    'participants': participants,
-                                                    'organizer': calendar_meet.organizer,
-                                                    'meetingIds': meeting_ids
-                                                }),
-                                                18000
-                                            )
-
-                                            if connected_user_meetings:
-                                                
-                                                print("Inside connected_user_meetings:", connected_user_meetings)
-                                                for meeting_obj in connected_user_meetings:
-                                                    print("Processing meeting_obj:", meeting_obj)
-                                                    try:
-                                                        print("Updating user meeting with ID:", meeting_obj.id)
-                                                        await self.update_user_meeting(meeting_obj.id, bot_data['data']['id'],session)
-                                                        meeting_reminder_cache_key = f'meeting_reminder:{meeting_obj.id}:{meeting_obj.userId}'
-                                                        print("Generated meeting_reminder_cache_key:", meeting_reminder_cache_key)
-                                                        user_meeting_reminder_cache = await self.cache_manager.get(meeting_reminder_cache_key)
-                                                        print("Fetched user_meeting_reminder_cache:", user_meeting_reminder_cache)
-
-                                                        if not user_meeting_reminder_cache:
-                                                            print("No reminder cache found for meeting_obj.id:", meeting_obj.id)
-                                                            user_obj = next((u for u in users_with_grants if u.id == meeting_obj.userId), None)
-                                                            print("Fetched user_obj:", user_obj)
-                                                            await self.slack_notification_service.send_meeting_reminder_to_user(meeting_obj, user_obj, participants, organizer)
-                                                            print("Sent meeting reminder to user.")
-                                                        else:
-                                                            print(f"Reminder already sent for meeting {meeting_obj.id} to user {meeting_obj.userId}. Skipping...")
-                                                    except Exception as error:
-                                                        print(f"Failed to send reminder for meeting {meeting_obj.id} to user {meeting_obj.userId}. - error => ", error)
-                                        else:
-                                            print('Event already logged')
+                    with stage("user_fetch", user_id=user.id):
+                        calendar_events_list = await self.fetch_user_calendar_events(user, start_time, end_time) or []
+
+                    for calendar_meet in calendar_events_list:
+                        if not self.event_memo.lookup(user.grant_id, calendar_meet.id, calendar_meet.updated_at, meetings_by_id):
+                            self.work_queue.push(user.grant_id, calendar_meet)
+
+                    self.event_memo.retain(user.grant_id, [calendar_meet.id for calendar_meet in calendar_events_list])
+                    await self.polling_scheduler.record_poll(
+                        user.grant_id,
+                        [calendar_meet.start_time for calendar_meet in calendar_events_list if calendar_meet.start_time is not None],
+                        now,
+                    )
+                except Exception as error:
+                    self.logger.error("Error fetching events for user", user_id=user.id, error=str(error))
+                    await self.polling_scheduler.record_failure(user.grant_id, now)
+
+            # Handle queued events, most urgent first, until the tick budget runs out
+            while len(self.work_queue):
+                if time.monotonic() >= tick_deadline:
+                    self.logger.warning("Tick budget exhausted, carrying events over to the next tick.", carried=len(self.work_queue))
+                    break
+                grant_id, calendar_meet = self.work_queue.pop()
+                user = users_by_grant.get(grant_id)
+                if user is None or (calendar_meet.start_time is not None and calendar_meet.start_time < start_time):
+                    continue
+                try:
+                    with stage("event_process", user_id=user.id, event_id=calendar_meet.id):
+                        decision, event_context = await self.classify_calendar_event(user, calendar_meet, users_with_grants, user_meetings)
+                        if decision == EventDecision.NEEDS_ACTION:
+                            # A lost claim stays retryable: the winner may still fail
+                            if await self.schedule_bot_for_event(user, calendar_meet, event_context, users_with_grants, user_meetings, session):
+                                decision = EventDecision.ALREADY_SCHEDULED
+                            else:
+                                decision = EventDecision.CLAIMED_ELSEWHERE
+                    self.event_memo.record(grant_id, calendar_meet.id, calendar_meet.updated_at, decision, event_context.get('matching_meeting'))
                 except Exception as error:
-                    print(f'Error processing events for {user.email} - Failed - => {error}')
+                    self.logger.error("Error processing event", user_id=user.id, event_id=calendar_meet.id, error=str(error))
 
             return True
-        except Exception as e:
-            self.logger.error(f"Error processing calendar events: {e}")
+        except Exception:
+            self.logger.error("Error processing calendar events", exc_info=True)
+            return False
+
+    async def get_primary_calendar_id(self, grant_id: str) -> str:
+        # A grant's primary calendar practically never changes, so the id is
+        # cached in Redis and served in-process on repeat polls
+        cache_key = f"primary_calendar:{grant_id}"
+        primary_calendar_id = await self.cache_manager.get_cached(cache_key)
+        if primary_calendar_id is None:
+            with stage("nylas_find", provider="nylas"):
+                primary_calendar_id = self.nylas_reader.primary_calendar_id(grant_id)
+            await self.cache_manager.set_cached(cache_key, primary_calendar_id, self.primary_calendar_ttl_seconds)
+        return primary_calendar_id
+
+    async def fetch_user_calendar_events(self, user: UserSnapshot, start_time: int, end_time: int) -> List[EventSnapshot]:
+        # Only the parts of the window outside the user's bot-disable windows
+        # are fetched; a fully disabled window costs no Nylas call
+        enabled_ranges = self.disable_windows.enabled_ranges(user.id, user.bot_config, start_time, end_time)
+        if not enabled_ranges:
+            return []
+
+        grant_id = user.grant_id
+
+        # Events come back as plain dicts and are read straight into slotted snapshots
+        primary_calendar_id = await self.get_primary_calendar_id(grant_id)
+        # An event spanning a disable window comes back for both sides
+        events_by_id = {}
+        for fetch_start_time, fetch_end_time in enabled_ranges:
+            try:
+                with stage("nylas_list", provider="nylas"):
+                    events = self.nylas_reader.list_events(
+                        grant_id,
+                        query_params={
+                            "start": str(fetch_start_time),
+                            "end": str(fetch_end_time),
+                            "calendar_id": primary_calendar_id
+                        }
+                    )
+            except Exception:
+                # The cached id may be stale; look it up again on the next poll
+                await self.cache_manager.delete(f"primary_calendar:{grant_id}")
+                raise
+            for event in events:
+                if event["id"] not in events_by_id:
+                    events_by_id[event["id"]] = EventSnapshot.from_payload(event)
+
+        calendar_events_list = list(events_by_id.values())
+        EVENTS_SEEN.inc(len(calendar_events_list))
+        self.logger.debug_sampled("Fetched calendar events.", user_id=user.id, count=len(calendar_events_list))
+        return calendar_events_list
+
+    async def classify_calendar_event(self, user: UserSnapshot, calendar_meet: EventSnapshot, users_with_grants: List[UserSnapshot], user_meetings: List[MeetingSnapshot]):
+        """Decide what the cron has to do for an event without side effects."""
+        event_url = calendar_meet.event_url
+
+        if not event_url:
+            return EventDecision.NO_URL, {}
+
+        organizer = calendar_meet.organizer
+        participants = list(calendar_meet.participants)
+
+        if not any(p.email.lower() == organizer['email'].lower() for p in participants):
+            participants.append(ParticipantSnapshot(
+                email=organizer['email'],
+                name=organizer.get('name'),
+                status='noreply',
+            ))
+
+        emails_arr = [p.email.lower() for p in participants]
+
+        matching_meeting = next(
+            (meeting for meeting in user_meetings if meeting.calendar_uid == calendar_meet.ical_uid and
+             meeting.start_time == calendar_meet.start_time and
+             user.email in emails_arr),
+            None
+        )
+
+        if matching_meeting and matching_meeting.disable_bot:
+            self.logger.debug_sampled("Bot disabled for meeting.", user_id=user.id, event_id=calendar_meet.id, meeting_id=matching_meeting.id)
+            return EventDecision.BOT_DISABLED, {'matching_meeting': matching_meeting}
+
+        meeting_unique_identifier = get_meeting_unique_identifier_from_url(event_url)
+        if not meeting_unique_identifier:
+            meeting_unique_identifier = calendar_meet.ical_uid
+        # Stored rows and live dedupe keys may carry the pre-registry id
+        legacy_identifier = get_legacy_meeting_identifier(event_url, calendar_meet.conferencing_provider) or calendar_meet.ical_uid
+
+        cal_cache_key = f'sl_cal_{meeting_unique_identifier}'
+        cache_obj = await self.cache_manager.get(cal_cache_key)
+        if cache_obj is None and legacy_identifier != meeting_unique_identifier:
+            cache_obj = await self.cache_manager.get(f'sl_cal_{legacy_identifier}')
+
+        if cache_obj == BOT_CLAIM_PENDING:
+            # Another worker is creating the bot; only a stored bot is final
+            self.logger.debug_sampled("Event claimed by another worker.", user_id=user.id, event_id=calendar_meet.id, identifier=meeting_unique_identifier)
+            return EventDecision.CLAIMED_ELSEWHERE, {}
+
+        if cache_obj:
+            self.logger.debug_sampled("Event already logged.", user_id=user.id, event_id=calendar_meet.id, identifier=meeting_unique_identifier)
+            return EventDecision.ALREADY_SCHEDULED, {}
+
+        return EventDecision.NEEDS_ACTION, {
+            'event_url': event_url,
+            'organizer': organizer,
+            'participants': participants,
+            'emails_arr': emails_arr,
+            'meeting_unique_identifier': meeting_unique_identifier,
+            'legacy_identifier': legacy_identifier,
+            'cal_cache_key': cal_cache_key,
+        }
+
+    async def schedule_bot_for_event(self, user: UserSnapshot, calendar_meet: EventSnapshot, event_context: dict, users_with_grants: List[UserSnapshot], user_meetings: List[MeetingSnapshot], session: AsyncSession) -> bool:
+        """Create the bot for an event; False when another worker holds the claim."""
+        event_url = event_context['event_url']
+        organizer = event_context['organizer']
+        participants = event_context['participants']
+        emails_arr = event_context['emails_arr']
+        meeting_unique_identifier = event_context['meeting_unique_identifier']
+        legacy_identifier = event_context['legacy_identifier']
+        cal_cache_key = event_context['cal_cache_key']
+
+        event_start_time = (datetime.fromtimestamp(calendar_meet.start_time, timezone.utc) - timedelta(seconds=30)).isoformat()
+        organizer_user = next((u for u in users_with_grants if u.email.lower() == organizer['email'].lower()), None)
+        bot_config = organizer_user.bot_config if organizer_user else user.bot_config
+
+        # Users in other partitions or an overlapping tick can reach the same
+        # shared meeting; only the caller that claims the key creates a bot
+        if not await self.cache_manager.set_nx(cal_cache_key, BOT_CLAIM_PENDING, self.bot_claim_ttl_seconds):
+            self.logger.debug_sampled("Event claimed by another worker.", user_id=user.id, event_id=calendar_meet.id, identifier=meeting_unique_identifier)
             return False
+
+        transcription_options = self.calendar_service.get_meeting_transcript_options(calendar_meet.conferencing_provider)
+        try:
+            bot_data = await self.calendar_service.connect_bot_to_event(event_url, event_start_time, bot_config, transcription_options)
+        except Exception:
+            await self.cache_manager.delete(cal_cache_key)
+            raise
+        BOTS_CREATED.inc()
+        bot_data['data']['eventLastCheckedTime'] = datetime.utcnow().timestamp()
+        self.logger.info("Bot scheduled for event.", user_id=user.id, event_id=calendar_meet.id, bot_id=bot_data['data']['id'], join_at=event_start_time)
+
+        await self.cache_manager.set(cal_cache_key, str(bot_data['data']), 7200)
+
+        participant_user_ids = [u.id for u in users_with_grants if u.email.lower() in emails_arr]
+        bot_user_cache_key = f"sl_bot_metadata_{bot_data['data']['id']}"
+        connected_user_meetings = []
+
+        for meeting in user_meetings:
+
+            is_matching_identifier = False
+
+            if meeting.uniq_identifier:
+                is_matching_identifier = meeting.uniq_identifier in (meeting_unique_identifier, legacy_identifier)
+            else:
+                is_matching_identifier = meeting.calendar_uid == calendar_meet.ical_uid
+
+            is_matching_time = meeting.start_time == calendar_meet.start_time
+
+            if is_matching_identifier and is_matching_time:
+                connected_user_meetings.append(meeting)
+        meeting_ids = [meeting.id for meeting in connected_user_meetings]
+
+        await self.cache_manager.set(
+            bot_user_cache_key,
+            str({
+                'user_id': organizer_user.id if organizer_user else user.id,
+                'ical_uid': calendar_meet.ical_uid,
+                'identifier': meeting_unique_identifier,
+                'title': calendar_meet.title,
+                'provider': calendar_meet.conferencing_provider,
+                'userIds': participant_user_ids,
+                'lastStartTime': calendar_meet.start_time,
+                'eventStartTime': event_start_time,
+                'userTimeZone': calendar_meet.start_timezone,
+                'participants': participants,
+                'organizer': calendar_meet.organizer,
+                'meetingIds': meeting_ids
+            }),
+            18000
+        )
+
+        if connected_user_meetings:
+            self.logger.debug("Updating connected user meetings.", bot_id=bot_data['data']['id'], meeting_ids=meeting_ids)
+            # AsyncSession is not safe for concurrent use, so writes stay sequential
+            for meeting_obj in connected_user_meetings:
+                await self.update_user_meeting(meeting_obj.id, bot_data['data']['id'], session)
+            await self.meeting_versions.bump(meeting_obj.userId for meeting_obj in connected_user_meetings)
+
+            # Slack name lookups shared by every reminder for this occurrence
+            participant_names = {}
+            await asyncio.gather(*(
+                self.send_reminder_once(meeting_obj, users_with_grants, participants, organizer, participant_names)
+                for meeting_obj in connected_user_meetings
+            ))
+        return True
+
+    async def send_reminder_once(self, meeting_obj: MeetingSnapshot, users_with_grants: List[UserSnapshot], participants, organizer: dict, participant_names: dict):
+        """Send one user's reminder unless the ledger shows it is taken or sent."""
+        user_obj = next((u for u in users_with_grants if u.id == meeting_obj.userId), None)
+        if user_obj is None:
+            self.logger.debug("Reminder recipient has no grant, skipping.", meeting_id=meeting_obj.id, user_id=meeting_obj.userId)
+            return
+
+        async with self.reminder_semaphore:
+            if not await self.reminder_ledger.claim(meeting_obj):
+                self.logger.debug("Reminder already sent, skipping.", meeting_id=meeting_obj.id, user_id=meeting_obj.userId)
+                return
+            try:
+                await self.slack_notification_service.send_meeting_reminder_to_user(
+                    meeting_obj, user_obj, participants, organizer, participant_names
+                )
+            except Exception as error:
+                self.logger.error("Failed to send reminder", meeting_id=meeting_obj.id, user_id=meeting_obj.userId, error=str(error))
+                await self.reminder_ledger.fail(meeting_obj)
+                return
+            await self.reminder_ledger.confirm(meeting_obj)
@@ -0,0 +1,150 @@
+import heapq
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.redis.redis_utils import RedisManager
+from utils.logging.logging_utils import get_logger
+
+
+class CalendarPollingScheduler:
+    """Decides which grants are due for a Nylas poll on a given tick.
+
+    Every grant has its own polling interval. The interval doubles after a
+    fetch that returned no events and shrinks towards the floor as the next
+    meeting gets closer, always staying between the configured floor and
+    ceiling. Next-due times are kept in a min-heap and mirrored to a Redis
+    hash so that a restart does not reset every grant to the floor.
+
+    A scheduler for one ``(index, count)`` partition of the users owns the
+    hash ``calendar_poll_schedule:{index}/{count}``, so pruning the grants
+    it no longer polls never touches another partition's entries. Changing
+    the partition count starts every grant from the floor again.
+    """
+
+    REDIS_KEY = "calendar_poll_schedule"
+
+    def __init__(
+        self,
+        cache_manager: RedisManager,
+        min_interval: Optional[int] = None,
+        max_interval: Optional[int] = None,
+        partition: Optional[Tuple[int, int]] = None,
+    ):
+        self.logger = get_logger("CalendarPollingScheduler")
+        self.cache_manager = cache_manager
+        self.redis_key = self.REDIS_KEY if partition is None else f"{self.REDIS_KEY}:{partition[0]}/{partition[1]}"
+        self.min_interval = min_interval or int(
+            os.getenv("CALENDAR_POLL_MIN_INTERVAL_SECONDS", "10")
+        )
+        self.max_interval = max(
+            self.min_interval,
+            max_interval or int(os.getenv("CALENDAR_POLL_MAX_INTERVAL_SECONDS", "300")),
+        )
+        # grant_id -> (next_due, interval)
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        # grant_id -> next_due of grants handed out by due_grants() and not
+        # yet recorded; they go back on the heap if the tick never records them
+        self._outstanding: Dict[str, float] = {}
+        self._loaded = False
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _schedule(self, grant_id: str, next_due: float, interval: float):
+        self._outstanding.pop(grant_id, None)
+        self._state[grant_id] = (next_due, interval)
+        heapq.heappush(self._heap, (next_due, grant_id))
+
+    async def load(self):
+        if self._loaded:
+            return
+        try:
+            stored = await self.cache_manager.hgetall(self.redis_key)
+        except Exception as e:
+            self.logger.error("Failed to load polling schedule from Redis", error=str(e))
+            stored = {}
+        for grant_id, value in (stored or {}).items():
+            try:
+                next_due, interval = value.split(":", 1)
+                self._schedule(grant_id, float(next_due), self._clamp(float(interval)))
+            except ValueError:
+                continue
+        self._loaded = True
+        self.logger.debug("Loaded polling schedule.", grants=len(self._state))
+
+    async def due_grants(self, grant_ids: Iterable[str], now: float) -> List[str]:
+        """Pop every known grant whose next poll is due, earliest first.
+
+        Grants seen for the first time are due immediately. Grants that are
+        no longer in ``grant_ids`` are forgotten. A grant handed out by an
+        earlier call that was never recorded with ``record_poll()``,
+        ``record_failure()`` or ``defer()``, e.g. because that tick was
+        cancelled, is due again.
+        """
+        await self.load()
+        active = set(grant_ids)
+
+        for grant_id, next_due in self._outstanding.items():
+            heapq.heappush(self._heap, (next_due, grant_id))
+        self._outstanding.clear()
+
+        removed = [grant_id for grant_id in self._state if grant_id not in active]
+        for grant_id in removed:
+            del self._state[grant_id]
+        if removed:
+            try:
+                await self.cache_manager.hdel(self.redis_key, *removed)
+            except Exception as e:
+                self.logger.error("Failed to prune polling schedule", error=str(e))
+
+        for grant_id in active:
+            if grant_id not in self._state:
+                self._schedule(grant_id, now, self.min_interval)
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_due, grant_id = heapq.heappop(self._heap)
+            state = self._state.get(grant_id)
+            # Skip heap entries superseded by a later reschedule
+            if state is None or state[0] != next_due:
+                continue
+            self._outstanding[grant_id] = next_due
+            due.append(grant_id)
+        return due
+
+    def next_interval(
+        self, grant_id: str, event_start_times: Iterable[int], now: float
+    ) -> float:
+        previous = self._state.get(grant_id, (now, self.min_interval))[1]
+        start_times = list(event_start_times)
+        if not start_times:
+            return self._clamp(previous * 2)
+
+        upcoming = [start for start in start_times if start > now]
+        if not upcoming:
+            return self.min_interval
+        # Poll at least twice before the next meeting starts
+        return self._clamp((min(upcoming) - now) / 2)
+
+    async def record_poll(
+        self, grant_id: str, event_start_times: Iterable[int], now: float
+    ):
+        interval = self.next_interval(grant_id, event_start_times, now)
+        await self._reschedule(grant_id, now + interval, interval)
+
+    def defer(self, grant_id: str, now: float):
+        """Keep a popped grant due so that the next tick polls it first."""
+        interval = self._state.get(grant_id, (now, self.min_interval))[1]
+        self._schedule(grant_id, now, interval)
+
+    async def record_failure(self, grant_id: str, now: float):
+        await self._reschedule(grant_id, now + self.min_interval, self.min_interval)
+
+    async def _reschedule(self, grant_id: str, next_due: float, interval: float):
+        self._schedule(grant_id, next_due, interval)
+        try:
+            await self.cache_manager.hset(
+                self.redis_key, {grant_id: f"{next_due}:{interval}"}
+            )
+        except Exception as e:
+            self.logger.error("Failed to persist polling schedule", grant_id=grant_id, error=str(e))
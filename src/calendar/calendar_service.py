@@ -1,9 +1,10 @@
-from typing import Dict, Any, Optional
-from urllib.parse import urlparse, unquote
+from typing import Dict, Any
 from fastapi import HTTPException
 import httpx
 import os
 from dotenv import load_dotenv
+from utils.logging.logging_utils import get_logger
+from utils.metrics.pipeline_metrics import stage
 
 load_dotenv()
 
@@ -12,11 +13,11 @@ class CalendarService:
     def __init__(self, nylas_api_key: str, nylas_api_uri: str):
         self.nylas_api_key = nylas_api_key
         self.nylas_api_uri = nylas_api_uri
+        self.logger = get_logger("CalendarService")
 
     async def connect_bot_to_event(self, event_url: str, event_start_time: str, bot_config: Dict[str, Any], transcription_options: Dict[str, Any]) -> Dict[str, Any]:
         api_url = f"{os.getenv('RECALL_API_BASE')}/v1/bot/"
-        print(f"API URL: {api_url}")
-        
+
         req_body = {
             "transcription_options": transcription_options,
             "chat": {
@@ -42,48 +43,28 @@ class CalendarService:
             "bot_name": bot_config.get("bot_name"),
             "join_at": event_start_time,
         }
-        print(f"Request Body: {req_body}")
 
         headers = {
             "Authorization": f"Token {os.getenv('RECALL_API_KEY')}",
         }
-        print(f"Headers: {headers}")
 
         async with httpx.AsyncClient() as client:
             try:
-                print("Sending POST request...")
-                response = await client.post(api_url, json=req_body, headers=headers)
-                print(f"Response received: {response.status_code} - {response.text}")
-                response.raise_for_status()  # Raises HTTPError for bad responses (4xx and 5xx)
+                with stage("recall_create", provider="recall"):
+                    response = await client.post(api_url, json=req_body, headers=headers)
+                    self.logger.debug("Recall bot create responded.", status_code=response.status_code, join_at=event_start_time)
+                    response.raise_for_status()  # Raises HTTPError for bad responses (4xx and 5xx)
                 return {"data": response.json()}
             except httpx.HTTPStatusError as e:
                 error_msg = e.response.json().get("detail", e.response.reason_phrase)
-                print(f"HTTPStatusError: {error_msg}")
+                self.logger.error("Recall bot create failed", status_code=e.response.status_code, error=str(error_msg))
                 if isinstance(error_msg, dict):
                     error_msg = error_msg.get(0, {}).get("msg", "Unknown error")
                 raise HTTPException(status_code=e.response.status_code, detail=error_msg)
             except httpx.RequestError as e:
-                print(f"RequestError: {e}")
+                self.logger.error("Recall bot create request error", error=str(e))
                 raise HTTPException(status_code=500, detail=f"Request error: {e}")
 
-    def get_meeting_unique_identifier_from_url(self, meeting_url: str, provider: str) -> Optional[str]:
-        unique_id = None
-        try:
-            if provider == 'Microsoft Teams':
-                # Handle Microsoft Teams URL parsing if needed
-                pass
-            else:
-                # Parse URL to extract unique identifier
-                parsed_url = urlparse(unquote(meeting_url))
-                path_parts = parsed_url.path.strip('/').split('/')
-                unique_id = path_parts[-1] if path_parts else None
-                
-        except Exception as e:
-            # Handle any errors (optional: log the error)
-            print(f"Error parsing meeting URL: {e}")
-        
-        return unique_id
-
     def get_meeting_transcript_options(self, provider: str) -> Dict[str, Any]:
         transcription_options = {'provider': 'meeting_captions'}
         
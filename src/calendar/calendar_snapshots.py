@@ -0,0 +1,145 @@
+from typing import Optional, Tuple
+from db.models.models import User, UserMeetings
+
+
+class UserSnapshot:
+    """The columns of a User row the cron reads, detached from any session."""
+
+    __slots__ = ("id", "email", "grant_id", "bot_config", "timezone")
+
+    COLUMNS = (User.id, User.email, User.grant_id, User.bot_config, User.timezone)
+
+    def __init__(self, id: int, email: str, grant_id: Optional[str], bot_config: Optional[dict], timezone: Optional[str]):
+        self.id = id
+        self.email = email
+        self.grant_id = grant_id
+        self.bot_config = bot_config
+        self.timezone = timezone
+
+    @classmethod
+    def from_row(cls, row) -> "UserSnapshot":
+        return cls(row.id, row.email, row.grant_id, row.bot_config, row.timezone)
+
+
+class MeetingSnapshot:
+    """The columns of a UserMeetings row the cron and reminders read.
+
+    Attribute names match the ORM model, so code written against
+    ``UserMeetings`` keeps working.
+    """
+
+    __slots__ = (
+        "id", "userId", "calendar_uid", "event_url", "title", "start_time",
+        "end_time", "timezone", "provider", "disable_bot", "uniq_identifier", "updatedAt",
+    )
+
+    COLUMNS = (
+        UserMeetings.id, UserMeetings.userId, UserMeetings.calendar_uid, UserMeetings.event_url,
+        UserMeetings.title, UserMeetings.start_time, UserMeetings.end_time, UserMeetings.timezone,
+        UserMeetings.provider, UserMeetings.disable_bot, UserMeetings.uniq_identifier, UserMeetings.updatedAt,
+    )
+
+    def __init__(self, id, userId, calendar_uid, event_url, title, start_time, end_time, timezone, provider, disable_bot, uniq_identifier, updatedAt):
+        self.id = id
+        self.userId = userId
+        self.calendar_uid = calendar_uid
+        self.event_url = event_url
+        self.title = title
+        self.start_time = start_time
+        self.end_time = end_time
+        self.timezone = timezone
+        self.provider = provider
+        self.disable_bot = disable_bot
+        self.uniq_identifier = uniq_identifier
+        self.updatedAt = updatedAt
+
+    @classmethod
+    def from_row(cls, row) -> "MeetingSnapshot":
+        return cls(
+            row.id, row.userId, row.calendar_uid, row.event_url, row.title, row.start_time,
+            row.end_time, row.timezone, row.provider, row.disable_bot, row.uniq_identifier, row.updatedAt,
+        )
+
+
+class ParticipantSnapshot:
+    """An event participant as Nylas returns it."""
+
+    __slots__ = ("email", "status", "name", "comment", "phone_number")
+
+    def __init__(self, email: str, status: Optional[str] = None, name: Optional[str] = None, comment: Optional[str] = None, phone_number: Optional[str] = None):
+        self.email = email
+        self.status = status
+        self.name = name
+        self.comment = comment
+        self.phone_number = phone_number
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ParticipantSnapshot":
+        return cls(
+            payload.get("email"),
+            payload.get("status"),
+            payload.get("name"),
+            payload.get("comment"),
+            payload.get("phone_number"),
+        )
+
+    def __repr__(self) -> str:
+        # Same text as the SDK's Participant; it ends up in sl_bot_metadata_* values
+        return (
+            f"Participant(email={self.email!r}, status={self.status!r}, name={self.name!r}, "
+            f"comment={self.comment!r}, phone_number={self.phone_number!r})"
+        )
+
+
+class EventSnapshot:
+    """The fields of a Nylas event the cron reads, built from the raw payload.
+
+    ``start_time`` is None for all-day events, which carry a date instead.
+    ``organizer`` stays the ``{"email", "name"}`` dict Nylas sends.
+    """
+
+    __slots__ = (
+        "id", "ical_uid", "title", "updated_at", "start_time", "start_timezone",
+        "conferencing_provider", "event_url", "organizer", "participants",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        ical_uid: Optional[str],
+        title: Optional[str],
+        updated_at: Optional[int],
+        start_time: Optional[int],
+        start_timezone: Optional[str],
+        conferencing_provider: Optional[str],
+        event_url: Optional[str],
+        organizer: Optional[dict],
+        participants: Tuple[ParticipantSnapshot, ...],
+    ):
+        self.id = id
+        self.ical_uid = ical_uid
+        self.title = title
+        self.updated_at = updated_at
+        self.start_time = start_time
+        self.start_timezone = start_timezone
+        self.conferencing_provider = conferencing_provider
+        self.event_url = event_url
+        self.organizer = organizer
+        self.participants = participants
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "EventSnapshot":
+        when = payload.get("when") or {}
+        conferencing = payload.get("conferencing") or {}
+        return cls(
+            payload["id"],
+            payload.get("ical_uid"),
+            payload.get("title"),
+            payload.get("updated_at"),
+            when.get("start_time"),
+            when.get("start_timezone"),
+            conferencing.get("provider"),
+            (conferencing.get("details") or {}).get("url"),
+            payload.get("organizer"),
+            tuple(ParticipantSnapshot.from_payload(participant) for participant in payload.get("participants") or ()),
+        )
@@ -0,0 +1,55 @@
+import heapq
+import itertools
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class CalendarWorkQueue:
+    """Per-event cron work ordered by meeting start time.
+
+    The queue outlives a single tick: whatever a tick could not finish within
+    its budget stays queued and is picked up, still in urgency order, by the
+    next tick. Re-queuing an event that is already pending replaces the
+    pending copy, so a re-fetched event never gets processed twice.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, str, str]] = []
+        # (grant_id, event_id) -> (sequence, event)
+        self._items: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, grant_id: str, calendar_meet):
+        # All-day events have no start_time and sort last
+        start_time = calendar_meet.start_time
+        sequence = next(self._sequence)
+        self._items[(grant_id, calendar_meet.id)] = (sequence, calendar_meet)
+        heapq.heappush(
+            self._heap,
+            (
+                start_time if start_time is not None else sys.maxsize,
+                sequence,
+                grant_id,
+                calendar_meet.id,
+            ),
+        )
+
+    def pop(self) -> Optional[Tuple[str, Any]]:
+        """Return the most urgent pending (grant_id, event), or None."""
+        while self._heap:
+            _, sequence, grant_id, event_id = heapq.heappop(self._heap)
+            item = self._items.get((grant_id, event_id))
+            # Skip heap entries superseded by a newer push of the same event
+            if item is None or item[0] != sequence:
+                continue
+            del self._items[(grant_id, event_id)]
+            return grant_id, item[1]
+        return None
+
+    def discard_grants(self, active_grant_ids):
+        active = set(active_grant_ids)
+        for key in [key for key in self._items if key[0] not in active]:
+            del self._items[key]
@@ -0,0 +1,99 @@
+import enum
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class EventDecision(enum.Enum):
+    NO_URL = "NO_URL"
+    BOT_DISABLED = "BOT_DISABLED"
+    ALREADY_SCHEDULED = "ALREADY_SCHEDULED"
+    NEEDS_ACTION = "NEEDS_ACTION"
+    # Another worker holds the bot claim; retried until its bot is stored
+    CLAIMED_ELSEWHERE = "CLAIMED_ELSEWHERE"
+
+
+class EventDecisionMemo:
+    """Remembers what the cron decided for each version of a calendar event.
+
+    Entries are keyed by (grant id, event id, event updated_at), so any edit
+    to the event on the provider side produces a miss. Events without an
+    updated_at cannot be versioned and always miss. A BOT_DISABLED entry
+    also records the id and updatedAt of the UserMeetings row that disabled
+    the bot, and is only trusted while that row is unchanged. NEEDS_ACTION and
+    CLAIMED_ELSEWHERE are never short-circuited.
+    """
+
+    TERMINAL_DECISIONS = (
+        EventDecision.NO_URL,
+        EventDecision.BOT_DISABLED,
+        EventDecision.ALREADY_SCHEDULED,
+    )
+
+    def __init__(self):
+        # grant_id -> event_id -> (updated_at, decision, meeting stamp)
+        self._entries: Dict[str, Dict[str, Tuple[Optional[int], EventDecision, Optional[tuple]]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(events) for events in self._entries.values())
+
+    def lookup(
+        self,
+        grant_id: str,
+        event_id: str,
+        updated_at: Optional[int],
+        meetings_by_id: Optional[dict] = None,
+    ) -> Optional[EventDecision]:
+        """Return the memoized decision if it can be reused, otherwise None."""
+        if updated_at is None:
+            return None
+        entry = self._entries.get(grant_id, {}).get(event_id)
+        if entry is None or entry[0] != updated_at:
+            return None
+
+        decision, meeting_stamp = entry[1], entry[2]
+        if decision not in self.TERMINAL_DECISIONS:
+            return None
+
+        if decision == EventDecision.BOT_DISABLED:
+            meeting_id, meeting_updated_at = meeting_stamp
+            meeting = (meetings_by_id or {}).get(meeting_id)
+            if (
+                meeting is None
+                or not meeting.disable_bot
+                or meeting.updatedAt != meeting_updated_at
+            ):
+                return None
+
+        return decision
+
+    def record(
+        self,
+        grant_id: str,
+        event_id: str,
+        updated_at: Optional[int],
+        decision: EventDecision,
+        matching_meeting=None,
+    ):
+        meeting_stamp = None
+        if matching_meeting is not None:
+            meeting_stamp = (matching_meeting.id, matching_meeting.updatedAt)
+        self._entries.setdefault(grant_id, {})[event_id] = (
+            updated_at,
+            decision,
+            meeting_stamp,
+        )
+
+    def retain(self, grant_id: str, event_ids: Iterable[str]):
+        """Evict the grant's entries for events that left the fetch window."""
+        events = self._entries.get(grant_id)
+        if not events:
+            return
+        keep = set(event_ids)
+        for event_id in [event_id for event_id in events if event_id not in keep]:
+            del events[event_id]
+        if not events:
+            del self._entries[grant_id]
+
+    def forget_grants(self, active_grant_ids: Iterable[str]):
+        active = set(active_grant_ids)
+        for grant_id in [grant_id for grant_id in self._entries if grant_id not in active]:
+            del self._entries[grant_id]
@@ -0,0 +1,87 @@
+import os
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from utils.logging.logging_utils import get_logger
+
+
+class MeetingIdentifierRegistry:
+    """Turns a join URL into the id the cron dedups meetings on.
+
+    Each provider registers precompiled patterns whose first group is the
+    meeting id; they are tried in registration order against the
+    percent-decoded URL. A URL no pattern matches falls back to the last
+    path segment. Results are memoized per URL in a bounded LRU, since the
+    same events come back on every tick.
+    """
+
+    def __init__(self, cache_size: int):
+        self.logger = get_logger("MeetingIdentifierRegistry")
+        self._patterns: List[Tuple[str, "re.Pattern[str]"]] = []
+        self.identify = lru_cache(maxsize=cache_size)(self._identify)
+
+    def register(self, provider: str, *patterns: str):
+        self._patterns.extend((provider, re.compile(pattern, re.IGNORECASE)) for pattern in patterns)
+        # Earlier answers may have come from the fallback
+        self.identify.cache_clear()
+
+    def _identify(self, meeting_url: str) -> Optional[str]:
+        url = unquote(meeting_url)
+        for _, pattern in self._patterns:
+            match = pattern.search(url)
+            if match:
+                return match.group(1)
+        try:
+            path_parts = urlparse(url).path.strip('/').split('/')
+        except ValueError as e:
+            self.logger.warning("Error parsing meeting URL", error=str(e))
+            return None
+        return path_parts[-1] or None
+
+
+meeting_identifiers = MeetingIdentifierRegistry(int(os.getenv("MEETING_IDENTIFIER_CACHE_SIZE", "10000")))
+
+# Numeric meeting id or personal link name: /j/123, /wc/join/123, /my/name
+meeting_identifiers.register(
+    "Zoom Meeting",
+    r"^https?://(?:[\w-]+\.)*zoom(?:gov)?\.us/(?:wc/join|wc|j|w|s|my)/([^/?#]+)",
+)
+meeting_identifiers.register(
+    "Google Meet",
+    r"^https?://meet\.google\.com/([a-z]{3}-[a-z]{4}-[a-z]{3})(?:[/?#]|$)",
+)
+# Thread id (19:meeting_...@thread.v2) or the numeric id of /meet/ links
+meeting_identifiers.register(
+    "Microsoft Teams",
+    r"^https?://teams\.(?:microsoft|live)\.com/l/meetup-join/([^/?#]+)",
+    r"^https?://teams\.(?:microsoft|live)\.com/meet/(\d+)",
+)
+# j.php links carry the meeting in MTID; personal rooms are /meet/<name>
+meeting_identifiers.register(
+    "WebEx",
+    r"^https?://[\w-]+\.webex\.com/[^?#]*\?(?:[^#]*&)?MTID=([\w-]+)",
+    r"^https?://[\w-]+\.webex\.com/(?:meet|join)/([^/?#]+)",
+)
+
+
+def get_meeting_unique_identifier_from_url(meeting_url: str) -> Optional[str]:
+    return meeting_identifiers.identify(meeting_url)
+
+
+@lru_cache(maxsize=int(os.getenv("MEETING_IDENTIFIER_CACHE_SIZE", "10000")))
+def get_legacy_meeting_identifier(meeting_url: str, provider: Optional[str]) -> Optional[str]:
+    """The id the cron derived before the registry: the last path segment.
+
+    Teams URLs gave None, so those meetings fell back to their ical_uid.
+    ``UserMeetings.uniq_identifier`` rows and ``sl_cal_*`` keys written with
+    it are still live, so the cron matches on both ids where they differ
+    (Teams, Webex ``j.php`` and Zoom ``/wc/<id>/join`` links).
+    """
+    if provider == "Microsoft Teams":
+        return None
+    try:
+        path_parts = urlparse(unquote(meeting_url)).path.strip('/').split('/')
+    except ValueError:
+        return None
+    return path_parts[-1] or None
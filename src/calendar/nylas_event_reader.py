@@ -0,0 +1,60 @@
+import inspect
+from importlib.metadata import PackageNotFoundError, version
+from typing import List, Optional
+from nylas import Client
+from utils.logging.logging_utils import get_logger
+
+# SDK major versions whose private HttpClient._execute(method, path,
+# query_params=...) is known to return the decoded JSON body
+RAW_EXECUTE_SDK_MAJORS = ("6",)
+
+
+def _sdk_version() -> Optional[str]:
+    try:
+        return version("nylas")
+    except PackageNotFoundError:
+        return None
+
+
+class NylasEventReader:
+    """Reads a grant's primary calendar and events from Nylas as plain dicts.
+
+    The public ``calendars.find``/``events.list`` decode every payload into
+    SDK dataclasses, which the cron turns straight back into snapshots. On
+    SDK versions listed in ``RAW_EXECUTE_SDK_MAJORS`` whose
+    ``HttpClient._execute`` still has the expected signature, the reader
+    calls it directly and skips that decoding; this is the only place the
+    private method is used. Any other SDK falls back to the public calls
+    and ``to_dict()``, so an upgrade costs speed, not correctness.
+    """
+
+    def __init__(self, nylas: Client, sdk_version: Optional[str] = None):
+        self.logger = get_logger("NylasEventReader")
+        self.nylas = nylas
+        self.sdk_version = sdk_version or _sdk_version()
+        self.raw = self._supports_raw_execute()
+        if not self.raw:
+            self.logger.warning("Using the public Nylas SDK calls", sdk_version=self.sdk_version)
+
+    def _supports_raw_execute(self) -> bool:
+        if not self.sdk_version or self.sdk_version.split(".")[0] not in RAW_EXECUTE_SDK_MAJORS:
+            return False
+        execute = getattr(getattr(self.nylas, "http_client", None), "_execute", None)
+        if execute is None:
+            return False
+        try:
+            parameters = inspect.signature(execute).parameters
+        except (TypeError, ValueError):
+            return False
+        return "query_params" in parameters
+
+    def primary_calendar_id(self, grant_id: str) -> str:
+        if self.raw:
+            return self.nylas.http_client._execute("GET", f"/v3/grants/{grant_id}/calendars/primary")["data"]["id"]
+        return self.nylas.calendars.find(grant_id, "primary").data.id
+
+    def list_events(self, grant_id: str, query_params: dict) -> List[dict]:
+        if self.raw:
+            response = self.nylas.http_client._execute("GET", f"/v3/grants/{grant_id}/events", query_params=query_params)
+            return response.get("data") or []
+        return [event.to_dict() for event in self.nylas.events.list(grant_id, query_params=query_params).data]
@@ -0,0 +1,72 @@
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CronRun:
+    """One execution of the calendar cron and the triggers merged into it."""
+
+    def __init__(self, source: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = QUEUED
+        # trigger source -> how many requests were merged into this run
+        self.triggers: Dict[str, int] = {source: 1}
+        self.requested_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.duration_seconds: Optional[float] = None
+        # Filled live by collect_stage_timings while the run executes
+        self.stages: Dict[str, dict] = {}
+
+    def merge(self, source: str):
+        self.triggers[source] = self.triggers.get(source, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "triggers": dict(self.triggers),
+            "requested_at": self.requested_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.duration_seconds,
+            "stages": {
+                name: {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "total_seconds": round(entry["total_seconds"], 4),
+                    "max_seconds": round(entry["max_seconds"], 4),
+                }
+                for name, entry in list(self.stages.items())
+            },
+        }
+
+
+class CronRunHistory:
+    """The most recent runs by id, oldest evicted first."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._runs: "OrderedDict[str, CronRun]" = OrderedDict()
+
+    def add(self, run: CronRun):
+        self._runs[run.id] = run
+        while len(self._runs) > self.capacity:
+            self._runs.popitem(last=False)
+
+    def get(self, run_id: str) -> Optional[CronRun]:
+        return self._runs.get(run_id)
+
+    def recent(self) -> List[CronRun]:
+        return list(reversed(self._runs.values()))
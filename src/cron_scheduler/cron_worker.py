@@ -0,0 +1,345 @@
+"""Standalone calendar cron worker that spreads each tick over several cores.
+
+Run with ``python -m src.cron_scheduler.cron_worker`` next to the API. The
+API ticks itself by default; set ``CALENDAR_CRON_IN_API=false`` on the API
+instances while this worker runs, so the two do not both tick.
+Users are partitioned by ``id % CRON_WORKER_PROCESSES``; each partition is
+owned by one long-lived process with its own event loop, cron service,
+database engine and Redis pool, so its polling state and event memo carry
+over between ticks. The parent merges the partitions' results, stage
+timings, counters and stage histograms into one run, and serves its
+metrics on ``http://0.0.0.0:CRON_WORKER_METRICS_PORT/metrics`` (9101 by
+default, 0 to disable) for Prometheus to scrape.
+"""
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import List, Optional
+from dotenv import load_dotenv
+from src.cron_scheduler.cron_runs import FAILED, RUNNING, SUCCEEDED, CronRun
+from utils.logging.logging_utils import get_logger
+from utils.tracing.tracing_utils import TRACER
+from utils.metrics.metrics_utils import REGISTRY
+from utils.metrics.pipeline_metrics import (
+    BOTS_CREATED,
+    EVENTS_SEEN,
+    PROVIDER_ERRORS,
+    REMINDERS_SENT,
+    STAGE_DURATION,
+    TICK_DURATION,
+    collect_stage_timings,
+    merge_stage_timings,
+)
+
+load_dotenv()
+
+WORKER_TICKS = REGISTRY.counter(
+    "calendar_worker_ticks_total",
+    "Cron worker ticks by outcome.",
+    ["status"],
+)
+
+# Metrics a partition reports back so the parent's totals include its work
+FORWARDED_COUNTERS = {counter.name: counter for counter in (EVENTS_SEEN, BOTS_CREATED, REMINDERS_SENT, PROVIDER_ERRORS)}
+FORWARDED_HISTOGRAMS = {histogram.name: histogram for histogram in (STAGE_DURATION,)}
+
+# State of the partition owned by this worker process
+_partition = None
+_runner: Optional[asyncio.Runner] = None
+_calendar_service = None
+
+
+def _init_partition(index: int, count: int):
+    global _partition, _runner, _calendar_service
+    # The parent handles Ctrl-C and shuts the workers down in order
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from src.calendar.calendar_cron_service import CalendarCronService
+
+    _partition = (index, count)
+    TRACER.configure()
+    # One loop for the life of the process, so pools created on it stay usable
+    _runner = asyncio.Runner()
+    _calendar_service = CalendarCronService(
+        nylas_api_key=os.getenv("NYLAS_API_KEY"),
+        nylas_api_uri=os.getenv("NYLAS_API_URI"),
+        partition=_partition,
+    )
+
+
+def _counter_values() -> dict:
+    return {
+        name: [(labels, value) for labels, value in counter.items()]
+        for name, counter in FORWARDED_COUNTERS.items()
+    }
+
+
+def _histogram_values() -> dict:
+    return {name: histogram.items() for name, histogram in FORWARDED_HISTOGRAMS.items()}
+
+
+def _histogram_deltas(before: dict, after: dict) -> dict:
+    deltas = {}
+    for name, samples in after.items():
+        previous = {tuple(sorted(labels.items())): (counts, total, count) for labels, counts, total, count in before.get(name, [])}
+        changed = []
+        for labels, counts, total, count in samples:
+            previous_counts, previous_total, previous_count = previous.get(tuple(sorted(labels.items())), ([0] * len(counts), 0.0, 0))
+            if count != previous_count:
+                changed.append((
+                    labels,
+                    [current - earlier for current, earlier in zip(counts, previous_counts)],
+                    total - previous_total,
+                    count - previous_count,
+                ))
+        if changed:
+            deltas[name] = changed
+    return deltas
+
+
+def _counter_deltas(before: dict, after: dict) -> dict:
+    deltas = {}
+    for name, samples in after.items():
+        previous = {tuple(sorted(labels.items())): value for labels, value in before.get(name, [])}
+        changed = []
+        for labels, value in samples:
+            delta = value - previous.get(tuple(sorted(labels.items())), 0)
+            if delta:
+                changed.append((labels, delta))
+        if changed:
+            deltas[name] = changed
+    return deltas
+
+
+async def _tick_partition() -> dict:
+    from db.sessions import get_async_session
+
+    stages = {}
+    counters_before = _counter_values()
+    histograms_before = _histogram_values()
+    started = time.perf_counter()
+    succeeded = False
+    with collect_stage_timings(stages), TRACER.start_trace("calendar_tick", partition=_partition[0]):
+        async for session in get_async_session():
+            succeeded = await _calendar_service.process_fetch_calendar_events(session)
+    return {
+        "partition": _partition[0],
+        "succeeded": succeeded,
+        "duration_seconds": round(time.perf_counter() - started, 4),
+        "stages": stages,
+        "counters": _counter_deltas(counters_before, _counter_values()),
+        "histograms": _histogram_deltas(histograms_before, _histogram_values()),
+    }
+
+
+def _run_partition_tick() -> dict:
+    return _runner.run(_tick_partition())
+
+
+async def _close_partition_service():
+    from db.sessions import dispose_async_engine
+
+    await _calendar_service.aclose()
+    await dispose_async_engine()
+
+
+def _close_partition():
+    # Worker processes exit without running atexit hooks, so pools are
+    # closed explicitly before the executor is shut down
+    _runner.run(_close_partition_service())
+    _runner.close()
+    TRACER.shutdown()
+
+
+class CalendarCronWorker:
+    """Runs the calendar tick over ``processes`` user partitions in parallel.
+
+    Each partition has a single-process executor of its own, so a partition
+    always lands on the same process and the work of one partition never
+    competes with another's for a GIL. If that process dies (OOM kill,
+    segfault in a native library), its executor is broken for good; the
+    partition's tick fails and the executor is replaced with a fresh
+    process for the next tick, which starts with empty polling state.
+    A partition whose tick runs past ``CALENDAR_TICK_BUDGET_SECONDS`` plus
+    ``CRON_WORKER_PARTITION_GRACE_SECONDS`` (30) is treated as hung: its
+    process is terminated and replaced the same way, so one stuck Nylas or
+    database call cannot stall the other partitions.
+    """
+
+    # Runs in the partition process; a module-level function so it pickles
+    partition_tick = staticmethod(_run_partition_tick)
+
+    def __init__(self, processes: Optional[int] = None):
+        self.logger = get_logger("CalendarCronWorker")
+        self.processes = processes or int(os.getenv("CRON_WORKER_PROCESSES", str(os.cpu_count() or 1)))
+        self.interval_seconds = float(os.getenv("CRON_WORKER_INTERVAL_SECONDS", "10"))
+        self.partition_timeout_seconds = float(os.getenv("CALENDAR_TICK_BUDGET_SECONDS", "8")) + float(
+            os.getenv("CRON_WORKER_PARTITION_GRACE_SECONDS", "30")
+        )
+        self.metrics_port = int(os.getenv("CRON_WORKER_METRICS_PORT", "9101"))
+        self._executors: List[ProcessPoolExecutor] = []
+        self._metrics_server: Optional[asyncio.AbstractServer] = None
+
+    def _new_executor(self, index: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_partition,
+            initargs=(index, self.processes),
+        )
+
+    def start(self):
+        self._executors = [self._new_executor(index) for index in range(self.processes)]
+        self.logger.info("Cron worker started", processes=self.processes, interval_seconds=self.interval_seconds)
+
+    def _replace_executor(self, index: int, reason: str):
+        self.logger.warning("Replacing cron partition process", partition=index, reason=reason)
+        executor = self._executors[index]
+        # shutdown() does not stop a process stuck in a call, so end it first
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._executors[index] = self._new_executor(index)
+
+    async def _tick_partition(self, index: int) -> dict:
+        executor = self._executors[index]
+        try:
+            return await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(executor, self.partition_tick),
+                self.partition_timeout_seconds,
+            )
+        except BrokenProcessPool:
+            if self._executors[index] is executor:
+                self._replace_executor(index, "process died")
+            raise
+        except asyncio.TimeoutError:
+            if self._executors[index] is executor:
+                self._replace_executor(index, "tick timed out")
+            raise
+
+    async def run_tick(self) -> CronRun:
+        run = CronRun("worker")
+        run.status = RUNNING
+        run.started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+
+        results = await asyncio.gather(
+            *(self._tick_partition(index) for index in range(len(self._executors))),
+            return_exceptions=True,
+        )
+
+        succeeded = True
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                self.logger.error("Cron partition failed", partition=index, error=str(result))
+                succeeded = False
+                continue
+            succeeded = succeeded and result["succeeded"]
+            merge_stage_timings(run.stages, result["stages"])
+            for name, samples in result["counters"].items():
+                for labels, delta in samples:
+                    FORWARDED_COUNTERS[name].inc(delta, **labels)
+            for name, samples in result["histograms"].items():
+                for labels, counts, total, count in samples:
+                    FORWARDED_HISTOGRAMS[name].add(counts, total, count, **labels)
+
+        run.duration_seconds = round(time.perf_counter() - started, 4)
+        run.finished_at = datetime.now(timezone.utc).isoformat()
+        run.status = SUCCEEDED if succeeded else FAILED
+        TICK_DURATION.observe(run.duration_seconds)
+        WORKER_TICKS.inc(status=run.status)
+        self.logger.info(
+            "Cron tick finished",
+            run_id=run.id,
+            status=run.status,
+            duration_seconds=run.duration_seconds,
+            partition_seconds=[None if isinstance(result, BaseException) else result["duration_seconds"] for result in results],
+        )
+        return run
+
+    async def serve(self, stop: asyncio.Event):
+        """Tick every ``interval_seconds`` until ``stop`` is set."""
+        while not stop.is_set():
+            started = time.monotonic()
+            await self.run_tick()
+            remaining = self.interval_seconds - (time.monotonic() - started)
+            if remaining > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def start_metrics_server(self):
+        """Serve ``REGISTRY`` on ``/metrics``; the API's endpoint cannot see this process."""
+        if self.metrics_port <= 0:
+            return
+        self._metrics_server = await asyncio.start_server(_handle_metrics_request, "0.0.0.0", self.metrics_port)
+        self.logger.info("Cron worker metrics listening", port=self.metrics_port)
+
+    async def stop_metrics_server(self):
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            await self._metrics_server.wait_closed()
+            self._metrics_server = None
+
+    def shutdown(self):
+        for index, executor in enumerate(self._executors):
+            try:
+                executor.submit(_close_partition).result()
+            except Exception as e:
+                self.logger.error("Closing cron partition failed", partition=index, error=str(e))
+            executor.shutdown(wait=True)
+        self._executors = []
+        self.logger.info("Cron worker stopped")
+
+
+async def _handle_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # Just enough HTTP/1.1 for a Prometheus scrape
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 5)
+        while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+            pass
+        method, _, target = request_line.decode("latin-1").partition(" ")
+        if method == "GET" and target.split(" ")[0].split("?")[0] == "/metrics":
+            status, body = "200 OK", REGISTRY.render().encode()
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve():
+    worker = CalendarCronWorker()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    worker.start()
+    await worker.start_metrics_server()
+    try:
+        await worker.serve(stop)
+    finally:
+        await worker.stop_metrics_server()
+        # Blocking, but nothing else runs on this loop any more
+        worker.shutdown()
+
+
+def main():
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,70 @@
 import asyncio
+import time
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from src.calendar.calendar_cron_service import CalendarCronService
 from dotenv import load_dotenv
 from db.sessions import get_async_session
+from utils.logging.logging_utils import get_logger
+from src.cron_scheduler.cron_runs import CANCELLED, FAILED, RUNNING, SUCCEEDED, CronRun, CronRunHistory
+from utils.metrics.pipeline_metrics import TICK_DURATION, collect_stage_timings
+from utils.profiling.flight_recorder import FlightRecorder
+from utils.tracing.tracing_utils import TRACER
 
 # Load environment variables from .env file
 load_dotenv()
 
 
 class SchedulerService:
-    def __init__(self):
-        self.logger = logging.getLogger("SchedulerService")
-        self.logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+    """Runs the calendar cron on a background scheduler.
 
-        self.logger.debug("Initializing SchedulerService")
+    The cron runs in the API by default. Set ``CALENDAR_CRON_IN_API=false``
+    where the standalone cron worker owns the ticks; ``start()`` then does
+    nothing and manual triggers are refused.
 
-        self.scheduler = BackgroundScheduler()
-        self.logger.debug("BackgroundScheduler created")
+    Construction is cheap; the cron service, its clients and the scheduler
+    thread are only created by ``start()``, which the app calls from its
+    lifespan handler. ``shutdown()`` stops the scheduler, waits for a tick
+    that is still running and closes the clients.
+
+    Scheduled ticks and manual triggers both go through ``request_run()``,
+    so at most one run executes at a time. A trigger that arrives while a
+    run is executing queues one follow-up run, and any later trigger is
+    merged into that queued run instead of adding another.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("SchedulerService")
+        self.scheduler = None
+        self.calendar_service = None
+        self.loop = None
+        self.enabled = os.getenv("CALENDAR_CRON_IN_API", "true").lower() != "false"
+        self.flight_recorder = FlightRecorder()
+        self.shutdown_timeout_seconds = float(os.getenv("SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS", "10"))
+        self._running_tick = None
+        self._current_run = None
+        self._queued_run = None
+        self.runs = CronRunHistory(int(os.getenv("CRON_RUN_HISTORY", "50")))
+
+    async def start(self):
+        if self.scheduler is not None:
+            return
+        if not self.enabled:
+            self.logger.warning("Calendar cron disabled in the API, CALENDAR_CRON_IN_API=false; the cron worker must be running")
+            return
+        self.logger.debug("Starting SchedulerService")
+        self.loop = asyncio.get_running_loop()
 
         self.calendar_service = CalendarCronService(
             nylas_api_key=os.getenv("NYLAS_API_KEY"),
             nylas_api_uri=os.getenv("NYLAS_API_URI"),
         )
-
         self.logger.debug("CalendarCronService initialized")
 
-        self.loop = asyncio.get_event_loop()
-        self.logger.debug("Asyncio event loop retrieved")
-
         # Schedule the cron job
-        self.logger.debug("Scheduling cron job")
+        self.scheduler = BackgroundScheduler()
         self.scheduler.add_job(
             self.run_async_task,
             trigger=IntervalTrigger(seconds=10),
@@ -48,39 +72,98 @@ class SchedulerService:
             name="Calendar Events Cron Job",
             replace_existing=True,
         )
-        self.logger.debug("Cron job scheduled")
-
         self.scheduler.start()
         self.logger.debug("Scheduler started")
 
     def run_async_task(self):
+        # Called on the scheduler thread; run state lives on the event loop
         self.logger.debug("Running async task")
-        asyncio.run_coroutine_threadsafe(self.handle_calendar_events_cron(), self.loop)
+        self.loop.call_soon_threadsafe(self.request_run, "scheduler")
+
+    def request_run(self, source: str) -> CronRun:
+        """Start a run, or merge into the queued one; must run on the loop."""
+        if self._queued_run is not None:
+            self._queued_run.merge(source)
+            return self._queued_run
+
+        run = CronRun(source)
+        self.runs.add(run)
+        if self._current_run is None:
+            self._start_run(run)
+        else:
+            self._queued_run = run
+        return run
+
+    def _start_run(self, run: CronRun):
+        self._current_run = run
+        self._running_tick = self.loop.create_task(self._execute_run(run))
+
+    async def _execute_run(self, run: CronRun):
+        run.status = RUNNING
+        run.started_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        try:
+            with collect_stage_timings(run.stages):
+                succeeded = await self.handle_calendar_events_cron()
+            run.status = SUCCEEDED if succeeded else FAILED
+        except asyncio.CancelledError:
+            run.status = CANCELLED
+            raise
+        finally:
+            run.finished_at = datetime.now(timezone.utc).isoformat()
+            run.duration_seconds = round(time.perf_counter() - started, 4)
+            self._current_run = None
+            self._running_tick = None
+            queued_run, self._queued_run = self._queued_run, None
+            if queued_run is not None:
+                if run.status == CANCELLED:
+                    queued_run.status = CANCELLED
+                else:
+                    self._start_run(queued_run)
 
     async def handle_calendar_events_cron(self):
         self.logger.debug("Handling calendar events cron job")
 
-        if os.getenv("RUN_CALENDAR_CRON") == "true":
-            self.logger.debug(f"Calendar Event cron job ran at => {datetime.now()}")
+        if not self.enabled or self.calendar_service is None:
+            self.logger.debug("Calendar cron is not running in the API")
+            return False
+        self.logger.debug("Calendar Event cron job ran", ran_at=datetime.now().isoformat())
 
         async for session in get_async_session():
             try:
-                await self.calendar_service.process_fetch_calendar_events(session)
-                self.logger.debug("process_fetch_calendar_events method completed")
-                return True
-            except Exception as e:
-                self.logger.error(f"Calendar Event cron job failed - error => {e}")
+                tick_started = time.perf_counter()
+                try:
+                    with self.flight_recorder.record_tick(), TRACER.start_trace("calendar_tick"):
+                        succeeded = await self.calendar_service.process_fetch_calendar_events(session)
+                finally:
+                    TICK_DURATION.observe(time.perf_counter() - tick_started)
+                self.logger.debug("process_fetch_calendar_events method completed", succeeded=succeeded)
+                return succeeded
+            except Exception:
+                self.logger.error("Calendar Event cron job failed", exc_info=True)
                 return False
-        else:
-            self.logger.debug(
-                "RUN_CALENDAR_CRON environment variable is not set to 'true'"
-            )
         return False
 
-    def start(self):
-        self.scheduler.start()
-        self.logger.debug("Scheduler started")
+    async def shutdown(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=False)
+            self.scheduler = None
+            self.logger.debug("Scheduler stopped")
 
-    def shutdown(self):
-        self.scheduler.shutdown()
-        self.logger.debug("Scheduler stopped")
+        # A queued run is dropped; the current one may finish
+        if self._queued_run is not None:
+            self._queued_run.status = CANCELLED
+            self._queued_run = None
+
+        running_tick = self._running_tick
+        if running_tick is not None and not running_tick.done():
+            # Let the current tick finish so bots and cache keys stay consistent
+            try:
+                await asyncio.wait_for(running_tick, self.shutdown_timeout_seconds)
+            except asyncio.TimeoutError:
+                self.logger.warning("Calendar tick still running at shutdown, cancelled", timeout_seconds=self.shutdown_timeout_seconds)
+        self._running_tick = None
+
+        if self.calendar_service is not None:
+            await self.calendar_service.aclose()
+            self.calendar_service = None
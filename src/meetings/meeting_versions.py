@@ -0,0 +1,49 @@
+import os
+import time
+from typing import Iterable, Optional
+from utils.logging.logging_utils import get_logger
+from utils.redis.redis_utils import RedisManager
+
+
+class MeetingVersions:
+    """Per-user version counter for a user's UserMeetings rows.
+
+    Every write to a user's meetings must call ``bump()`` (services outside
+    this repo ``INCR meetings_version:{user_id}``); readers turn the version
+    into an ETag so an unchanged listing costs one Redis GET. A missing
+    counter (new user, flushed Redis) is seeded from the current time in
+    nanoseconds rather than 0, so a reset never reissues an old version.
+
+    A writer that forgets to bump would leave clients on a stale 304, so
+    the counter expires ``MEETINGS_VERSION_TTL_SECONDS`` after it was
+    seeded (``INCR`` keeps the TTL). The next read then falls back to the
+    row state and reseeds, which bounds how long a missed bump can last.
+    """
+
+    key_prefix = "meetings_version:"
+
+    def __init__(self, cache_manager: RedisManager):
+        self.cache_manager = cache_manager
+        self.ttl_seconds = int(os.getenv("MEETINGS_VERSION_TTL_SECONDS", "300"))
+        self.logger = get_logger("MeetingVersions")
+
+    async def get(self, user_id: int) -> Optional[str]:
+        """The user's current version, or None while the counter is missing."""
+        version = await self.cache_manager.get(f"{self.key_prefix}{user_id}")
+        return None if version is None else str(version)
+
+    async def seed(self, user_id: int):
+        """Create a missing counter; an existing one is left alone."""
+        await self.cache_manager.set_nx(f"{self.key_prefix}{user_id}", str(time.time_ns()), self.ttl_seconds)
+
+    async def bump(self, user_ids: Iterable[int]):
+        # Called after the database write has committed, so a Redis failure
+        # is logged rather than raised into the writer
+        for user_id in set(user_ids):
+            key = f"{self.key_prefix}{user_id}"
+            try:
+                if await self.cache_manager.incr(key) == 1:
+                    # The counter did not exist; move it past anything issued before
+                    await self.cache_manager.set(key, str(time.time_ns()), self.ttl_seconds)
+            except Exception as e:
+                self.logger.error("Bumping meetings version failed", user_id=user_id, error=str(e))
@@ -0,0 +1,159 @@
+import base64
+import enum
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import func, select, tuple_
+from db.models.models import UserMeetings
+from db.sessions import get_async_session
+from src.meetings.meeting_versions import MeetingVersions
+from utils.logging.logging_utils import get_logger
+from utils.metrics.pipeline_metrics import stage
+
+# Columns a client may ask for; rough_notes and Agenda can be large, so
+# they are only returned when listed explicitly
+SELECTABLE_FIELDS = {
+    "id", "userId", "documentId", "calendar_uid", "master_cal_uid", "event_url",
+    "title", "participants", "organizer", "start_time", "end_time", "timezone",
+    "provider", "disable_bot", "type", "start_date", "uniq_identifier", "bot_id",
+    "bot_status", "createdAt", "updatedAt", "Agenda", "rough_notes",
+}
+DEFAULT_FIELDS = (
+    "id", "title", "start_time", "end_time", "timezone", "provider",
+    "event_url", "participants", "disable_bot", "bot_status",
+)
+MAX_LIMIT = 200
+
+
+def encode_cursor(start_time: int, meeting_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{start_time}:{meeting_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_time, _, meeting_id = base64.urlsafe_b64decode(padded).decode().partition(":")
+        return int(start_time), int(meeting_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class MeetingsService:
+    """Reads a user's meetings for the /meetings API.
+
+    Pages are keyset-paginated on ``(start_time, id)``, so a page costs the
+    same however deep the client has scrolled. Only the requested columns
+    are selected and rows are encoded straight to JSON without building
+    models. Each response carries an ETag that lets an unchanged listing
+    be answered with a 304 without reading the page. The tag combines the
+    user's ``MeetingVersions`` counter, bumped by every writer, with a hash
+    of the query parameters, so revalidating costs one Redis GET.
+
+    While the counter is missing (new user, flushed Redis) or Redis cannot
+    be read, the tag is built from the count, latest ``updatedAt`` and
+    highest id of the user's rows instead, read in one aggregate query, and
+    the counter is seeded for the next request. The counter expires a few
+    minutes after seeding, so that query also catches up with any write
+    that was never bumped.
+    """
+
+    def __init__(self, meeting_versions: MeetingVersions):
+        self.logger = get_logger("MeetingsService")
+        self.meeting_versions = meeting_versions
+
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> List[str]:
+        if not fields:
+            return list(DEFAULT_FIELDS)
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in SELECTABLE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(requested))
+
+    async def etag(self, user_id: int, query: Sequence[Any]) -> str:
+        # Read the validators before the page: a write racing with this
+        # request then yields a newer page under an older tag, never the reverse
+        query_digest = hashlib.blake2b(repr(tuple(query)).encode(), digest_size=8).hexdigest()
+        try:
+            version = await self.meeting_versions.get(user_id)
+        except Exception as e:
+            self.logger.error("Reading meetings version failed", user_id=user_id, error=str(e))
+            return await self._row_state_etag(user_id, query_digest)
+        if version is None:
+            etag = await self._row_state_etag(user_id, query_digest)
+            try:
+                await self.meeting_versions.seed(user_id)
+            except Exception as e:
+                self.logger.error("Seeding meetings version failed", user_id=user_id, error=str(e))
+            return etag
+        return f'W/"{user_id}-v{version}-{query_digest}"'
+
+    async def _row_state_etag(self, user_id: int, query_digest: str) -> str:
+        async for session in get_async_session():
+            with stage("meetings_etag", provider="postgres"):
+                row_state = (
+                    await session.execute(
+                        select(func.count(), func.max(UserMeetings.updatedAt), func.max(UserMeetings.id))
+                        .where(UserMeetings.userId == user_id)
+                    )
+                ).one()
+        digest = hashlib.blake2b(repr(tuple(row_state)).encode(), digest_size=8).hexdigest()
+        return f'W/"{user_id}-r{digest}-{query_digest}"'
+
+    async def list_meetings(
+        self,
+        user_id: int,
+        fields: List[str],
+        limit: int,
+        cursor: Optional[str] = None,
+        order: str = "asc",
+        start_from: Optional[int] = None,
+        start_to: Optional[int] = None,
+    ) -> bytes:
+        """Return one page as JSON bytes: ``{"data": [...], "next_cursor": ...}``."""
+        limit = max(1, min(limit, MAX_LIMIT))
+        # The cursor columns are always read, even when not returned
+        columns = list(dict.fromkeys(fields + ["start_time", "id"]))
+        query = select(*(getattr(UserMeetings, column) for column in columns)).where(UserMeetings.userId == user_id)
+
+        if start_from is not None:
+            query = query.where(UserMeetings.start_time >= start_from)
+        if start_to is not None:
+            query = query.where(UserMeetings.start_time < start_to)
+
+        key = tuple_(UserMeetings.start_time, UserMeetings.id)
+        if cursor:
+            position = tuple_(*decode_cursor(cursor))
+            query = query.where(key > position if order == "asc" else key < position)
+        if order == "asc":
+            query = query.order_by(UserMeetings.start_time.asc(), UserMeetings.id.asc())
+        else:
+            query = query.order_by(UserMeetings.start_time.desc(), UserMeetings.id.desc())
+        # One extra row tells whether another page exists
+        query = query.limit(limit + 1)
+
+        async for session in get_async_session():
+            with stage("meetings_list", provider="postgres"):
+                rows = (await session.execute(query)).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].start_time, rows[-1].id) if has_more else None
+        data = [{field: row._mapping[field] for field in fields} for row in rows]
+        return json.dumps(
+            {"data": data, "next_cursor": next_cursor},
+            default=_json_default,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode()
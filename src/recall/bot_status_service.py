@@ -0,0 +1,305 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Text, column, or_, select, text, update, values
+from db.models.models import MeetingBotStatus, UserMeetings
+from db.sessions import get_async_session
+from src.meetings.meeting_versions import MeetingVersions
+from utils.logging.logging_utils import get_logger
+from utils.metrics.metrics_utils import REGISTRY
+from utils.metrics.pipeline_metrics import stage
+
+BOT_STATUS_EVENTS = REGISTRY.counter(
+    "recall_bot_status_events_total",
+    "Recall bot status webhooks received, by Recall status code.",
+    ["code"],
+)
+
+# Recall status codes -> what we store; codes not listed are ignored
+RECALL_STATUS_MAP = {
+    "ready": MeetingBotStatus.SCHEDULED,
+    "joining_call": MeetingBotStatus.JOINING,
+    "in_waiting_room": MeetingBotStatus.IN_WAITING_ROOM,
+    "in_call_not_recording": MeetingBotStatus.IN_CALL,
+    "recording_permission_allowed": MeetingBotStatus.IN_CALL,
+    "recording_permission_denied": MeetingBotStatus.IN_CALL,
+    "in_call_recording": MeetingBotStatus.RECORDING,
+    "call_ended": MeetingBotStatus.CALL_ENDED,
+    "done": MeetingBotStatus.DONE,
+    "analysis_done": MeetingBotStatus.DONE,
+    "fatal": MeetingBotStatus.FAILED,
+}
+
+
+class BotStatusSchemaCheck:
+    """Tells whether the database can store bot statuses.
+
+    That needs every MeetingBotStatus value in the bot_status enum and the
+    bot_status_at column, both added by
+    ``db/migrations/001_bot_status_tracking.sql``. Until the script has been
+    applied, writing a status fails, so writers ask ``ready()`` first and
+    skip the status. A database found lacking is checked again after
+    ``BOT_STATUS_SCHEMA_RECHECK_SECONDS``.
+    """
+
+    enum_name = "meetingbotstatus"
+    migration = "db/migrations/001_bot_status_tracking.sql"
+
+    def __init__(self):
+        self.logger = get_logger("BotStatusSchemaCheck")
+        self.recheck_seconds = float(os.getenv("BOT_STATUS_SCHEMA_RECHECK_SECONDS", "300"))
+        self._ready = False
+        self._checked_at: Optional[float] = None
+
+    async def ready(self, session) -> bool:
+        if self._ready:
+            return True
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.recheck_seconds:
+            return False
+        self._checked_at = now
+        try:
+            result = await session.execute(
+                text(
+                    "SELECT e.enumlabel FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid"
+                    " WHERE t.typname = :name"
+                ),
+                {"name": self.enum_name},
+            )
+            labels = set(result.scalars().all())
+            result = await session.execute(
+                text(
+                    "SELECT column_name FROM information_schema.columns"
+                    " WHERE table_schema = 'public' AND table_name = :table AND column_name = 'bot_status_at'"
+                ),
+                {"table": UserMeetings.__tablename__},
+            )
+            has_status_at = bool(result.scalars().all())
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            self.logger.error("Checking the bot_status enum failed", error=str(e))
+            return False
+        missing = [status.name for status in MeetingBotStatus if status.name not in labels]
+        if not has_status_at:
+            missing.append("bot_status_at")
+        if missing:
+            self.logger.warning(
+                "Bot status schema is not migrated; statuses are not stored until it is",
+                missing=missing,
+                migration=self.migration,
+            )
+            return False
+        self._ready = True
+        return True
+
+
+# Shared by every writer in the process
+BOT_STATUS_SCHEMA = BotStatusSchemaCheck()
+
+
+def verify_recall_signature(secret: str, headers, body: bytes, tolerance_seconds: int = 300):
+    """Check a Svix-signed Recall webhook; raises HTTPException(401) if invalid."""
+    message_id = headers.get("webhook-id") or headers.get("svix-id")
+    timestamp = headers.get("webhook-timestamp") or headers.get("svix-timestamp")
+    signatures = headers.get("webhook-signature") or headers.get("svix-signature")
+    if not message_id or not timestamp or not signatures:
+        raise HTTPException(status_code=401, detail="Missing webhook signature")
+    try:
+        if abs(time.time() - int(timestamp)) > tolerance_seconds:
+            raise HTTPException(status_code=401, detail="Webhook timestamp out of range")
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid webhook timestamp")
+
+    key = base64.b64decode(secret.split("_", 1)[1] if secret.startswith("whsec_") else secret)
+    signed = f"{message_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+    for signature in signatures.split(" "):
+        _, _, value = signature.partition(",")
+        if hmac.compare_digest(value, expected):
+            return
+    raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+
+def parse_status_time(created_at: str) -> datetime:
+    """Parse a Recall ``created_at``; a missing or invalid one means now."""
+    try:
+        parsed = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return datetime.now(timezone.utc)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_bot_status_event(payload: dict) -> Optional[Tuple[str, str, str]]:
+    """Return (bot_id, status code, created_at) from a bot.status_change event."""
+    if payload.get("event") != "bot.status_change":
+        return None
+    data = payload.get("data") or {}
+    bot_id = data.get("bot_id") or (data.get("bot") or {}).get("id")
+    status = data.get("status") or {}
+    if not bot_id or not status.get("code"):
+        return None
+    return bot_id, status["code"], status.get("created_at") or ""
+
+
+def status_update(status: MeetingBotStatus, bots: List[Tuple[str, datetime]]):
+    """UPDATE setting ``status`` for (bot_id, created_at) pairs unless a newer status is stored."""
+    events = values(
+        column("bot_id", Text), column("status_at", DateTime(timezone=True)), name="events"
+    ).data(bots)
+    return (
+        update(UserMeetings)
+        .where(
+            UserMeetings.bot_id == events.c.bot_id,
+            or_(UserMeetings.bot_status_at.is_(None), UserMeetings.bot_status_at < events.c.status_at),
+        )
+        .values(bot_status=status, bot_status_at=events.c.status_at)
+        .returning(UserMeetings.userId)
+    )
+
+
+class BotStatusService:
+    """Applies Recall bot status webhooks to UserMeetings in batches.
+
+    Webhooks only enqueue; a background task flushes every
+    ``BOT_STATUS_FLUSH_INTERVAL_SECONDS`` or as soon as
+    ``BOT_STATUS_BATCH_SIZE`` bots are pending. Within a batch only the
+    latest status per bot is kept, and each flush is one transaction with
+    one UPDATE per distinct status. The UPDATE stores the event's
+    ``created_at`` in ``bot_status_at`` and skips rows whose stored status
+    is newer, so a webhook retried or delivered late cannot roll a bot back.
+    """
+
+    def __init__(self, meeting_versions: Optional[MeetingVersions] = None):
+        self.logger = get_logger("BotStatusService")
+        self.meeting_versions = meeting_versions
+        self.flush_interval_seconds = float(os.getenv("BOT_STATUS_FLUSH_INTERVAL_SECONDS", "0.5"))
+        self.batch_size = int(os.getenv("BOT_STATUS_BATCH_SIZE", "100"))
+        # Svix signing secret from the Recall dashboard; webhooks are
+        # refused with 503 while it is not set
+        self.webhook_secret = os.getenv("RECALL_WEBHOOK_SECRET")
+        # bot_id -> (created_at, status)
+        self._pending: Dict[str, Tuple[datetime, MeetingBotStatus]] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if not self.webhook_secret:
+            self.logger.error("RECALL_WEBHOOK_SECRET is not set; Recall webhooks will be refused")
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        # Do not drop updates that arrived just before shutdown
+        try:
+            await self.flush()
+        except Exception:
+            self.logger.error("Flushing bot status updates at shutdown failed", pending=len(self._pending), exc_info=True)
+
+    def receive_webhook(self, headers, body: bytes) -> bool:
+        """Verify and parse a webhook request and queue its status update."""
+        if not self.webhook_secret:
+            raise HTTPException(status_code=503, detail="Recall webhooks are not configured")
+        verify_recall_signature(self.webhook_secret, headers, body)
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        event = parse_bot_status_event(payload) if isinstance(payload, dict) else None
+        if event is None:
+            return False
+        return self.enqueue(*event)
+
+    def enqueue(self, bot_id: str, code: str, created_at: str = "") -> bool:
+        BOT_STATUS_EVENTS.inc(code=code)
+        status = RECALL_STATUS_MAP.get(code)
+        if status is None:
+            self.logger.debug("Ignoring Recall status", bot_id=bot_id, code=code)
+            return False
+        status_at = parse_status_time(created_at)
+        current = self._pending.get(bot_id)
+        if current is None or status_at >= current[0]:
+            self._pending[bot_id] = (status_at, status)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                self.logger.error("Flushing bot status updates failed", exc_info=True)
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        bots_by_status: Dict[MeetingBotStatus, List[Tuple[str, datetime]]] = defaultdict(list)
+        for bot_id, (status_at, status) in pending.items():
+            bots_by_status[status].append((bot_id, status_at))
+
+        updated_user_ids = set()
+        try:
+            async for session in get_async_session():
+                if not await BOT_STATUS_SCHEMA.ready(session):
+                    # Retrying cannot help until the enum is migrated
+                    self.logger.warning("Dropping bot status updates", bots=len(pending))
+                    return 0
+                with stage("bot_status_update", provider="postgres"):
+                    for status, bots in bots_by_status.items():
+                        result = await session.execute(status_update(status, bots))
+                        updated_user_ids.update(result.scalars().all())
+                    await session.commit()
+        except Exception:
+            # Put the batch back unless a newer status arrived meanwhile
+            for bot_id, entry in pending.items():
+                current = self._pending.get(bot_id)
+                if current is None or entry[0] > current[0]:
+                    self._pending[bot_id] = entry
+            raise
+
+        if self.meeting_versions is not None and updated_user_ids:
+            await self.meeting_versions.bump(updated_user_ids)
+        self.logger.debug("Applied bot status updates", bots=len(pending), statuses=len(bots_by_status))
+        return len(pending)
+
+    async def get_status(self, bot_id: str, user_id: int) -> List[dict]:
+        """Current status of ``user_id``'s meetings attached to ``bot_id``, from the database."""
+        async for session in get_async_session():
+            with stage("bot_status_load", provider="postgres"):
+                result = await session.execute(
+                    select(UserMeetings.id, UserMeetings.userId, UserMeetings.bot_status, UserMeetings.updatedAt)
+                    .where(UserMeetings.bot_id == bot_id, UserMeetings.userId == user_id)
+                )
+            return [
+                {
+                    "meeting_id": row.id,
+                    "user_id": row.userId,
+                    "bot_status": row.bot_status.value,
+                    "updated_at": row.updatedAt.isoformat() if isinstance(row.updatedAt, datetime) else None,
+                }
+                for row in result
+            ]
+        return []
@@ -0,0 +1,52 @@
+import os
+import time
+from src.calendar.calendar_snapshots import MeetingSnapshot
+from utils.redis.redis_utils import RedisManager
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+class ReminderLedger:
+    """Records Slack reminders so each user gets at most one per meeting occurrence.
+
+    Sending is claim-then-confirm on ``meeting_reminder:{meeting_id}:{user_id}``:
+
+    - ``claim()`` sets the key to ``pending`` only if it does not exist, so
+      two ticks or workers cannot both post. The claim expires after
+      ``REMINDER_CLAIM_TTL_SECONDS`` in case the sender dies.
+    - ``confirm()`` marks it ``sent`` until the meeting has ended plus
+      ``REMINDER_LEDGER_GRACE_SECONDS``, after which the key is not needed.
+    - ``fail()`` marks it ``failed`` for the same period after a failed send.
+
+    Delivery is at most once. Reminders are only sent when the bot for the
+    meeting is created, and later ticks see the bot and skip the event, so a
+    failed send is recorded and logged rather than retried.
+    """
+
+    def __init__(self, cache_manager: RedisManager):
+        self.cache_manager = cache_manager
+        self.claim_ttl_seconds = int(os.getenv("REMINDER_CLAIM_TTL_SECONDS", "120"))
+        self.grace_seconds = int(os.getenv("REMINDER_LEDGER_GRACE_SECONDS", "600"))
+        # Used when a meeting has no end time
+        self.default_duration_seconds = 3600
+
+    @staticmethod
+    def key(meeting_obj: MeetingSnapshot) -> str:
+        return f"meeting_reminder:{meeting_obj.id}:{meeting_obj.userId}"
+
+    def _sent_ttl(self, meeting_obj: MeetingSnapshot, now: float) -> int:
+        end_time = meeting_obj.end_time or meeting_obj.start_time + self.default_duration_seconds
+        return max(int(end_time - now), 0) + self.grace_seconds
+
+    async def claim(self, meeting_obj: MeetingSnapshot) -> bool:
+        return await self.cache_manager.set_nx(self.key(meeting_obj), PENDING, self.claim_ttl_seconds)
+
+    async def confirm(self, meeting_obj: MeetingSnapshot, now: float = None):
+        now = time.time() if now is None else now
+        await self.cache_manager.set(self.key(meeting_obj), SENT, self._sent_ttl(meeting_obj, now))
+
+    async def fail(self, meeting_obj: MeetingSnapshot, now: float = None):
+        now = time.time() if now is None else now
+        await self.cache_manager.set(self.key(meeting_obj), FAILED, self._sent_ttl(meeting_obj, now))
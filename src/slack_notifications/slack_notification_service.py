@@ -1,74 +1,126 @@
+import asyncio
 import os
-
-print("imported moment")
+import aiohttp
 from fastapi import HTTPException
-
-print("imported HTTPException from fastapi")
-from slack_sdk import WebClient
-
-print("imported WebClient from slack_sdk")
 from slack_sdk.errors import SlackApiError
-
-print("imported SlackApiError from slack_sdk.errors")
-from typing import Dict
-
-print("imported Dict from typing")
-from db.models.models import User, UserMeetings
-
-print("imported User and UserMeetings from db.models.models")
+from slack_sdk.web.async_client import AsyncWebClient
+from typing import Dict, Iterable, Optional
+from src.calendar.calendar_snapshots import MeetingSnapshot, ParticipantSnapshot, UserSnapshot
 from typing import List
-
-print("imported List from typing")
 from datetime import datetime
 import pytz
+from utils.logging.logging_utils import get_logger
+from utils.redis.redis_utils import RedisManager
+from utils.metrics.pipeline_metrics import REMINDERS_SENT, stage
 
 
 class SlackNotificationService:
-    def __init__(self):
-        print("Initializing SlackNotificationService")
-        self.client = WebClient(token=os.getenv("SLACK_BOT_TOKEN"))
-        print("Initialized WebClient")
+    def __init__(self, cache_manager: Optional[RedisManager] = None):
+        self.logger = get_logger("SlackNotificationService")
+        # Caches email -> Slack user id when given; ids never change
+        self.cache_manager = cache_manager
+        self.user_id_ttl_seconds = int(os.getenv("SLACK_USER_ID_CACHE_TTL_SECONDS", "86400"))
         self.slack_bot_token = os.getenv("SLACK_BOT_TOKEN")
-        print("Set slack_bot_token")
         self.slack_app_token = os.getenv("SLACK_APP_TOKEN")
-        print("Set slack_app_token")
         self.slack_signing_secret = os.getenv("SLACK_SIGNING_SECRET")
-        print("Set slack_signing_secret")
+        self.base_url = os.getenv("SLACK_API_BASE_URL", AsyncWebClient.BASE_URL)
+        self._client: Optional[AsyncWebClient] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Bounds concurrent users.lookupByEmail calls across all reminders
+        self._lookup_semaphore = asyncio.Semaphore(int(os.getenv("SLACK_LOOKUP_CONCURRENCY", "8")))
+        # email -> in-flight first name lookup, so concurrent callers share one call
+        self._inflight_lookups: Dict[str, asyncio.Task] = {}
 
-    async def fetch_slack_user_id_by_email(self, email: str):
-        print(f"Fetching Slack user ID by email: {email}")
+    @property
+    def client(self) -> AsyncWebClient:
+        # Built on first use, inside the running loop, with one shared
+        # connection pool instead of a new session per call
+        if self._client is None:
+            self._session = aiohttp.ClientSession()
+            self._client = AsyncWebClient(token=self.slack_bot_token, base_url=self.base_url, session=self._session)
+        return self._client
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._client = None
 
+    async def fetch_slack_user_id_by_email(self, email: str):
+        cache_key = f"slack_user_id:{email}"
+        if self.cache_manager is not None:
+            slack_user_id = await self.cache_manager.get_cached(cache_key)
+            if slack_user_id is not None:
+                return slack_user_id
         try:
-            response = self.client.users_lookupByEmail(email=email)
-            print(f"Received response: {response}")
-            return response["user"]["id"]
+            with stage("slack_lookup", provider="slack"):
+                response = await self.client.users_lookupByEmail(email=email)
+            slack_user_id = response["user"]["id"]
+            if self.cache_manager is not None:
+                await self.cache_manager.set_cached(cache_key, slack_user_id, self.user_id_ttl_seconds)
+            return slack_user_id
         except SlackApiError as e:
-            print(f"SlackApiError: {e.response['error']}")
+            self.logger.error("Slack user lookup failed", error=e.response['error'])
             raise HTTPException(
                 status_code=500,
                 detail=f"Error fetching Slack user by email: {e.response['error']}",
             )
 
     async def fetch_slack_participant_info(self, email: str):
-        print(f"Fetching Slack participant info by email: {email}")
         try:
-
-            response = self.client.users_lookupByEmail(email=email)
-            print(f"Received response: {response}")
+            with stage("slack_lookup", provider="slack"):
+                response = await self.client.users_lookupByEmail(email=email)
             user = response["user"]
-            print(f"Fetched user: {user}")
             return user["profile"]["first_name"]
         except SlackApiError as e:
-            print(f"SlackApiError: {e.response['error']}")
+            self.logger.error("Slack participant lookup failed", error=e.response['error'])
             raise HTTPException(
                 status_code=500,
                 detail=f"Error fetching user info for {email}: {e.response['error']}",
             )
 
+    async def _fetch_first_name_bounded(self, email: str) -> Optional[str]:
+        async with self._lookup_semaphore:
+            return await self.fetch_slack_participant_info(email)
+
+    def _lookup_first_name(self, email: str) -> asyncio.Task:
+        task = self._inflight_lookups.get(email)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_first_name_bounded(email))
+            self._inflight_lookups[email] = task
+            task.add_done_callback(lambda _: self._inflight_lookups.pop(email, None))
+        return task
+
+    async def resolve_first_names(
+        self, emails: Iterable[str], resolved: Optional[Dict[str, asyncio.Task]] = None
+    ) -> Dict[str, Optional[str]]:
+        """Look up Slack first names for ``emails`` concurrently.
+
+        Lookups run at most ``SLACK_LOOKUP_CONCURRENCY`` at a time and
+        concurrent requests for one email share a call. Pass the same
+        ``resolved`` dict for every reminder of a meeting occurrence to
+        reuse its lookups; a lookup that fails is dropped from it, so the
+        next reminder retries instead of reusing the error.
+        """
+        resolved = resolved if resolved is not None else {}
+        for email in emails:
+            if email not in resolved:
+                task = resolved[email] = self._lookup_first_name(email)
+                task.add_done_callback(lambda done, email=email: self._forget_failed(resolved, email, done))
+        names = {}
+        for email in emails:
+            # Shielded: a cancelled reminder must not cancel a lookup others share
+            names[email] = await asyncio.shield(resolved[email])
+        return names
+
+    @staticmethod
+    def _forget_failed(resolved: Dict[str, asyncio.Task], email: str, task: asyncio.Task):
+        if (task.cancelled() or task.exception() is not None) and resolved.get(email) is task:
+            del resolved[email]
+
     async def send_slack_reminder(
         self, slack_user_id: str, meeting_details: Dict[str, str], intro_line: str
     ):
-        print(f"Sending Slack reminder to user ID: {slack_user_id}")
         blocks = [
             {"type": "divider"},
             {
@@ -120,18 +172,17 @@ class SlackNotificationService:
                 ],
             },
         ]
-        print(f"Constructed blocks: {blocks}")
 
         try:
-            response = self.client.chat_postMessage(
-                channel=slack_user_id,
-                blocks=blocks,
-                text="You have an upcoming meeting.",
-            )
-            print(f"Received response from chat_postMessage: {response}")
+            with stage("slack_post", provider="slack"):
+                response = await self.client.chat_postMessage(
+                    channel=slack_user_id,
+                    blocks=blocks,
+                    text="You have an upcoming meeting.",
+                )
             return response.get("ok", False)
         except SlackApiError as e:
-            print(f"SlackApiError: {e.response['error']}")
+            self.logger.error("Slack reminder post failed", slack_user_id=slack_user_id, error=e.response['error'])
             raise HTTPException(
                 status_code=500,
                 detail=f"Error sending meeting reminder: {e.response['error']}",
@@ -139,83 +190,67 @@ class SlackNotificationService:
 
     async def send_meeting_reminder_to_user(
         self,
-        meeting_obj: UserMeetings,
-        user_obj: User,
-        participants: List[User],
-        organizer: User,
+        meeting_obj: MeetingSnapshot,
+        user_obj: UserSnapshot,
+        participants: List[ParticipantSnapshot],
+        organizer: dict,
+        participant_names: Optional[Dict[str, asyncio.Task]] = None,
     ):
-        print(
-            f"Sending meeting reminder to user: {user_obj.email} for meeting: {meeting_obj.title}"
-        )
+        """Send ``user_obj`` a Slack reminder for ``meeting_obj``.
+
+        ``participant_names`` caches Slack name lookups; share one dict across
+        all reminders of a meeting occurrence.
+        """
+        slack_user_id_lookup = None
         try:
 
             domains = {}
-            print("Initialized domains dictionary")
             first_name = None
-            print("Initialized first_name to None")
+
+            # Resolve every missing name up front, concurrently, alongside
+            # the recipient's Slack id
+            other_participants = [p for p in participants if p.email != user_obj.email]
+            emails_to_resolve = [p.email for p in other_participants if not p.name]
+            if organizer["email"] != user_obj.email and not organizer.get("name"):
+                emails_to_resolve.append(organizer["email"])
+            slack_user_id_lookup = asyncio.ensure_future(self.fetch_slack_user_id_by_email(user_obj.email))
+            slack_names = await self.resolve_first_names(dict.fromkeys(emails_to_resolve), participant_names)
 
             if organizer["email"] != user_obj.email:
-                print(
-                    f"Organizer email {organizer['email']} is different from user email {user_obj.email}"
-                )
-                first_name = organizer.name or await self.fetch_slack_participant_info(
-                    organizer["email"]
-                )
-                print(f"Fetched first_name: {first_name}")
+                first_name = organizer.get("name") or slack_names.get(organizer["email"])
 
             participant_first_names = []
-            print("Initialized participant_first_names list")
-            for participant_obj in participants:
-                print(f"Processing participant: {participant_obj.email}")
-                if participant_obj.email != user_obj.email:
-                    print(
-                        f"Participant email {participant_obj.email} is different from user email {user_obj.email}"
-                    )
-                    name = (
-                        participant_obj.name
-                        or await self.fetch_slack_participant_info(
-                            participant_obj.email
-                        )
-                    )
-                    print(f"Fetched name: {name}")
-                    domain = participant_obj.email.split("@")[1]
-                    print(f"Extracted domain: {domain}")
-                    if domain not in domains:
-                        domains[domain] = []
-                        print(f"Added new domain to domains: {domain}")
-                    domains[domain].append(name)
-                    print(f"Appended name to domain in domains: {domains[domain]}")
-                    participant_first_names.append(name)
-                    print(
-                        f"Appended name to participant_first_names: {participant_first_names}"
-                    )
+            for participant_obj in other_participants:
+                name = (
+                    participant_obj.name
+                    or slack_names.get(participant_obj.email)
+                    or participant_obj.email.split("@")[0]
+                )
+                domain = participant_obj.email.split("@")[1]
+                if domain not in domains:
+                    domains[domain] = []
+                domains[domain].append(name)
+                participant_first_names.append(name)
 
             if not first_name:
                 first_name = (
                     participant_first_names[0] if participant_first_names else "Someone"
                 )
-                print(f"Set first_name to: {first_name}")
 
             external_domains = [
                 domain for domain in domains if len(domains[domain]) == 1
             ]
-            print(f"Filtered external_domains: {external_domains}")
             external_users = [domains[domain][0] for domain in external_domains]
-            print(f"Extracted external_users: {external_users}")
             external_info = (
                 f", including {len(external_users)} external users from {external_domains[0]}"
                 if external_domains
                 else ""
             )
-            print(f"Constructed external_info: {external_info}")
 
             others_count = len(participant_first_names) - 1
-            print(f"Calculated others_count: {others_count}")
             intro_line = f"You have a meeting with {first_name}{external_info}."
-            print(f"Constructed intro_line: {intro_line}")
             if others_count > 0:
                 intro_line = f"You have a meeting with {first_name} and {others_count} others{external_info}."
-                print(f"Updated intro_line: {intro_line}")
 
             user_timezone = pytz.timezone(user_obj.timezone)
             start_time = (
@@ -236,29 +271,31 @@ class SlackNotificationService:
                 "end_time": end_time,
                 "provider": meeting_obj.provider,
             }
-            print(f"Constructed meeting_details: {meeting_details}")
 
-            slack_user_id = await self.fetch_slack_user_id_by_email(user_obj.email)
-            print(f"Fetched slack_user_id: {slack_user_id}")
+            slack_user_id = await slack_user_id_lookup
             success = await self.send_slack_reminder(
                 slack_user_id, meeting_details, intro_line
             )
-            print(f"Sent Slack reminder, success: {success}")
 
             if not success:
-                print(f"Failed to send Slack reminder to user {user_obj.id}")
+                self.logger.error("Failed to send Slack reminder", user_id=user_obj.id, meeting_id=meeting_obj.id)
                 raise HTTPException(
                     status_code=500,
                     detail=f"Error while sending meeting reminder to user {user_obj.id}",
                 )
 
-            print(
-                f"Successfully sent meeting reminder to user {user_obj.id} for meeting {meeting_obj.id}"
-            )
+            REMINDERS_SENT.inc()
+            self.logger.info("Sent meeting reminder", user_id=user_obj.id, meeting_id=meeting_obj.id)
             return {
                 "message": f"Successfully sent meeting reminder to user {user_obj.id} for meeting {meeting_obj.id}"
             }
 
         except Exception as e:
-            print(f"Exception occurred: {e}")
+            self.logger.error("Sending meeting reminder failed", user_id=user_obj.id, meeting_id=meeting_obj.id, error=str(e))
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            # A step that raised before the lookup was awaited must not leave
+            # it running or its exception unretrieved
+            if slack_user_id_lookup is not None:
+                slack_user_id_lookup.cancel()
+                await asyncio.gather(slack_user_id_lookup, return_exceptions=True)
@@ -0,0 +1,93 @@
+"""In-process fakes for the unit tests."""
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+from utils.redis.redis_utils import LocalTTLCache
+
+
+class FakeRedisManager:
+    """In-process stand-in for RedisManager with expiry and optional latency."""
+
+    def __init__(self, latency_ms: float = 0.0, calls: Optional[Counter] = None):
+        self.latency_ms = latency_ms
+        self.calls = calls if calls is not None else Counter()
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self.local_cache = LocalTTLCache(4096, 30)
+
+    async def _op(self, name: str):
+        self.calls[f"redis.{name}"] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    async def get(self, key: str) -> str:
+        await self._op("get")
+        value = self._values.get(key)
+        if value is None:
+            return None
+        if value[1] is not None and value[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return value[0]
+
+    async def set(self, key: str, value: str, expiration: int):
+        await self._op("set")
+        self._values[key] = (value, time.monotonic() + expiration if expiration else None)
+
+    async def set_nx(self, key: str, value: str, expiration: int) -> bool:
+        await self._op("set_nx")
+        current = self._values.get(key)
+        if current is not None and (current[1] is None or current[1] > time.monotonic()):
+            return False
+        self._values[key] = (value, time.monotonic() + expiration if expiration else None)
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        await self._op("incr")
+        expires_at = self._values[key][1] if key in self._values else None
+        self._values[key] = (str(value), expires_at)
+        return value
+
+    async def get_cached(self, key: str, local_ttl: Optional[float] = None) -> Optional[str]:
+        value = self.local_cache.get(key)
+        if value is None:
+            value = await self.get(key)
+            if value is not None:
+                self.local_cache.set(key, value, local_ttl)
+        return value
+
+    async def set_cached(self, key: str, value: str, expiration: int, local_ttl: Optional[float] = None):
+        await self.set(key, value, expiration)
+        self.local_cache.set(key, value, local_ttl)
+
+    async def delete(self, key: str):
+        await self._op("delete")
+        self.local_cache.pop(key)
+        self._values.pop(key, None)
+
+    async def get_json(self, key: str) -> dict:
+        data = await self.get(key)
+        return json.loads(data) if data else None
+
+    async def set_json(self, key: str, value: dict, expiration: int):
+        await self.set(key, json.dumps(value), expiration)
+
+    async def hgetall(self, key: str) -> dict:
+        await self._op("hgetall")
+        return dict(self._hashes.get(key, {}))
+
+    async def hset(self, key: str, mapping: dict):
+        await self._op("hset")
+        self._hashes.setdefault(key, {}).update(mapping)
+
+    async def hdel(self, key: str, *fields: str):
+        if fields:
+            await self._op("hdel")
+            for field in fields:
+                self._hashes.get(key, {}).pop(field, None)
+
+    async def close(self):
+        pass
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from app import create_app
+from db import sessions
+from src.cron_scheduler.scheduler_service import SchedulerService
+from utils.monitoring.loop_monitor import LOOP_LAG_PERCENTILES
+from utils.tracing.tracing_utils import TRACER
+
+
+def test_failed_startup_tears_down_the_steps_before_it(monkeypatch):
+    calls = []
+    monkeypatch.setattr(TRACER, "configure", lambda: calls.append("tracer.configure"))
+    monkeypatch.setattr(TRACER, "shutdown", lambda: calls.append("tracer.shutdown"))
+    monkeypatch.setattr(sessions, "get_async_engine", lambda: calls.append("engine") or object())
+    monkeypatch.setattr("utils.metrics.pipeline_metrics.watch_db_pool", lambda engine: lambda: calls.append("unwatch_db_pool"))
+
+    async def dispose_async_engine():
+        calls.append("dispose_async_engine")
+
+    async def start(self):
+        raise RuntimeError("scheduler failed to start")
+
+    monkeypatch.setattr(sessions, "dispose_async_engine", dispose_async_engine)
+    monkeypatch.setattr(SchedulerService, "start", start)
+
+    app = create_app()
+    with pytest.raises(RuntimeError, match="scheduler failed to start"):
+        with TestClient(app):
+            pass
+
+    assert calls == ["tracer.configure", "engine", "unwatch_db_pool", "dispose_async_engine", "tracer.shutdown"]
+    assert app.state.loop_monitor._collect_percentiles not in LOOP_LAG_PERCENTILES._callbacks
+    assert app.state.scheduler_service is None
+
+
+def test_importing_the_app_skips_auth_and_database_modules():
+    code = (
+        "import sys\n"
+        "import main\n"
+        "loaded = [name for name in ('jose', 'sqlalchemy', 'db.models.models', 'db.sessions') if name in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1])
@@ -0,0 +1,56 @@
+import pytest
+from src.calendar.bot_disable_windows import DisableWindowCache, DisableWindowIndex, _config_windows
+
+WINDOWS = [(100, 200), (150, 250), (400, 500)]
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (0, 1000, [(0, 100), (250, 400), (500, 1000)]),
+        (120, 240, []),
+        (220, 450, [(250, 400)]),
+        # Windows are half-open: touching a window's end is enabled
+        (250, 400, [(250, 400)]),
+        (0, 100, [(0, 100)]),
+        (600, 700, [(600, 700)]),
+        (450, 450, []),
+    ],
+)
+def test_enabled_ranges(start, end, expected):
+    assert DisableWindowIndex(WINDOWS).enabled_ranges(start, end) == expected
+
+
+def test_touching_and_empty_windows_are_merged_or_dropped():
+    index = DisableWindowIndex([(300, 400), (100, 200), (200, 300), (50, 50), (600, 500)])
+    assert (index.starts, index.ends) == ([100], [400])
+
+
+def test_no_windows_leaves_the_whole_range_enabled():
+    assert DisableWindowIndex([]).enabled_ranges(10, 20) == [(10, 20)]
+
+
+def test_config_reads_legacy_and_list_windows():
+    config = {
+        "isDisabled": True,
+        "startTime": 10,
+        "endTime": 20,
+        "disableWindows": [{"startTime": 30, "endTime": 40}],
+    }
+    assert _config_windows(config) == ((10, 20), (30, 40))
+    assert _config_windows({"isDisabled": False, "startTime": 10, "endTime": 20}) == ()
+    assert _config_windows(None) == ()
+
+
+def test_cache_rebuilds_only_when_the_config_changes():
+    cache = DisableWindowCache()
+    config = {"disableWindows": [{"startTime": 100, "endTime": 200}]}
+    index = cache.get(1, config)
+    assert cache.get(1, dict(config)) is index
+
+    changed = {"disableWindows": [{"startTime": 100, "endTime": 300}]}
+    assert cache.enabled_ranges(1, changed, 0, 400) == [(0, 100), (300, 400)]
+
+    cache.get(2, None)
+    cache.forget_users([2])
+    assert len(cache) == 1
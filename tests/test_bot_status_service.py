@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timezone
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from db.models.models import MeetingBotStatus
+from src.recall.bot_status_service import BotStatusSchemaCheck, BotStatusService, status_update
+
+SECRET = "whsec_" + base64.b64encode(b"test-signing-key").decode()
+
+
+def _signed_headers(body: bytes, secret: str = SECRET) -> dict:
+    message_id, timestamp = "msg_1", str(int(time.time()))
+    key = base64.b64decode(secret.split("_", 1)[1])
+    digest = hmac.new(key, f"{message_id}.{timestamp}.".encode() + body, hashlib.sha256).digest()
+    return {
+        "webhook-id": message_id,
+        "webhook-timestamp": timestamp,
+        "webhook-signature": "v1," + base64.b64encode(digest).decode(),
+    }
+
+
+def _status_event(bot_id: str, code: str, created_at: str = "2026-01-01T00:00:00Z") -> bytes:
+    return json.dumps({
+        "event": "bot.status_change",
+        "data": {"bot_id": bot_id, "status": {"code": code, "created_at": created_at}},
+    }).encode()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("RECALL_WEBHOOK_SECRET", SECRET)
+    return BotStatusService()
+
+
+def test_webhooks_are_refused_without_a_secret(monkeypatch):
+    monkeypatch.delenv("RECALL_WEBHOOK_SECRET", raising=False)
+    body = _status_event("bot-1", "joining_call")
+    with pytest.raises(HTTPException) as error:
+        BotStatusService().receive_webhook(_signed_headers(body), body)
+    assert error.value.status_code == 503
+
+
+def test_signed_webhook_is_queued(service):
+    body = _status_event("bot-1", "in_call_recording")
+    assert service.receive_webhook(_signed_headers(body), body) is True
+    assert service._pending["bot-1"][1] == MeetingBotStatus.RECORDING
+
+
+def test_bad_signature_is_rejected(service):
+    body = _status_event("bot-1", "in_call_recording")
+    other_secret = "whsec_" + base64.b64encode(b"another-key").decode()
+    with pytest.raises(HTTPException) as error:
+        service.receive_webhook(_signed_headers(body, other_secret), body)
+    assert error.value.status_code == 401
+
+
+def test_only_the_latest_status_per_bot_is_kept(service):
+    service.enqueue("bot-1", "in_call_recording", "2026-01-01T00:00:02Z")
+    service.enqueue("bot-1", "joining_call", "2026-01-01T00:00:01Z")
+    assert service._pending["bot-1"][1] == MeetingBotStatus.RECORDING
+    assert service.enqueue("bot-1", "unknown_code") is False
+
+
+def test_statuses_are_ordered_by_time_not_text(service):
+    service.enqueue("bot-1", "done", "2026-01-01T00:00:02Z")
+    service.enqueue("bot-1", "joining_call", "2026-01-01T00:00:01.500000+00:00")
+    assert service._pending["bot-1"][1] == MeetingBotStatus.DONE
+
+
+def test_status_update_skips_rows_with_a_newer_status():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    statement = status_update(MeetingBotStatus.JOINING, [("bot-1", created_at)])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "bot_status_at=events.status_at" in sql
+    assert '"UserMeetings_python".bot_status_at < events.status_at' in sql
+
+
+class FakeResult:
+    def __init__(self, labels):
+        self.labels = labels
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.labels
+
+
+class FakeSession:
+    def __init__(self, labels):
+        self.labels = labels
+        self.queries = 0
+
+    async def execute(self, statement, params=None):
+        self.queries += 1
+        return FakeResult(self.labels)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def test_schema_check_reports_missing_enum_values_and_rechecks_later():
+    check = BotStatusSchemaCheck()
+    session = FakeSession(["NOT_ADDED"])
+    assert asyncio.run(check.ready(session)) is False
+    # Not asked again until the recheck interval has passed
+    assert asyncio.run(check.ready(session)) is False
+    assert session.queries == 2
+
+    check._checked_at -= check.recheck_seconds
+    session.labels = [status.name for status in MeetingBotStatus]
+    assert asyncio.run(check.ready(session)) is True
+    assert asyncio.run(check.ready(session)) is True
+    assert session.queries == 4
+
+
+class MissingColumnSession(FakeSession):
+    """Has every enum value but not the bot_status_at column."""
+
+    async def execute(self, statement, params=None):
+        self.queries += 1
+        return FakeResult(self.labels if self.queries == 1 else [])
+
+
+def test_schema_check_requires_the_status_time_column():
+    session = MissingColumnSession([status.name for status in MeetingBotStatus])
+    assert asyncio.run(BotStatusSchemaCheck().ready(session)) is False
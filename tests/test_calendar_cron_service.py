@@ -0,0 +1,231 @@
+import asyncio
+import pytest
+from tests.fakes import FakeRedisManager
+from src.calendar.calendar_cron_service import BOT_CLAIM_PENDING, CalendarCronService
+from src.calendar.calendar_snapshots import EventSnapshot, MeetingSnapshot, UserSnapshot
+from src.calendar.event_decision_memo import EventDecision, EventDecisionMemo
+from src.meetings.meeting_versions import MeetingVersions
+from tests.test_meeting_identifiers import CHANGED_IDENTIFIERS
+
+USER = UserSnapshot(1, "ada@example.com", "grant-1", {"bot_name": "Supaloops.app"}, "UTC")
+
+
+def _event(url: str = "https://meet.google.com/abc-defg-hij", provider: str = "Google Meet") -> EventSnapshot:
+    return EventSnapshot.from_payload({
+        "id": "event-1",
+        "ical_uid": "ical-1",
+        "title": "Sync",
+        "updated_at": 1,
+        "when": {"start_time": 2000000000, "start_timezone": "UTC"},
+        "conferencing": {"provider": provider, "details": {"url": url}},
+        "organizer": {"email": "ada@example.com", "name": "Ada"},
+        "participants": [{"email": "bob@example.com", "status": "yes"}],
+    })
+
+
+@pytest.fixture
+def service():
+    service = CalendarCronService(nylas_api_key="test", nylas_api_uri="test")
+    service.cache_manager = FakeRedisManager()
+    return service
+
+
+def _classify(service, event):
+    return asyncio.run(service.classify_calendar_event(USER, event, [USER], []))
+
+
+def test_unclaimed_event_needs_action(service):
+    decision, context = _classify(service, _event())
+    assert decision == EventDecision.NEEDS_ACTION
+    assert context["cal_cache_key"] == "sl_cal_abc-defg-hij"
+
+
+def test_pending_claim_is_not_final(service):
+    asyncio.run(service.cache_manager.set("sl_cal_abc-defg-hij", BOT_CLAIM_PENDING, 120))
+    decision, _ = _classify(service, _event())
+    assert decision == EventDecision.CLAIMED_ELSEWHERE
+
+
+def test_stored_bot_is_already_scheduled(service):
+    asyncio.run(service.cache_manager.set("sl_cal_abc-defg-hij", "{'id': 'bot-1'}", 7200))
+    decision, _ = _classify(service, _event())
+    assert decision == EventDecision.ALREADY_SCHEDULED
+
+
+def test_lost_claim_creates_no_bot(service):
+    event = _event()
+    _, context = _classify(service, event)
+
+    async def connect_bot_to_event(*args, **kwargs):
+        raise AssertionError("bot created without the claim")
+
+    service.calendar_service.connect_bot_to_event = connect_bot_to_event
+    asyncio.run(service.cache_manager.set_nx(context["cal_cache_key"], BOT_CLAIM_PENDING, 120))
+    assert asyncio.run(service.schedule_bot_for_event(USER, event, context, [USER], [], session=None)) is False
+
+
+def test_memo_retries_claimed_elsewhere():
+    memo = EventDecisionMemo()
+    memo.record("grant-1", "event-1", 1, EventDecision.CLAIMED_ELSEWHERE)
+    assert memo.lookup("grant-1", "event-1", 1) is None
+    memo.record("grant-1", "event-1", 1, EventDecision.ALREADY_SCHEDULED)
+    assert memo.lookup("grant-1", "event-1", 1) == EventDecision.ALREADY_SCHEDULED
+
+
+def test_memo_misses_events_without_updated_at():
+    memo = EventDecisionMemo()
+    memo.record("grant-1", "event-1", None, EventDecision.NO_URL)
+    assert memo.lookup("grant-1", "event-1", None) is None
+
+
+def _stored_identifier(legacy_identifier):
+    # The pre-registry cron fell back to the ical_uid when it found no id
+    return legacy_identifier or "ical-1"
+
+
+@pytest.mark.parametrize("url, provider, identifier, legacy_identifier", CHANGED_IDENTIFIERS)
+def test_dedupe_key_with_the_pre_registry_id_is_honoured(service, url, provider, identifier, legacy_identifier):
+    stored = _stored_identifier(legacy_identifier)
+    asyncio.run(service.cache_manager.set(f"sl_cal_{stored}", "{'id': 'bot-1'}", 7200))
+    decision, _ = _classify(service, _event(url, provider))
+    assert decision == EventDecision.ALREADY_SCHEDULED
+
+
+@pytest.mark.parametrize("url, provider, identifier, legacy_identifier", CHANGED_IDENTIFIERS)
+def test_meeting_stored_with_the_pre_registry_id_gets_the_bot(service, url, provider, identifier, legacy_identifier):
+    event = _event(url, provider)
+    meeting = MeetingSnapshot(
+        7, USER.id, "other-calendar-uid", url, "Sync", event.start_time, None, "UTC", provider, False,
+        _stored_identifier(legacy_identifier), None,
+    )
+    updated = []
+
+    async def connect_bot_to_event(*args, **kwargs):
+        return {"data": {"id": "bot-1"}}
+
+    async def update_user_meeting(meeting_id, bot_id, session):
+        updated.append((meeting_id, bot_id))
+        return True
+
+    async def send_reminder_once(*args, **kwargs):
+        pass
+
+    service.calendar_service.connect_bot_to_event = connect_bot_to_event
+    service.update_user_meeting = update_user_meeting
+    service.send_reminder_once = send_reminder_once
+    service.meeting_versions = MeetingVersions(service.cache_manager)
+
+    decision, context = _classify(service, event)
+    assert decision == EventDecision.NEEDS_ACTION
+    assert context["cal_cache_key"] == f"sl_cal_{identifier}"
+    assert asyncio.run(service.schedule_bot_for_event(USER, event, context, [USER], [meeting], session=None)) is True
+    assert updated == [(7, "bot-1")]
+
+
+class StatusRejectingSession:
+    """Stores bot_id updates but fails the bot_status one, like an unmigrated enum."""
+
+    def __init__(self):
+        self.committed = []
+        self._pending = None
+
+    async def execute(self, statement, params=None):
+        values = {column.key: value for column, value in getattr(statement, "_values", {}).items()}
+        if "bot_status" in values:
+            raise ValueError('invalid input value for enum meetingbotstatus: "SCHEDULED"')
+        self._pending = values
+
+    async def commit(self):
+        if self._pending is not None:
+            self.committed.append(self._pending)
+        self._pending = None
+
+    async def rollback(self):
+        self._pending = None
+
+
+def test_bot_id_is_kept_when_the_status_cannot_be_stored(service, monkeypatch):
+    from src.calendar import calendar_cron_service
+
+    async def ready(session):
+        return True
+
+    monkeypatch.setattr(calendar_cron_service.BOT_STATUS_SCHEMA, "ready", ready)
+    session = StatusRejectingSession()
+    assert asyncio.run(service.update_user_meeting(7, "bot-1", session)) is True
+    assert [{key: getattr(value, "value", value) for key, value in values.items()} for values in session.committed] == [{"bot_id": "bot-1"}]
+
+
+class SlowReaderCron:
+    """Runs ticks against a reader that spends 1s per fetch and 2s per event on a fake clock."""
+
+    def __init__(self, monkeypatch, users):
+        from types import SimpleNamespace
+        from src.calendar import calendar_cron_service
+        from src.calendar.calendar_polling_scheduler import CalendarPollingScheduler
+
+        self.clock = [0.0]
+        monkeypatch.setattr(calendar_cron_service, "time", SimpleNamespace(monotonic=lambda: self.clock[0]))
+        monkeypatch.setenv("CALENDAR_TICK_BUDGET_SECONDS", "10")
+        monkeypatch.setenv("CALENDAR_TICK_FETCH_BUDGET_SHARE", "0.3")
+        self.users = users
+        self.fetched = []
+        self.processed = []
+        self.service = service = CalendarCronService(nylas_api_key="test", nylas_api_uri="test")
+        service.cache_manager = FakeRedisManager()
+        service.polling_scheduler = CalendarPollingScheduler(service.cache_manager)
+        service.get_all_users = self.get_all_users
+        service.get_user_meetings = self.get_user_meetings
+        service.fetch_user_calendar_events = self.fetch_user_calendar_events
+        service.classify_calendar_event = self.classify_calendar_event
+
+    async def get_all_users(self, session):
+        return list(self.users)
+
+    async def get_user_meetings(self, user_ids, start_time, end_time, session):
+        return []
+
+    async def fetch_user_calendar_events(self, user, start_time, end_time):
+        self.clock[0] += 1
+        self.fetched.append(user.grant_id)
+        return [
+            EventSnapshot.from_payload({
+                "id": f"{user.grant_id}-{number}",
+                "updated_at": 1,
+                "when": {"start_time": 2000000000 + user.id * 10 + number},
+            })
+            for number in range(2)
+        ]
+
+    async def classify_calendar_event(self, user, calendar_meet, users, user_meetings):
+        self.clock[0] += 2
+        self.processed.append(calendar_meet.id)
+        return EventDecision.NO_URL, {}
+
+    def tick(self):
+        self.clock[0] = 0.0
+        self.fetched.clear()
+        self.processed.clear()
+        assert asyncio.run(self.service.process_fetch_calendar_events(session=None)) is True
+
+
+def _user(number: int) -> UserSnapshot:
+    return UserSnapshot(number, f"user{number}@example.com", f"grant-{number}", {}, "UTC")
+
+
+def test_slow_tick_defers_grants_and_carries_work_to_the_next_tick(monkeypatch):
+    cron = SlowReaderCron(monkeypatch, [_user(number) for number in range(1, 6)])
+
+    cron.tick()
+    # 30% of the 10s budget covers three 1s fetches; the rest are deferred
+    assert cron.fetched == ["grant-1", "grant-2", "grant-3"]
+    # Events run most urgent first until the 10s tick deadline
+    assert cron.processed == ["grant-1-0", "grant-1-1", "grant-2-0", "grant-2-1"]
+    assert len(cron.service.work_queue) == 2
+
+    # A grant seen for the first time is due too, but after the deferred ones
+    cron.users.append(_user(0))
+    cron.tick()
+    assert cron.fetched == ["grant-4", "grant-5", "grant-0"]
+    # The carried-over events keep their place in the urgency order
+    assert cron.processed == ["grant-0-0", "grant-0-1", "grant-3-0", "grant-3-1"]
@@ -0,0 +1,90 @@
+import asyncio
+from tests.fakes import FakeRedisManager
+from src.calendar.calendar_polling_scheduler import CalendarPollingScheduler
+
+
+def _scheduler() -> CalendarPollingScheduler:
+    return CalendarPollingScheduler(FakeRedisManager(), min_interval=10, max_interval=300)
+
+
+def test_next_interval_doubles_without_events():
+    scheduler = _scheduler()
+    scheduler._schedule("grant-1", 0, 40)
+    assert scheduler.next_interval("grant-1", [], now=0) == 80
+
+
+def test_next_interval_is_capped_at_max():
+    scheduler = _scheduler()
+    scheduler._schedule("grant-1", 0, 250)
+    assert scheduler.next_interval("grant-1", [], now=0) == 300
+
+
+def test_next_interval_halves_time_to_next_meeting():
+    scheduler = _scheduler()
+    assert scheduler.next_interval("grant-1", [1000, 200], now=100) == 50
+
+
+def test_next_interval_floors_when_meetings_already_started():
+    scheduler = _scheduler()
+    assert scheduler.next_interval("grant-1", [50], now=100) == 10
+
+
+def test_new_grants_are_due_immediately():
+    scheduler = _scheduler()
+    due = asyncio.run(scheduler.due_grants(["grant-1", "grant-2"], now=100))
+    assert sorted(due) == ["grant-1", "grant-2"]
+
+
+def test_recorded_grant_is_not_due_until_its_interval_elapses():
+    scheduler = _scheduler()
+
+    async def run():
+        await scheduler.due_grants(["grant-1"], now=100)
+        await scheduler.record_poll("grant-1", [], now=100)
+        return await scheduler.due_grants(["grant-1"], now=105), await scheduler.due_grants(["grant-1"], now=120)
+
+    assert asyncio.run(run()) == ([], ["grant-1"])
+
+
+def test_unrecorded_grant_is_due_again_on_the_next_call():
+    scheduler = _scheduler()
+
+    async def run():
+        await scheduler.due_grants(["grant-1", "grant-2"], now=100)
+        # The tick was cancelled after recording only one grant
+        await scheduler.record_poll("grant-1", [], now=100)
+        return await scheduler.due_grants(["grant-1", "grant-2"], now=101)
+
+    assert asyncio.run(run()) == ["grant-2"]
+
+
+def test_removed_grants_are_forgotten():
+    scheduler = _scheduler()
+
+    async def run():
+        await scheduler.due_grants(["grant-1", "grant-2"], now=100)
+        return await scheduler.due_grants(["grant-2"], now=101)
+
+    assert asyncio.run(run()) == ["grant-2"]
+
+
+def test_partitions_keep_separate_schedules():
+    cache_manager = FakeRedisManager()
+
+    def partition(index):
+        return CalendarPollingScheduler(cache_manager, min_interval=10, max_interval=300, partition=(index, 2))
+
+    async def run():
+        for index, grant_id in ((0, "grant-a"), (1, "grant-b")):
+            scheduler = partition(index)
+            await scheduler.due_grants([grant_id], now=0)
+            await scheduler.record_poll(grant_id, [], now=0)
+        # After a restart each partition loads and prunes only its own schedule
+        for index, grant_id in ((0, "grant-a"), (1, "grant-b")):
+            await partition(index).due_grants([grant_id], now=1)
+        return [await cache_manager.hgetall(partition(index).redis_key) for index in (0, 1)]
+
+    first_schedule, second_schedule = asyncio.run(run())
+    assert partition(0).redis_key == "calendar_poll_schedule:0/2"
+    assert list(first_schedule) == ["grant-a"]
+    assert list(second_schedule) == ["grant-b"]
@@ -0,0 +1,44 @@
+from src.calendar.calendar_snapshots import EventSnapshot
+from src.calendar.calendar_work_queue import CalendarWorkQueue
+
+
+def _event(event_id: str, start_time, title: str = "Sync") -> EventSnapshot:
+    return EventSnapshot(event_id, None, title, 1, start_time, "UTC", None, None, None, ())
+
+
+def test_pops_most_urgent_first_and_all_day_last():
+    queue = CalendarWorkQueue()
+    queue.push("grant-1", _event("all-day", None))
+    queue.push("grant-1", _event("late", 300))
+    queue.push("grant-2", _event("soon", 100))
+    assert [queue.pop()[1].id for _ in range(3)] == ["soon", "late", "all-day"]
+    assert queue.pop() is None
+
+
+def test_repush_supersedes_pending_copy():
+    queue = CalendarWorkQueue()
+    queue.push("grant-1", _event("event-1", 100, title="Old"))
+    queue.push("grant-1", _event("event-1", 500, title="New"))
+    queue.push("grant-1", _event("event-2", 200))
+    assert len(queue) == 2
+    assert queue.pop()[1].id == "event-2"
+    grant_id, event = queue.pop()
+    assert (grant_id, event.title) == ("grant-1", "New")
+    assert queue.pop() is None
+
+
+def test_same_event_id_under_different_grants_is_kept_apart():
+    queue = CalendarWorkQueue()
+    queue.push("grant-1", _event("event-1", 100))
+    queue.push("grant-2", _event("event-1", 100))
+    assert len(queue) == 2
+
+
+def test_discard_grants_drops_inactive_work():
+    queue = CalendarWorkQueue()
+    queue.push("grant-1", _event("event-1", 100))
+    queue.push("grant-2", _event("event-2", 200))
+    queue.discard_grants(["grant-2"])
+    assert len(queue) == 1
+    assert queue.pop()[0] == "grant-2"
+    assert queue.pop() is None
@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.cron_scheduler import cron_worker
+from src.cron_scheduler.cron_runs import FAILED, SUCCEEDED
+from src.cron_scheduler.scheduler_service import SchedulerService
+from utils.metrics.metrics_utils import Histogram
+
+
+def test_api_scheduler_runs_unless_opted_out(monkeypatch):
+    monkeypatch.delenv("CALENDAR_CRON_IN_API", raising=False)
+    assert SchedulerService().enabled is True
+
+
+def test_api_scheduler_stays_off_when_the_worker_owns_the_ticks(monkeypatch):
+    monkeypatch.setenv("CALENDAR_CRON_IN_API", "false")
+    scheduler_service = SchedulerService()
+
+    async def run():
+        await scheduler_service.start()
+        return await scheduler_service.handle_calendar_events_cron()
+
+    assert asyncio.run(run()) is False
+    assert scheduler_service.scheduler is None
+    assert scheduler_service.calendar_service is None
+
+
+def test_histogram_deltas_round_trip_into_the_parent():
+    child = Histogram("stage_seconds", "test", ["stage"], buckets=(0.1, 1.0))
+    child.observe(0.05, stage="nylas_list")
+    before = {"stage_seconds": child.items()}
+    child.observe(0.5, stage="nylas_list")
+    child.observe(2.0, stage="slack_lookup")
+
+    deltas = cron_worker._histogram_deltas(before, {"stage_seconds": child.items()})
+    parent = Histogram("stage_seconds", "test", ["stage"], buckets=(0.1, 1.0))
+    for labels, counts, total, count in deltas["stage_seconds"]:
+        parent.add(counts, total, count, **labels)
+
+    assert parent.snapshot(stage="nylas_list") == ([0, 1, 0], 0.5, 1)
+    assert parent.snapshot(stage="slack_lookup") == ([0, 0, 1], 2.0, 1)
+
+
+def test_metrics_endpoint_serves_the_registry():
+    async def run():
+        server = await asyncio.start_server(cron_worker._handle_metrics_request, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        responses = []
+        for path in ("/metrics", "/other"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            responses.append(await reader.read())
+            writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    metrics, other = asyncio.run(run())
+    assert metrics.startswith(b"HTTP/1.1 200 OK")
+    assert b"# TYPE calendar_worker_ticks_total counter" in metrics
+    assert other.startswith(b"HTTP/1.1 404")
+
+
+def _fake_partition_tick() -> dict:
+    return {"succeeded": True, "duration_seconds": 0.0, "stages": {}, "counters": {}, "histograms": {}}
+
+
+class FakePartitionWorker(cron_worker.CalendarCronWorker):
+    """Partition processes that skip the cron service and answer at once."""
+
+    partition_tick = staticmethod(_fake_partition_tick)
+
+    def _new_executor(self, index: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+
+def test_partition_recovers_after_its_process_is_killed():
+    worker = FakePartitionWorker(processes=1)
+    worker.start()
+    try:
+        assert asyncio.run(worker.run_tick()).status == SUCCEEDED
+
+        executor = worker._executors[0]
+        for pid in list(executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        assert asyncio.run(worker.run_tick()).status == FAILED
+        assert worker._executors[0] is not executor
+
+        assert asyncio.run(worker.run_tick()).status == SUCCEEDED
+    finally:
+        for executor in worker._executors:
+            executor.shutdown(wait=True)
+
+
+def _hanging_partition_tick() -> dict:
+    # Hangs on the first call only; the marker file outlives the process
+    marker = os.environ["CRON_WORKER_TEST_MARKER"]
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        time.sleep(600)
+    return _fake_partition_tick()
+
+
+class HangingPartitionWorker(FakePartitionWorker):
+    partition_tick = staticmethod(_hanging_partition_tick)
+
+
+def test_hung_partition_is_replaced_after_the_timeout(monkeypatch, tmp_path):
+    monkeypatch.setenv("CRON_WORKER_TEST_MARKER", str(tmp_path / "hung"))
+    worker = HangingPartitionWorker(processes=1)
+    worker.partition_timeout_seconds = 2
+    worker.start()
+    try:
+        executor = worker._executors[0]
+        executor.submit(_fake_partition_tick).result()
+        processes = list(executor._processes.values())
+        assert asyncio.run(worker.run_tick()).status == FAILED
+        assert worker._executors[0] is not executor
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+
+        assert asyncio.run(worker.run_tick()).status == SUCCEEDED
+    finally:
+        for executor in worker._executors:
+            executor.shutdown(wait=True)
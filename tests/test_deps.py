@@ -0,0 +1,46 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+import deps
+from tests.fakes import FakeRedisManager
+from db.schemas.principal import Principal
+from utils.auth.principal_cache import PrincipalCache
+
+
+@pytest.fixture
+def principal_cache(monkeypatch):
+    monkeypatch.setattr(deps, "JWT_SECRET_KEY", "test-secret")
+    cache = PrincipalCache(Principal, FakeRedisManager())
+    monkeypatch.setattr(deps, "principal_cache", cache)
+    return cache
+
+
+def _token(sub: str, exp: float, secret: str = "test-secret") -> str:
+    return jwt.encode({"sub": sub, "exp": exp}, secret, algorithm=deps.ALGORITHM)
+
+
+def test_cached_principal_is_returned_without_a_database_lookup(principal_cache):
+    exp = time.time() + 600
+    principal = Principal(id=3, email="a@example.com", displayname="Ann")
+
+    async def run():
+        await principal_cache.set("a@example.com", principal, exp)
+        return await deps.get_current_user(_token("a@example.com", exp), db=None)
+
+    assert asyncio.run(run()) == principal
+
+
+def test_token_signed_with_another_key_is_rejected(principal_cache):
+    token = _token("a@example.com", time.time() + 600, secret="other")
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(deps.get_current_user(token, db=None))
+    assert error.value.status_code == 403
+
+
+def test_expired_token_is_rejected(principal_cache):
+    token = _token("a@example.com", time.time() - 600)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(deps.get_current_user(token, db=None))
+    assert error.value.status_code in (401, 403)
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+from app import create_app
+from utils.profiling.flight_recorder import FlightRecorder, TickCapture
+
+
+def _recorder(monkeypatch, capacity: int) -> FlightRecorder:
+    monkeypatch.setenv("CRON_FLIGHT_RECORDER", "true")
+    monkeypatch.setenv("CRON_FLIGHT_RECORDER_THRESHOLD_SECONDS", "1")
+    monkeypatch.setenv("CRON_FLIGHT_RECORDER_CAPACITY", str(capacity))
+    return FlightRecorder()
+
+
+def _tick(recorder: FlightRecorder, sequence: int, duration: float):
+    capture = TickCapture(f"tick-{sequence}", "calendar_tick")
+    capture.duration = duration
+    recorder._keep(capture, sequence)
+
+
+def test_keeps_the_slowest_ticks_not_the_most_recent(monkeypatch):
+    recorder = _recorder(monkeypatch, capacity=2)
+    _tick(recorder, 1, 30.0)
+    for sequence in range(2, 10):
+        _tick(recorder, sequence, 2.0)
+
+    durations = [summary["duration_seconds"] for summary in recorder.list_captures()]
+    assert durations == [30.0, 2.0]
+    assert recorder.get_capture("tick-1") is not None
+
+
+def test_faster_tick_does_not_replace_a_full_recorder(monkeypatch):
+    recorder = _recorder(monkeypatch, capacity=2)
+    _tick(recorder, 1, 5.0)
+    _tick(recorder, 2, 4.0)
+    _tick(recorder, 3, 3.0)
+    _tick(recorder, 4, 6.0)
+
+    assert sorted(capture.id for capture in recorder.captures) == ["tick-1", "tick-4"]
+
+
+def test_record_tick_skips_ticks_under_threshold(monkeypatch):
+    recorder = _recorder(monkeypatch, capacity=2)
+    with recorder.record_tick():
+        pass
+    assert recorder.captures == []
+
+
+def test_flight_recorder_routes_require_a_user():
+    client = TestClient(create_app())
+    for path in (
+        "/debug/flight-recorder",
+        "/debug/flight-recorder/tick-1/collapsed",
+        "/debug/flight-recorder/tick-1/pstats",
+    ):
+        assert client.get(path).status_code == 401
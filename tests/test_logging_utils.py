@@ -0,0 +1,62 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from utils.logging import logging_utils
+from utils.logging.logging_utils import configure_logging, get_logger, shutdown_logging
+
+
+@pytest.fixture
+def output(monkeypatch):
+    shutdown_logging()
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stream)
+    monkeypatch.setenv("LOG_FORMAT", "kv")
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    configure_logging()
+    yield stream
+    shutdown_logging()
+    monkeypatch.undo()
+    configure_logging()
+
+
+def test_listener_starts_with_the_first_record(output):
+    assert logging_utils._listener_started is False
+    get_logger("test").info("first")
+    assert logging_utils._listener_started is True
+
+
+def test_queued_records_reach_the_handler(output):
+    get_logger("test").info("Bot created", user_id=1, bot_id="abc")
+    shutdown_logging()
+    line = output.getvalue().strip()
+    assert "level=INFO logger=test" in line
+    assert 'msg="Bot created" user_id=1 bot_id=abc' in line
+
+
+def test_shutdown_flushes_queued_records(output):
+    logger = get_logger("test")
+    for index in range(500):
+        logger.info("tick", index=index)
+    shutdown_logging()
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 500
+    assert lines[-1].endswith("index=499")
+
+
+def test_disabled_levels_are_not_queued(output):
+    get_logger("test").debug("hidden")
+    assert logging_utils._listener_started is False
+
+
+def test_importing_modules_starts_no_listener():
+    code = (
+        "import threading\n"
+        "from utils.logging import logging_utils\n"
+        "import src.calendar.calendar_cron_service\n"
+        "assert logging_utils._listener is not None\n"
+        "assert not logging_utils._listener_started\n"
+        "assert threading.active_count() == 1, threading.enumerate()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[1])
@@ -0,0 +1,22 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app import create_app
+from utils.monitoring.loop_monitor import LOOP_LAG_PERCENTILES, EventLoopMonitor
+
+
+def test_percentile_callback_registered_only_while_running():
+    monitor = EventLoopMonitor()
+    assert monitor._collect_percentiles not in LOOP_LAG_PERCENTILES._callbacks
+
+    async def run():
+        monitor.start()
+        assert monitor._collect_percentiles in LOOP_LAG_PERCENTILES._callbacks
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert monitor._collect_percentiles not in LOOP_LAG_PERCENTILES._callbacks
+
+
+def test_event_loop_route_requires_a_user():
+    client = TestClient(create_app())
+    assert client.get("/debug/event-loop").status_code == 401
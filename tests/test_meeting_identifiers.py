@@ -0,0 +1,85 @@
+import pytest
+from src.calendar.meeting_identifiers import (
+    MeetingIdentifierRegistry,
+    get_legacy_meeting_identifier,
+    get_meeting_unique_identifier_from_url,
+)
+
+
+@pytest.mark.parametrize(
+    "url, identifier",
+    [
+        ("https://acme.zoom.us/j/80000000012?pwd=abc", "80000000012"),
+        ("https://zoom.us/wc/join/80000000012", "80000000012"),
+        ("https://acme.zoomgov.us/j/1", "1"),
+        ("https://acme.zoom.us/my/jdoe", "jdoe"),
+        ("https://meet.google.com/abc-defg-hij?authuser=0", "abc-defg-hij"),
+        ("https://MEET.google.com/abc-defg-hij", "abc-defg-hij"),
+        (
+            "https://teams.microsoft.com/l/meetup-join/19%3ameeting_ABC%40thread.v2/0?context=%7b%7d",
+            "19:meeting_ABC@thread.v2",
+        ),
+        ("https://teams.microsoft.com/meet/2345678?p=secret", "2345678"),
+        ("https://acme.webex.com/acme/j.php?MTID=m1234abcd", "m1234abcd"),
+        ("https://acme.webex.com/acme/j.php?foo=1&MTID=m1234abcd", "m1234abcd"),
+        ("https://acme.webex.com/meet/jdoe", "jdoe"),
+    ],
+)
+def test_provider_patterns(url, identifier):
+    assert get_meeting_unique_identifier_from_url(url) == identifier
+
+
+@pytest.mark.parametrize(
+    "url, identifier",
+    [
+        # No pattern matches: the last path segment
+        ("https://whereby.com/team-room", "team-room"),
+        ("https://example.com/", None),
+        ("https://[bad", None),
+    ],
+)
+def test_fallback(url, identifier):
+    assert get_meeting_unique_identifier_from_url(url) == identifier
+
+
+def test_register_clears_memoized_fallbacks():
+    registry = MeetingIdentifierRegistry(cache_size=16)
+    url = "https://video.example.com/rooms/abc?id=42"
+    assert registry.identify(url) == "abc"
+
+    registry.register("Example", r"^https?://video\.example\.com/rooms/[^?]*\?id=(\d+)")
+    assert registry.identify(url) == "42"
+
+
+def test_patterns_are_tried_in_registration_order():
+    registry = MeetingIdentifierRegistry(cache_size=16)
+    registry.register("First", r"/r/(\w+)")
+    registry.register("Second", r"/r/\w+/(\w+)")
+    assert registry.identify("https://example.com/r/one/two") == "one"
+
+
+# URL forms whose id changed with the registry: (url, Nylas provider, id, pre-registry id)
+CHANGED_IDENTIFIERS = [
+    (
+        "https://teams.microsoft.com/l/meetup-join/19%3ameeting_ABC%40thread.v2/0?context=%7b%7d",
+        "Microsoft Teams",
+        "19:meeting_ABC@thread.v2",
+        None,
+    ),
+    ("https://acme.webex.com/acme/j.php?MTID=m1234abcd", "WebEx", "m1234abcd", "j.php"),
+    ("https://zoom.us/wc/80000000012/join", "Zoom Meeting", "80000000012", "join"),
+]
+
+
+@pytest.mark.parametrize("url, provider, identifier, legacy_identifier", CHANGED_IDENTIFIERS)
+def test_legacy_identifier_matches_the_pre_registry_algorithm(url, provider, identifier, legacy_identifier):
+    assert get_meeting_unique_identifier_from_url(url) == identifier
+    assert get_legacy_meeting_identifier(url, provider) == legacy_identifier
+
+
+def test_legacy_identifier_is_unchanged_for_zoom_and_meet():
+    for url, provider in [
+        ("https://acme.zoom.us/j/80000000012?pwd=abc", "Zoom Meeting"),
+        ("https://meet.google.com/abc-defg-hij", "Google Meet"),
+    ]:
+        assert get_legacy_meeting_identifier(url, provider) == get_meeting_unique_identifier_from_url(url)
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import time
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+from app import create_app
+from db.models.models import UserMeetings
+from db.schemas.principal import Principal
+from deps import get_current_user
+from tests.fakes import FakeRedisManager
+from src.meetings import meetings_service as meetings_module
+from src.meetings.meeting_versions import MeetingVersions
+from src.meetings.meetings_service import MeetingsService, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(1700000000, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (1700000000, 42)
+
+
+def test_cursor_survives_negative_and_large_values():
+    assert decode_cursor(encode_cursor(-5, 2**40)) == (-5, 2**40)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1, 2)[:-2] + "!!", ""])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class FakeSession:
+    def __init__(self, state):
+        self.state = state
+
+    async def execute(self, statement):
+        self.state["queries"] += 1
+        return FakeResult(self.state["row"])
+
+
+@pytest.fixture
+def table_state(monkeypatch):
+    state = {"row": (3, datetime(2026, 1, 1), 30), "queries": 0}
+
+    async def get_async_session():
+        yield FakeSession(state)
+
+    monkeypatch.setattr(meetings_module, "get_async_session", get_async_session)
+    return state
+
+
+QUERY = (["id"], 50, None, "asc", None, None)
+
+
+def test_etag_with_a_counter_does_not_query_the_database(table_state):
+    service = MeetingsService(MeetingVersions(FakeRedisManager()))
+    asyncio.run(service.meeting_versions.seed(1))
+
+    first = asyncio.run(service.etag(1, QUERY))
+    assert asyncio.run(service.etag(1, QUERY)) == first
+    assert table_state["queries"] == 0
+
+
+def test_missing_counter_falls_back_to_the_rows_and_is_seeded(table_state):
+    service = MeetingsService(MeetingVersions(FakeRedisManager()))
+
+    first = asyncio.run(service.etag(1, QUERY))
+    assert table_state["queries"] == 1
+    assert asyncio.run(service.meeting_versions.get(1)) is not None
+    assert asyncio.run(service.etag(1, QUERY)) != first
+    assert table_state["queries"] == 1
+
+
+class FailingRedisManager(FakeRedisManager):
+    async def get(self, key: str) -> str:
+        raise ConnectionError("redis is down")
+
+
+def test_unreadable_counter_falls_back_to_the_rows(table_state):
+    service = MeetingsService(MeetingVersions(FailingRedisManager()))
+
+    first = asyncio.run(service.etag(1, QUERY))
+    assert asyncio.run(service.etag(1, QUERY)) == first
+    table_state["row"] = (3, datetime(2026, 1, 2), 30)
+    assert asyncio.run(service.etag(1, QUERY)) != first
+
+
+def test_etag_changes_with_version_and_query(table_state):
+    service = MeetingsService(MeetingVersions(FakeRedisManager()))
+    asyncio.run(service.meeting_versions.seed(1))
+
+    first = asyncio.run(service.etag(1, QUERY))
+    assert asyncio.run(service.etag(1, (["id"], 20, None, "asc", None, None))) != first
+    asyncio.run(service.meeting_versions.bump([1]))
+    assert asyncio.run(service.etag(1, QUERY)) != first
+
+
+def test_expired_counter_falls_back_to_the_rows(table_state, monkeypatch):
+    monkeypatch.setenv("MEETINGS_VERSION_TTL_SECONDS", "60")
+    redis = FakeRedisManager()
+    service = MeetingsService(MeetingVersions(redis))
+    asyncio.run(service.meeting_versions.seed(1))
+    key = "meetings_version:1"
+    value, expires_at = redis._values[key]
+    assert expires_at == pytest.approx(time.monotonic() + 60, abs=5)
+
+    # A bump keeps the TTL, so a missed bump is bounded by it
+    asyncio.run(service.meeting_versions.bump([1]))
+    assert redis._values[key][1] == expires_at
+
+    redis._values[key] = (value, time.monotonic() - 1)
+    asyncio.run(service.etag(1, QUERY))
+    assert table_state["queries"] == 1
+
+
+class SyncSessionAdapter:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def meetings_table(monkeypatch):
+    # UserMeetings on SQLite, which also compares row values, so the
+    # keyset query runs as written
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def attach_public_schema(connection, _):
+        connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    rows = [
+        {"id": meeting_id, "userId": user_id, "start_time": start_time, "title": f"Meeting {meeting_id}"}
+        for meeting_id, user_id, start_time in [
+            (1, 1, 300), (2, 1, 100), (3, 1, 200), (4, 1, 200), (5, 2, 150), (6, 1, 100), (7, 1, 400),
+        ]
+    ]
+    with engine.begin() as connection:
+        connection.execute(CreateTable(UserMeetings.__table__, include_foreign_key_constraints=[]))
+        connection.execute(insert(UserMeetings), [
+            {
+                **row,
+                "calendar_uid": f"cal-{row['id']}", "event_url": "https://meet.google.com/abc-defg-hij",
+                "participants": "[]", "timezone": "UTC", "provider": "google_meet",
+                "start_date": date(2026, 1, 1), "rough_notes": {"notes": "long"},
+            }
+            for row in rows
+        ])
+
+    async def get_async_session():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+
+    monkeypatch.setattr(meetings_module, "get_async_session", get_async_session)
+    yield engine
+    engine.dispose()
+
+
+def _pages(service, order, limit=2):
+    pages, cursor = [], None
+    while True:
+        page = json.loads(asyncio.run(service.list_meetings(1, ["id"], limit, cursor, order)))
+        pages.append([meeting["id"] for meeting in page["data"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_follow_start_time_then_id(meetings_table):
+    service = MeetingsService(MeetingVersions(FakeRedisManager()))
+    assert _pages(service, "asc") == [[2, 6], [3, 4], [1, 7]]
+    assert _pages(service, "desc") == [[7, 1], [4, 3], [6, 2]]
+    assert _pages(service, "asc", limit=3) == [[2, 6, 3], [4, 1, 7]]
+
+
+def test_only_the_requested_fields_are_returned(meetings_table):
+    service = MeetingsService(MeetingVersions(FakeRedisManager()))
+    body = json.loads(asyncio.run(service.list_meetings(
+        1, ["title", "rough_notes"], 10, start_from=100, start_to=300,
+    )))
+    assert body["data"] == [
+        {"title": "Meeting 2", "rough_notes": {"notes": "long"}},
+        {"title": "Meeting 6", "rough_notes": {"notes": "long"}},
+        {"title": "Meeting 3", "rough_notes": {"notes": "long"}},
+        {"title": "Meeting 4", "rough_notes": {"notes": "long"}},
+    ]
+    assert body["next_cursor"] is None
+    assert set(json.loads(asyncio.run(service.list_meetings(1, service.parse_fields(None), 1)))["data"][0]) == {
+        "id", "title", "start_time", "end_time", "timezone", "provider",
+        "event_url", "participants", "disable_bot", "bot_status",
+    }
+
+
+def test_unchanged_listing_is_answered_with_304(meetings_table):
+    app = create_app()
+    app.state.meetings_service = MeetingsService(MeetingVersions(FakeRedisManager()))
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=1, email="a@b.c", displayname="A")
+    client = TestClient(app)
+
+    first = client.get("/meetings", params={"limit": 2})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    # The first response seeded the counter, so the tag moves once
+    second = client.get("/meetings", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    etag = second.headers["etag"]
+
+    not_modified = client.get("/meetings", params={"limit": 2}, headers={"If-None-Match": f'"other", {etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    assert client.get("/meetings", params={"limit": 3}, headers={"If-None-Match": etag}).status_code == 200
+    asyncio.run(app.state.meetings_service.meeting_versions.bump([1]))
+    assert client.get("/meetings", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,57 @@
+import app as app_module
+from fastapi.testclient import TestClient
+from app import create_app
+from utils.metrics.metrics_utils import MetricsRegistry
+
+
+def test_counter_and_gauge_render_with_help_and_type():
+    registry = MetricsRegistry()
+    requests = registry.counter("http_requests_total", "Requests served.", ["route", "status"])
+    requests.inc(route="/meetings", status="200")
+    requests.inc(2, route="/meetings", status="200")
+    registry.gauge("queue_depth", "Items waiting.").set(4)
+
+    assert registry.render() == (
+        "# HELP http_requests_total Requests served.\n"
+        "# TYPE http_requests_total counter\n"
+        'http_requests_total{route="/meetings",status="200"} 3.0\n'
+        "# HELP queue_depth Items waiting.\n"
+        "# TYPE queue_depth gauge\n"
+        "queue_depth 4.0\n"
+    )
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    errors = registry.counter("errors_total", "Errors.", ["message"])
+    errors.inc(message='bad "quote" in C:\\path\nsecond line')
+
+    assert 'errors_total{message="bad \\"quote\\" in C:\\\\path\\nsecond line"} 1.0' in registry.render().splitlines()
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram("tick_seconds", "Tick latency.", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="fetch")
+
+    assert registry.render().splitlines() == [
+        "# HELP tick_seconds Tick latency.",
+        "# TYPE tick_seconds histogram",
+        'tick_seconds_bucket{stage="fetch",le="0.1"} 2',
+        'tick_seconds_bucket{stage="fetch",le="1.0"} 3',
+        'tick_seconds_bucket{stage="fetch",le="+Inf"} 4',
+        'tick_seconds_sum{stage="fetch"} 3.65',
+        'tick_seconds_count{stage="fetch"} 4',
+    ]
+
+
+def test_metrics_route_serves_the_text_format(monkeypatch):
+    registry = MetricsRegistry()
+    registry.counter("scrapes_total", "Scrapes.").inc()
+    monkeypatch.setattr(app_module, "REGISTRY", registry)
+
+    response = TestClient(create_app()).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text == registry.render()
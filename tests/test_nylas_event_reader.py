@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+from nylas import Client
+from nylas.models.calendars import Calendar
+from nylas.models.events import Event
+from src.calendar.calendar_snapshots import EventSnapshot
+from src.calendar.nylas_event_reader import NylasEventReader
+
+EVENT = {
+    "id": "event-1",
+    "grant_id": "grant-1",
+    "calendar_id": "primary-cal",
+    "busy": True,
+    "read_only": False,
+    "object": "event",
+    "ical_uid": "ical-1",
+    "title": "Sync",
+    "updated_at": 1,
+    "when": {"object": "timespan", "start_time": 2000000000, "end_time": 2000003600, "start_timezone": "UTC"},
+    "conferencing": {"provider": "Google Meet", "details": {"url": "https://meet.google.com/abc-defg-hij"}},
+    "organizer": {"email": "ada@example.com", "name": "Ada"},
+    "participants": [{"email": "bob@example.com", "status": "yes"}],
+}
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.calls = []
+
+    def _execute(self, method, path, headers=None, query_params=None, request_body=None, data=None, overrides=None):
+        self.calls.append((method, path, query_params))
+        if path.endswith("/calendars/primary"):
+            return {"data": {"id": "primary-cal"}}
+        return {"data": [EVENT]}
+
+
+def _public_sdk():
+    calendar = Calendar.from_dict({"id": "primary-cal", "grant_id": "grant-1", "name": "Work", "read_only": False, "is_owned_by_user": True, "object": "calendar"})
+    return SimpleNamespace(
+        http_client=FakeHttpClient(),
+        calendars=SimpleNamespace(find=lambda grant_id, calendar_id: SimpleNamespace(data=calendar)),
+        events=SimpleNamespace(list=lambda grant_id, query_params: SimpleNamespace(data=[Event.from_dict(EVENT)])),
+    )
+
+
+def test_known_sdk_uses_the_raw_client():
+    assert NylasEventReader(Client(api_key="test")).raw is True
+
+
+def test_raw_path_returns_payload_dicts():
+    nylas = _public_sdk()
+    reader = NylasEventReader(nylas, sdk_version="6.3.0")
+    assert reader.raw is True
+    assert reader.primary_calendar_id("grant-1") == "primary-cal"
+    assert reader.list_events("grant-1", {"start": "1", "end": "2"}) == [EVENT]
+    assert nylas.http_client.calls[-1] == ("GET", "/v3/grants/grant-1/events", {"start": "1", "end": "2"})
+
+
+def test_unknown_sdk_falls_back_to_public_calls():
+    nylas = _public_sdk()
+    reader = NylasEventReader(nylas, sdk_version="7.0.0")
+    assert reader.raw is False
+    assert reader.primary_calendar_id("grant-1") == "primary-cal"
+
+    events = reader.list_events("grant-1", {"start": "1", "end": "2"})
+    assert nylas.http_client.calls == []
+    public, raw = EventSnapshot.from_payload(events[0]), EventSnapshot.from_payload(EVENT)
+    assert [getattr(public, name) for name in EventSnapshot.__slots__ if name != "participants"] == [
+        getattr(raw, name) for name in EventSnapshot.__slots__ if name != "participants"
+    ]
+    assert repr(public.participants) == repr(raw.participants)
+
+
+def test_changed_execute_signature_falls_back():
+    nylas = _public_sdk()
+    nylas.http_client = SimpleNamespace(_execute=lambda request: None)
+    assert NylasEventReader(nylas, sdk_version="6.9.0").raw is False
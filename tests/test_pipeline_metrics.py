@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+from utils.metrics.pipeline_metrics import REDIS_POOL, watch_redis_pool
+
+
+def _fake_pool(in_use: int, available: int, max_connections: int):
+    return SimpleNamespace(
+        _in_use_connections=[object()] * in_use,
+        _available_connections=[object()] * available,
+        max_connections=max_connections,
+    )
+
+
+def test_watch_redis_pool_reports_until_unregistered():
+    unwatch = watch_redis_pool("test", _fake_pool(2, 3, 10))
+
+    samples = REDIS_POOL.samples()
+    assert 'redis_pool_connections{pool="test",state="in_use"} 2.0' in samples
+    assert 'redis_pool_connections{pool="test",state="max"} 10.0' in samples
+
+    unwatch()
+    assert not any('pool="test"' in sample for sample in REDIS_POOL.samples())
+
+
+def test_unregistering_twice_is_harmless():
+    unwatch = watch_redis_pool("twice", _fake_pool(0, 1, 1))
+    unwatch()
+    unwatch()
+    assert not any('pool="twice"' in sample for sample in REDIS_POOL.samples())
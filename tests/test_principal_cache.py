@@ -0,0 +1,90 @@
+import asyncio
+import time
+from pydantic import BaseModel
+from tests.fakes import FakeRedisManager
+from utils.auth.principal_cache import PrincipalCache
+
+
+class Principal(BaseModel):
+    id: int
+    email: str
+
+
+class FailingRedisManager:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ttl=None):
+        raise ConnectionError("redis down")
+
+    async def delete(self, key):
+        raise ConnectionError("redis down")
+
+
+def test_round_trip_through_redis_tier():
+    async def run():
+        cache_manager = FakeRedisManager()
+        writer = PrincipalCache(Principal, cache_manager)
+        reader = PrincipalCache(Principal, cache_manager)
+        await writer.set("a@example.com", Principal(id=1, email="a@example.com"), time.time() + 3600)
+        return await reader.get("a@example.com")
+
+    assert asyncio.run(run()) == Principal(id=1, email="a@example.com")
+
+
+def test_invalidate_drops_both_tiers():
+    async def run():
+        cache = PrincipalCache(Principal, FakeRedisManager())
+        await cache.set("a@example.com", Principal(id=1, email="a@example.com"))
+        await cache.invalidate("a@example.com")
+        return await cache.get("a@example.com")
+
+    assert asyncio.run(run()) is None
+
+
+def test_redis_errors_do_not_fail_the_request():
+    async def run():
+        cache = PrincipalCache(Principal, FailingRedisManager())
+        await cache.set("a@example.com", Principal(id=1, email="a@example.com"))
+        cached = await cache.get("a@example.com")
+        await cache.invalidate("a@example.com")
+        return cached, await cache.get("a@example.com")
+
+    cached, after_invalidate = asyncio.run(run())
+    assert cached == Principal(id=1, email="a@example.com")
+    assert after_invalidate is None
+
+
+def test_expired_token_is_not_cached():
+    async def run():
+        cache = PrincipalCache(Principal, FakeRedisManager())
+        await cache.set("a@example.com", Principal(id=1, email="a@example.com"), time.time() - 1)
+        return await cache.get("a@example.com")
+
+    assert asyncio.run(run()) is None
+
+
+class ClosingRedisManager(FakeRedisManager):
+    closed = 0
+
+    async def close(self):
+        ClosingRedisManager.closed += 1
+
+
+def test_close_only_closes_a_manager_it_created(monkeypatch):
+    from utils.redis import redis_utils
+
+    monkeypatch.setattr(redis_utils, "RedisManager", ClosingRedisManager)
+    ClosingRedisManager.closed = 0
+
+    async def run():
+        injected = PrincipalCache(Principal, ClosingRedisManager())
+        await injected.close()
+        owned = PrincipalCache(Principal)
+        await owned.close()  # nothing opened yet
+        await owned.get("a@example.com")
+        await owned.close()
+        assert owned._cache_manager is None
+
+    asyncio.run(run())
+    assert ClosingRedisManager.closed == 1
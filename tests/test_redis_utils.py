@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from utils.redis import redis_utils
+from utils.redis.redis_utils import LocalTTLCache, RedisManager
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(redis_utils.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = LocalTTLCache(10, 30)
+    cache.set("a", "1")
+    cache.set("b", "2", ttl_seconds=5)
+    clock[0] += 5
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    clock[0] += 25
+    assert cache.get("a") is None
+    assert len(cache._entries) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LocalTTLCache(2, 30)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_size_zero_disables_the_cache(clock):
+    cache = LocalTTLCache(0, 30)
+    cache.set("a", "1")
+    assert cache.get("a") is None
+
+
+def test_pool_is_configured_from_the_environment(monkeypatch):
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("REDIS_POOL_TIMEOUT_SECONDS", "3")
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT_SECONDS", "4")
+    monkeypatch.setenv("REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS", "1")
+    monkeypatch.setenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "10")
+    monkeypatch.setenv("REDIS_LOCAL_CACHE_SIZE", "16")
+    monkeypatch.setenv("REDIS_LOCAL_CACHE_TTL_SECONDS", "2")
+
+    manager = RedisManager("redis://cache.internal:6380/2")
+    assert manager.pool.max_connections == 7
+    assert manager.pool.timeout == 3.0
+    assert manager.pool.connection_kwargs["socket_timeout"] == 4.0
+    assert manager.pool.connection_kwargs["socket_connect_timeout"] == 1.0
+    assert manager.pool.connection_kwargs["health_check_interval"] == 10
+    assert manager.pool.connection_kwargs["host"] == "cache.internal"
+    assert manager.pool.connection_kwargs["db"] == 2
+    assert (manager.local_cache.max_size, manager.local_cache.ttl_seconds) == (16, 2.0)
+    asyncio.run(manager.close())
+
+
+class FakeRedisClient:
+    def __init__(self):
+        self.values = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self.values[key] = value
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def test_get_cached_is_served_locally_until_deleted():
+    manager = RedisManager()
+    manager.redis = FakeRedisClient()
+
+    async def run():
+        await manager.set_cached("flag", "on", 60)
+        assert await manager.get_cached("flag") == "on"
+        assert manager.redis.gets == 0
+        await manager.delete("flag")
+        assert await manager.get_cached("flag") is None
+        assert manager.redis.gets == 1
+        # Misses are not cached locally
+        manager.redis.values["flag"] = "off"
+        assert await manager.get_cached("flag") == "off"
+
+    asyncio.run(run())
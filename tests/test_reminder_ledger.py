@@ -0,0 +1,65 @@
+import asyncio
+import time
+import pytest
+from tests.fakes import FakeRedisManager
+from src.calendar.calendar_snapshots import MeetingSnapshot
+from src.slack_notifications.reminder_ledger import FAILED, PENDING, SENT, ReminderLedger
+
+
+def _meeting(start_time: int, end_time=None) -> MeetingSnapshot:
+    return MeetingSnapshot(
+        7, 42, "cal-uid", "https://meet.google.com/abc-defg-hij", "Standup",
+        start_time, end_time, "UTC", "Google Meet", False, "abc-defg-hij", None,
+    )
+
+
+@pytest.fixture
+def ledger():
+    return ReminderLedger(FakeRedisManager())
+
+
+def test_key_is_per_meeting_and_user():
+    assert ReminderLedger.key(_meeting(0)) == "meeting_reminder:7:42"
+
+
+def test_only_one_claim_wins(ledger):
+    meeting = _meeting(int(time.time()) + 300)
+
+    async def run():
+        return await asyncio.gather(ledger.claim(meeting), ledger.claim(meeting))
+
+    assert sorted(asyncio.run(run())) == [False, True]
+    assert ledger.cache_manager._values[ledger.key(meeting)][0] == PENDING
+
+
+def test_confirm_marks_sent_and_blocks_new_claims(ledger):
+    meeting = _meeting(int(time.time()) + 300)
+
+    async def run():
+        assert await ledger.claim(meeting)
+        await ledger.confirm(meeting)
+        return await ledger.claim(meeting)
+
+    assert asyncio.run(run()) is False
+    assert ledger.cache_manager._values[ledger.key(meeting)][0] == SENT
+
+
+def test_fail_keeps_the_claim(ledger):
+    meeting = _meeting(int(time.time()) + 300)
+
+    async def run():
+        assert await ledger.claim(meeting)
+        await ledger.fail(meeting)
+        return await ledger.claim(meeting)
+
+    assert asyncio.run(run()) is False
+    assert ledger.cache_manager._values[ledger.key(meeting)][0] == FAILED
+
+
+def test_sent_ttl_lasts_until_meeting_end_plus_grace(ledger):
+    now = 1_000_000
+    assert ledger._sent_ttl(_meeting(now + 300, now + 1800), now) == 1800 + ledger.grace_seconds
+    # No end time: assume the default duration
+    assert ledger._sent_ttl(_meeting(now + 300), now) == 300 + ledger.default_duration_seconds + ledger.grace_seconds
+    # Already over: only the grace period is left
+    assert ledger._sent_ttl(_meeting(now - 7200, now - 3600), now) == ledger.grace_seconds
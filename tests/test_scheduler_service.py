@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from app import create_app
+from src.cron_scheduler import scheduler_service as scheduler_module
+from src.cron_scheduler.cron_runs import FAILED, QUEUED, RUNNING, SUCCEEDED, CronRun
+from src.cron_scheduler.scheduler_service import SchedulerService
+
+
+class FakeCalendarService:
+    def __init__(self, result: bool):
+        self.result = result
+
+    async def process_fetch_calendar_events(self, session) -> bool:
+        return self.result
+
+
+@pytest.fixture
+def no_database(monkeypatch):
+    async def get_async_session():
+        yield None
+
+    monkeypatch.setattr(scheduler_module, "get_async_session", get_async_session)
+
+
+@pytest.mark.parametrize("result", [True, False])
+def test_tick_result_is_returned(no_database, result):
+    service = SchedulerService()
+    service.calendar_service = FakeCalendarService(result)
+    assert asyncio.run(service.handle_calendar_events_cron()) is result
+
+
+def test_failed_tick_is_recorded_as_failed(no_database):
+    service = SchedulerService()
+    service.calendar_service = FakeCalendarService(False)
+
+    async def run():
+        service.loop = asyncio.get_running_loop()
+        cron_run = service.request_run("manual")
+        await service._running_tick
+        return cron_run
+
+    assert asyncio.run(run()).status == FAILED
+
+
+def test_triggers_during_a_run_share_one_queued_follow_up():
+    service = SchedulerService()
+    release = asyncio.Event()
+    ticks = []
+
+    async def handle_calendar_events_cron():
+        ticks.append(len(ticks))
+        await release.wait()
+        return True
+
+    service.handle_calendar_events_cron = handle_calendar_events_cron
+
+    async def run():
+        service.loop = asyncio.get_running_loop()
+        current = service.request_run("scheduler")
+        await asyncio.sleep(0)
+        assert current.status == RUNNING
+
+        queued = service.request_run("manual")
+        assert queued is not current and queued.status == QUEUED
+        assert service.request_run("manual") is queued
+        assert service.request_run("scheduler") is queued
+        assert queued.triggers == {"manual": 2, "scheduler": 1}
+
+        release.set()
+        # The follow-up starts as the current run finishes
+        while service._running_tick is not None:
+            await service._running_tick
+        assert current.status == queued.status == SUCCEEDED
+        return [cron_run.id for cron_run in service.runs.recent()]
+
+    run_ids = asyncio.run(run())
+    assert len(run_ids) == 2
+    assert ticks == [0, 1]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv("CALENDAR_CRON_IN_API", raising=False)
+    app = create_app()
+    service = SchedulerService()
+    app.state.scheduler_service = service
+    return TestClient(app), service
+
+
+def test_runs_are_listed_newest_first(client):
+    client, service = client
+    first, second = CronRun("scheduler"), CronRun("manual")
+    service.runs.add(first)
+    service.runs.add(second)
+
+    runs = client.get("/cron/runs").json()["runs"]
+    assert [run["id"] for run in runs] == [second.id, first.id]
+    assert client.get(f"/cron/runs/{first.id}").json()["triggers"] == {"scheduler": 1}
+    assert client.get("/cron/runs/unknown").status_code == 404
+
+
+def test_manual_trigger_queues_a_run(client):
+    client, service = client
+    cron_run = CronRun("manual")
+    service.request_run = lambda source: cron_run
+
+    response = client.get("/cron/handle-calendar-events")
+    assert response.status_code == 202
+    assert response.json()["run_id"] == cron_run.id
+    assert response.json()["status_url"].endswith(f"/cron/runs/{cron_run.id}")
+
+
+def test_manual_trigger_is_refused_when_the_worker_owns_the_ticks(client, monkeypatch):
+    client, _ = client
+    monkeypatch.setenv("CALENDAR_CRON_IN_API", "false")
+    client.app.state.scheduler_service = SchedulerService()
+    assert client.get("/cron/handle-calendar-events").status_code == 503
@@ -0,0 +1,109 @@
+import asyncio
+import gc
+import pytest
+from fastapi import HTTPException
+from src.calendar.calendar_snapshots import MeetingSnapshot, ParticipantSnapshot, UserSnapshot
+from src.slack_notifications.slack_notification_service import SlackNotificationService
+
+
+class FlakySlackNotificationService(SlackNotificationService):
+    """Fails the first lookup of every email, then answers."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def fetch_slack_participant_info(self, email: str):
+        self.calls.append(email)
+        if self.calls.count(email) == 1:
+            raise HTTPException(status_code=500, detail="ratelimited")
+        return email.split("@")[0].title()
+
+
+def test_failed_lookup_is_not_reused():
+    async def run():
+        service = FlakySlackNotificationService()
+        resolved = {}
+        with pytest.raises(HTTPException):
+            await service.resolve_first_names(["ann@example.com"], resolved)
+        await asyncio.sleep(0)
+        assert "ann@example.com" not in resolved
+
+        names = await service.resolve_first_names(["ann@example.com"], resolved)
+        return service, resolved, names
+
+    service, resolved, names = asyncio.run(run())
+    assert names == {"ann@example.com": "Ann"}
+    assert service.calls == ["ann@example.com", "ann@example.com"]
+    assert "ann@example.com" in resolved
+
+
+def test_successful_lookup_is_shared():
+    async def run():
+        service = FlakySlackNotificationService()
+        service.calls.append("bob@example.com")  # skip the failing first call
+        resolved = {}
+        first = await service.resolve_first_names(["bob@example.com"], resolved)
+        second = await service.resolve_first_names(["bob@example.com"], resolved)
+        return service, first, second
+
+    service, first, second = asyncio.run(run())
+    assert first == second == {"bob@example.com": "Bob"}
+    assert service.calls == ["bob@example.com", "bob@example.com"]
+
+
+class NoTimezoneReminderService(SlackNotificationService):
+    """Resolves names locally; the recipient's Slack id lookup is injected."""
+
+    def __init__(self, lookup):
+        super().__init__()
+        self.lookup = lookup
+
+    async def fetch_slack_participant_info(self, email: str):
+        return email.split("@")[0].title()
+
+    async def fetch_slack_user_id_by_email(self, email: str):
+        return await self.lookup()
+
+
+def _send_reminder_without_timezone(service):
+    meeting = MeetingSnapshot(1, 1, "uid", "https://zoom.us/j/1", "Sync", 0, 60, None, "zoom", False, "1", 0)
+    user = UserSnapshot(1, "ann@example.com", "grant-1", None, None)
+    participants = [ParticipantSnapshot("bob@example.com")]
+    organizer = {"email": "bob@example.com"}
+    return service.send_meeting_reminder_to_user(meeting, user, participants, organizer)
+
+
+def test_pending_slack_id_lookup_is_cancelled_when_a_later_step_fails():
+    cancelled = []
+
+    async def lookup():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        with pytest.raises(HTTPException):
+            await _send_reminder_without_timezone(NoTimezoneReminderService(lookup))
+        assert cancelled == [True]
+
+    asyncio.run(run())
+
+
+def test_failed_slack_id_lookup_is_retrieved_when_a_later_step_fails():
+    unhandled = []
+
+    async def lookup():
+        raise HTTPException(status_code=500, detail="users_not_found")
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        with pytest.raises(HTTPException):
+            await _send_reminder_without_timezone(NoTimezoneReminderService(lookup))
+        gc.collect()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert unhandled == []
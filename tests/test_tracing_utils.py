@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+from app import create_app
+from utils.tracing.tracing_utils import Tracer, parse_traceparent
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+        (f" 00-{TRACE_ID}-{PARENT_ID}-03 ", (TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID}-{PARENT_ID}-zz", None),
+        (f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01", None),
+        (f"00-{TRACE_ID}-{PARENT_ID}", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+
+def _tracer(monkeypatch, sample_ratio: str, trust_parent: bool = False) -> Tracer:
+    monkeypatch.setenv("TRACING_ENABLED", "true")
+    monkeypatch.setenv("TRACE_SAMPLE_RATIO", sample_ratio)
+    for name in ("TRACE_FILE_PATH", "OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "OTEL_EXPORTER_OTLP_ENDPOINT"):
+        monkeypatch.delenv(name, raising=False)
+    if trust_parent:
+        monkeypatch.setenv("TRACE_TRUST_PARENT_SAMPLING", "true")
+    else:
+        monkeypatch.delenv("TRACE_TRUST_PARENT_SAMPLING", raising=False)
+    tracer = Tracer()
+    tracer.configure()
+    return tracer
+
+
+def test_new_tracer_is_inert_until_configured(monkeypatch):
+    monkeypatch.setenv("TRACING_ENABLED", "true")
+    tracer = Tracer()
+    assert tracer.enabled is False
+    with tracer.start_trace("tick") as root:
+        assert root is None
+
+
+def test_untrusted_sampled_parent_does_not_override_local_ratio(monkeypatch):
+    tracer = _tracer(monkeypatch, "0")
+    with tracer.start_trace("GET /meetings", parent=(TRACE_ID, PARENT_ID, True)) as root:
+        assert root is None
+
+
+def test_locally_sampled_request_continues_the_callers_trace(monkeypatch):
+    tracer = _tracer(monkeypatch, "1")
+    with tracer.start_trace("GET /meetings", parent=(TRACE_ID, PARENT_ID, False)) as root:
+        with tracer.span("meetings_list") as child:
+            pass
+    assert (root.trace_id, root.parent_span_id) == (TRACE_ID, PARENT_ID)
+    assert child.parent_span_id == root.span_id
+    assert {span["name"] for span in tracer.memory.get_trace(TRACE_ID)} == {"meetings_list", "GET /meetings"}
+
+
+def test_trusted_parent_decides_sampling(monkeypatch):
+    tracer = _tracer(monkeypatch, "0", trust_parent=True)
+    with tracer.start_trace("GET /meetings", parent=(TRACE_ID, PARENT_ID, True)) as root:
+        assert root is not None
+    with tracer.start_trace("GET /meetings", parent=(TRACE_ID, PARENT_ID, False)) as root:
+        assert root is None
+
+
+def test_trace_routes_require_a_user():
+    client = TestClient(create_app())
+    assert client.get("/debug/traces").status_code == 401
+    assert client.get(f"/debug/traces/{TRACE_ID}").status_code == 401
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from utils.logging.logging_utils import get_logger
+from utils.metrics.metrics_utils import REGISTRY
+
+PRINCIPAL_CACHE_LOOKUPS = REGISTRY.counter(
+    "principal_cache_lookups_total",
+    "Authenticated user lookups by the tier that answered them.",
+    ["result"],
+)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class PrincipalCache(Generic[ModelT]):
+    """Two-tier cache of authenticated users keyed by token subject.
+
+    The first tier is an in-process LRU, the second is Redis so workers
+    share lookups. An entry never outlives the token it was resolved for:
+    its TTL is capped at the token's ``exp``. The local tier also keeps
+    entries for at most ``PRINCIPAL_CACHE_LOCAL_TTL_SECONDS``, which bounds
+    how long another worker can serve a user after ``invalidate()``.
+
+    Configured from the environment:
+
+    - ``PRINCIPAL_CACHE_TTL_SECONDS``: Redis TTL, 300 by default.
+    - ``PRINCIPAL_CACHE_LOCAL_TTL_SECONDS``: local TTL, 30 by default.
+    - ``PRINCIPAL_CACHE_SIZE``: local LRU capacity, 10000 by default.
+    """
+
+    key_prefix = "principal:"
+
+    def __init__(self, model: Type[ModelT], cache_manager=None):
+        self.logger = get_logger("PrincipalCache")
+        self.model = model
+        self.ttl_seconds = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+        self.local_ttl_seconds = float(os.getenv("PRINCIPAL_CACHE_LOCAL_TTL_SECONDS", "30"))
+        self.max_size = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+        self._cache_manager = cache_manager
+        # Only a RedisManager created here is closed by close()
+        self._owns_cache_manager = cache_manager is None
+        # subject -> (expires_at, principal), least recently used first
+        self._local: "OrderedDict[str, Tuple[float, ModelT]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache_manager(self):
+        # Created on first use so importing deps does not open a Redis pool
+        if self._cache_manager is None:
+            from utils.redis.redis_utils import RedisManager
+
+            self._cache_manager = RedisManager()
+        return self._cache_manager
+
+    def _remaining_ttl(self, token_exp: Optional[float], now: float) -> float:
+        if token_exp is None:
+            return self.ttl_seconds
+        return min(self.ttl_seconds, token_exp - now)
+
+    def _get_local(self, subject: str, now: float) -> Optional[ModelT]:
+        with self._lock:
+            entry = self._local.get(subject)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._local[subject]
+                return None
+            self._local.move_to_end(subject)
+            return entry[1]
+
+    def _set_local(self, subject: str, principal: ModelT, expires_at: float):
+        with self._lock:
+            self._local[subject] = (expires_at, principal)
+            self._local.move_to_end(subject)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    async def get(self, subject: str, token_exp: Optional[float] = None) -> Optional[ModelT]:
+        now = time.time()
+        principal = self._get_local(subject, now)
+        if principal is not None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(result="local")
+            return principal
+
+        try:
+            data = await self.cache_manager.get(f"{self.key_prefix}{subject}")
+        except Exception as e:
+            # Redis trouble degrades to a database lookup, not a failed request
+            self.logger.warning("Principal cache read failed", error=str(e))
+            data = None
+        if data is None:
+            PRINCIPAL_CACHE_LOOKUPS.inc(result="miss")
+            return None
+
+        principal = self.model.model_validate_json(data)
+        ttl = self._remaining_ttl(token_exp, now)
+        if ttl > 0:
+            self._set_local(subject, principal, now + min(ttl, self.local_ttl_seconds))
+        PRINCIPAL_CACHE_LOOKUPS.inc(result="redis")
+        return principal
+
+    async def set(self, subject: str, principal: ModelT, token_exp: Optional[float] = None):
+        now = time.time()
+        ttl = self._remaining_ttl(token_exp, now)
+        if ttl <= 0:
+            return
+        self._set_local(subject, principal, now + min(ttl, self.local_ttl_seconds))
+        try:
+            # Redis expiries are whole seconds; round down so exp is never exceeded
+            if ttl >= 1:
+                await self.cache_manager.set(f"{self.key_prefix}{subject}", principal.model_dump_json(), int(ttl))
+        except Exception as e:
+            self.logger.warning("Principal cache write failed", error=str(e))
+
+    async def close(self):
+        """Close the Redis pool opened on first use; the app calls this at shutdown."""
+        if self._owns_cache_manager and self._cache_manager is not None:
+            cache_manager, self._cache_manager = self._cache_manager, None
+            await cache_manager.close()
+
+    async def invalidate(self, subject: str):
+        """Drop a user after it changed; call with the token subject (email)."""
+        with self._lock:
+            self._local.pop(subject, None)
+        try:
+            await self.cache_manager.delete(f"{self.key_prefix}{subject}")
+        except Exception as e:
+            # The Redis entry still expires within PRINCIPAL_CACHE_TTL_SECONDS
+            self.logger.warning("Principal cache invalidation failed", error=str(e))
@@ -0,0 +1,190 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+# Keyword arguments understood by logging.Logger itself; everything else
+# passed to a StructuredLogger call becomes a structured field.
+_LOGGER_KWARGS = {"exc_info", "stack_info", "stacklevel", "extra"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_started = False
+_listener_lock = threading.Lock()
+_debug_sample_rate = 1.0
+
+
+def _format_value(value) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if not text or any(char in text for char in ' ="'):
+        return json.dumps(text)
+    return text
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Formats a record as ``ts=... level=... logger=... msg="..." key=value``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        parts = [
+            f"ts={datetime.fromtimestamp(record.created, timezone.utc).isoformat()}",
+            f"level={record.levelname}",
+            f"logger={record.name}",
+            f"msg={_format_value(record.getMessage())}",
+        ]
+        for key, value in (getattr(record, "fields", None) or {}).items():
+            parts.append(f"{key}={_format_value(value)}")
+        line = " ".join(parts)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    Only the message arguments and the traceback are rendered on the calling
+    thread, since they may reference objects that change afterwards.
+    """
+
+    def enqueue(self, record: logging.LogRecord):
+        if not _listener_started:
+            _start_listener()
+        super().enqueue(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger adapter that turns keyword arguments into structured fields.
+
+    ``logger.info("Bot created", user_id=1, bot_id="abc")`` is rendered as
+    ``msg="Bot created" user_id=1 bot_id=abc``. Records are only built when
+    the level is enabled for the logger.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _LOGGER_KWARGS}
+        if fields:
+            extra = dict(kwargs.get("extra") or {})
+            extra["fields"] = fields
+            kwargs["extra"] = extra
+        return msg, kwargs
+
+    def debug_sampled(self, msg, *args, rate: Optional[float] = None, **kwargs):
+        """Log a high-volume debug line for only a fraction of calls.
+
+        The fraction defaults to ``LOG_DEBUG_SAMPLE_RATE``.
+        """
+        if not self.isEnabledFor(logging.DEBUG):
+            return
+        rate = _debug_sample_rate if rate is None else rate
+        if rate < 1.0 and random.random() >= rate:
+            return
+        self.debug(msg, *args, sample_rate=rate, **kwargs)
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener():
+    global _listener_started
+    with _listener_lock:
+        if _listener is not None and not _listener_started:
+            _listener.start()
+            _listener_started = True
+            atexit.register(shutdown_logging)
+
+
+def configure_logging():
+    """Route all logging through a queue drained by a background thread.
+
+    Call sites only pay for putting the record on the queue; formatting and
+    the write to stdout happen on the listener thread, which is started by
+    the first record, so importing a module that creates loggers starts no
+    thread. Configured from the environment:
+
+    - ``LOG_LEVEL``: root level, INFO by default.
+    - ``LOG_LEVELS``: per-logger overrides, e.g.
+      ``CalendarCronService=DEBUG,sqlalchemy.engine=INFO``.
+    - ``LOG_FORMAT``: ``kv`` (default) or ``json``.
+    - ``LOG_DEBUG_SAMPLE_RATE``: fraction of ``debug_sampled`` lines kept.
+    """
+    global _listener, _debug_sample_rate
+    if _listener is not None:
+        return
+
+    _debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "kv") == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(KeyValueFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener, _listener_started
+    with _listener_lock:
+        if _listener is None:
+            return
+        if _listener_started:
+            _listener.stop()
+        _listener = None
+        _listener_started = False
+
+
+def get_logger(name: str) -> StructuredLogger:
+    configure_logging()
+    return StructuredLogger(logging.getLogger(name))
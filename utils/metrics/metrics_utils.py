@@ -0,0 +1,214 @@
+import bisect
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(labelnames, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def items(self) -> List[Tuple[Dict[str, str], float]]:
+        return [(dict(zip(self.labelnames, key)), value) for key, value in list(self._values.items())]
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in list(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """A gauge that is either set directly or computed by a callback on scrape."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        *args,
+        callback: Optional[Callable[[], Iterable[Tuple[Dict[str, str], float]]]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._callbacks = [callback] if callback else []
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def add_callback(self, callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]]) -> Callable[[], None]:
+        """Report ``callback``'s samples on every scrape; returns its unregister function."""
+        self._callbacks.append(callback)
+        return lambda: self.remove_callback(callback)
+
+    def remove_callback(self, callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def samples(self) -> List[str]:
+        values = dict(self._values)
+        for callback in self._callbacks:
+            try:
+                for labels, value in callback():
+                    values[self._key(labels)] = value
+            except Exception:
+                # A failing collector must not break the whole scrape
+                continue
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def snapshot(self, **labels) -> Tuple[List[int], float, int]:
+        counts, total, count = self._values.get(
+            self._key(labels), [[0] * (len(self.buckets) + 1), 0.0, 0]
+        )
+        return list(counts), total, count
+
+    def items(self) -> List[Tuple[Dict[str, str], List[int], float, int]]:
+        return [
+            (dict(zip(self.labelnames, key)), list(counts), total, count)
+            for key, (counts, total, count) in list(self._values.items())
+        ]
+
+    def add(self, counts: Sequence[int], total: float, count: int, **labels):
+        """Add observations recorded elsewhere, e.g. in another process."""
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0] = [current + added for current, added in zip(state[0], counts)]
+        state[1] += total
+        state[2] += count
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in list(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_number(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metric registry rendered in the Prometheus text format.
+
+    Recording a sample is a dictionary update; nothing is formatted until
+    :meth:`render` is called by a scrape.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served on /metrics
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,145 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+from utils.metrics.metrics_utils import REGISTRY
+from utils.profiling.flight_recorder import span
+from utils.tracing.tracing_utils import SPAN_KIND_CLIENT, SPAN_KIND_INTERNAL, TRACER
+
+TICK_DURATION = REGISTRY.histogram(
+    "calendar_tick_duration_seconds",
+    "Wall time of one calendar cron tick.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 8.0, 10.0, 15.0, 30.0, 60.0),
+)
+STAGE_DURATION = REGISTRY.histogram(
+    "calendar_stage_duration_seconds",
+    "Wall time of one calendar pipeline stage call.",
+    ["stage"],
+)
+EVENTS_SEEN = REGISTRY.counter(
+    "calendar_events_seen_total",
+    "Calendar events returned by Nylas.",
+)
+BOTS_CREATED = REGISTRY.counter(
+    "calendar_bots_created_total",
+    "Recall bots scheduled for calendar events.",
+)
+REMINDERS_SENT = REGISTRY.counter(
+    "calendar_reminders_sent_total",
+    "Slack meeting reminders delivered.",
+)
+PROVIDER_ERRORS = REGISTRY.counter(
+    "calendar_provider_errors_total",
+    "Failed calls per external provider.",
+    ["provider"],
+)
+DB_POOL = REGISTRY.gauge(
+    "db_pool_connections",
+    "SQLAlchemy connection pool usage.",
+    ["state"],
+)
+REDIS_POOL = REGISTRY.gauge(
+    "redis_pool_connections",
+    "Redis connection pool usage.",
+    ["pool", "state"],
+)
+
+# Per-run stage totals, set by collect_stage_timings for the current task
+_stage_timings: ContextVar[Optional[Dict[str, dict]]] = ContextVar("_stage_timings", default=None)
+
+
+@contextmanager
+def collect_stage_timings(timings: Dict[str, dict]):
+    """Aggregate every ``stage()`` run in this context into ``timings``.
+
+    Tasks started inside the block inherit it, so concurrent work is
+    counted too. ``timings`` is updated live and maps a stage name to its
+    ``count``, ``errors``, ``total_seconds`` and ``max_seconds``; nested
+    stages are each counted in full.
+    """
+    token = _stage_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
+
+
+def _record_stage_timing(name: str, elapsed: float, failed: bool):
+    timings = _stage_timings.get()
+    if timings is None:
+        return
+    entry = timings.get(name)
+    if entry is None:
+        entry = timings[name] = {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+    entry["count"] += 1
+    entry["errors"] += int(failed)
+    entry["total_seconds"] += elapsed
+    entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+
+
+def merge_stage_timings(timings: Dict[str, dict], other: Dict[str, dict]):
+    """Add the totals of ``other``, e.g. from another process, into ``timings``."""
+    for name, other_entry in other.items():
+        entry = timings.get(name)
+        if entry is None:
+            entry = timings[name] = {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        entry["count"] += other_entry["count"]
+        entry["errors"] += other_entry["errors"]
+        entry["total_seconds"] += other_entry["total_seconds"]
+        entry["max_seconds"] = max(entry["max_seconds"], other_entry["max_seconds"])
+
+
+@contextmanager
+def stage(name: str, provider: Optional[str] = None, **attributes):
+    """Time a pipeline stage and count a provider error if it raises.
+
+    The stage is also recorded as a flight recorder span, tagged with
+    ``attributes``, when the current tick is being captured, as a tracing
+    span inside a sampled trace, and added to the run's totals inside
+    ``collect_stage_timings``.
+    """
+    started = time.perf_counter()
+    failed = False
+    try:
+        with span(name, **attributes), TRACER.span(name, SPAN_KIND_CLIENT if provider else SPAN_KIND_INTERNAL, **attributes) as trace_span:
+            if trace_span is not None and provider:
+                trace_span.set_attribute("provider", provider)
+            yield
+    except Exception:
+        failed = True
+        if provider:
+            PROVIDER_ERRORS.inc(provider=provider)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage=name)
+        _record_stage_timing(name, elapsed, failed)
+
+
+def watch_db_pool(engine) -> Callable[[], None]:
+    """Report the engine's pool usage on every scrape until the returned
+    function is called; call it before disposing of the engine."""
+
+    def collect():
+        pool = engine.pool
+        return [
+            ({"state": "size"}, pool.size()),
+            ({"state": "checked_out"}, pool.checkedout()),
+            ({"state": "overflow"}, pool.overflow()),
+        ]
+
+    return DB_POOL.add_callback(collect)
+
+
+def watch_redis_pool(name: str, connection_pool) -> Callable[[], None]:
+    """Report a redis-py connection pool's usage on every scrape until the
+    returned function is called."""
+
+    def collect():
+        return [
+            ({"pool": name, "state": "in_use"}, len(connection_pool._in_use_connections)),
+            ({"pool": name, "state": "available"}, len(connection_pool._available_connections)),
+            ({"pool": name, "state": "max"}, connection_pool.max_connections),
+        ]
+
+    return REDIS_POOL.add_callback(collect)
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from utils.logging.logging_utils import get_logger
+from utils.metrics.metrics_utils import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop probe was due and when it ran.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_LAG_PERCENTILES = REGISTRY.gauge(
+    "event_loop_lag_percentile_seconds",
+    "Event loop lag percentiles over the monitor window.",
+    ["quantile"],
+)
+LOOP_BLOCKS = REGISTRY.counter(
+    "event_loop_blocked_total",
+    "Times a single callback held the event loop past the block threshold.",
+)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class EventLoopMonitor:
+    """Measures event loop lag and captures the stack of blocking callbacks.
+
+    A probe task sleeps for ``LOOP_MONITOR_INTERVAL_SECONDS`` and records by
+    how much it overslept. A watchdog thread checks the probe's heartbeat;
+    once the loop has not come back for ``LOOP_BLOCK_THRESHOLD_SECONDS`` it
+    grabs the loop thread's current stack, which is the blocking call.
+    The loop counts as degraded while the p95 lag over the last
+    ``LOOP_LAG_WINDOW`` samples is above ``LOOP_LAG_DEGRADED_SECONDS``.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("EventLoopMonitor")
+        self.interval = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.1"))
+        self.block_threshold = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", "0.25"))
+        self.degraded_threshold = float(os.getenv("LOOP_LAG_DEGRADED_SECONDS", "0.2"))
+        self.samples: deque = deque(maxlen=int(os.getenv("LOOP_LAG_WINDOW", "600")))
+        self.blocking_stacks: deque = deque(maxlen=20)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._unregister_percentiles: Optional[Callable[[], None]] = None
+
+    def start(self):
+        """Start monitoring the running loop; must be called from inside it."""
+        if self._probe_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._probe_task = self._loop.create_task(self._probe())
+        self._unregister_percentiles = LOOP_LAG_PERCENTILES.add_callback(self._collect_percentiles)
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._unregister_percentiles is not None:
+            self._unregister_percentiles()
+            self._unregister_percentiles = None
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+            self._probe_task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _probe(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            self._heartbeat = now
+            self.samples.append(lag)
+            LOOP_LAG.observe(lag)
+
+    def _watch(self):
+        reported_heartbeat = None
+        while not self._stopping.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # Report each stall once, with the stack the loop is stuck in
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            LOOP_BLOCKS.inc()
+            self.blocking_stacks.append(
+                {
+                    "detected_at": datetime.now(timezone.utc).isoformat(),
+                    "stalled_seconds": round(stalled_for, 3),
+                    "stack": stack,
+                }
+            )
+            self.logger.warning(
+                "Event loop blocked",
+                stalled_seconds=round(stalled_for, 3),
+                stack=stack,
+            )
+
+    def percentiles(self) -> Dict[str, float]:
+        values = sorted(self.samples)
+        return {
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "p99": _percentile(values, 0.99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    def _collect_percentiles(self):
+        percentiles = self.percentiles()
+        return [
+            ({"quantile": "0.5"}, percentiles["p50"]),
+            ({"quantile": "0.95"}, percentiles["p95"]),
+            ({"quantile": "0.99"}, percentiles["p99"]),
+        ]
+
+    def is_degraded(self) -> bool:
+        # Require a reasonably full window so one startup hiccup is not "sustained"
+        if len(self.samples) < max(10, self.samples.maxlen // 10):
+            return False
+        return self.percentiles()["p95"] > self.degraded_threshold
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._probe_task is not None,
+            "degraded": self.is_degraded(),
+            "lag_seconds": self.percentiles(),
+            "samples": len(self.samples),
+            "blocking_stacks": list(self.blocking_stacks),
+        }
@@ -0,0 +1,171 @@
+import cProfile
+import heapq
+import itertools
+import marshal
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+_active_capture: ContextVar[Optional["TickCapture"]] = ContextVar("flight_recorder_capture", default=None)
+_span_path: ContextVar[Tuple[str, ...]] = ContextVar("flight_recorder_span_path", default=())
+
+
+class TickCapture:
+    """Timed spans (and optionally a cProfile run) recorded for one tick."""
+
+    MAX_SPANS = 50000
+
+    def __init__(self, capture_id: str, name: str):
+        self.id = capture_id
+        self.name = name
+        self.started_at = datetime.now(timezone.utc)
+        self.duration: float = 0.0
+        # (path, duration seconds, attributes)
+        self.spans: List[Tuple[Tuple[str, ...], float, Dict[str, Any]]] = []
+        self.dropped_spans = 0
+        self.profile_stats: Optional[bytes] = None
+
+    def add_span(self, path: Tuple[str, ...], duration: float, attributes: Dict[str, Any]):
+        if len(self.spans) >= self.MAX_SPANS:
+            self.dropped_spans += 1
+            return
+        self.spans.append((path, duration, attributes))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration, 6),
+            "spans": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "has_profile": self.profile_stats is not None,
+        }
+
+    def collapsed_stacks(self) -> str:
+        """Render spans as flamegraph.pl / speedscope collapsed stacks.
+
+        Each line is ``frame;frame;frame <self time in microseconds>``, where
+        self time excludes the time spent in child spans.
+        """
+        total: Dict[Tuple[str, ...], float] = {}
+        children: Dict[Tuple[str, ...], float] = {}
+        for path, duration, _ in self.spans:
+            total[path] = total.get(path, 0.0) + duration
+            if len(path) > 1:
+                children[path[:-1]] = children.get(path[:-1], 0.0) + duration
+        root = (self.name,)
+        lines = []
+        for path, duration in total.items():
+            self_time = max(duration - children.get(path, 0.0), 0.0)
+            lines.append(f"{';'.join(root + path)} {int(self_time * 1_000_000)}")
+        untracked = max(self.duration - sum(d for p, d in total.items() if len(p) == 1), 0.0)
+        lines.append(f"{self.name} {int(untracked * 1_000_000)}")
+        return "\n".join(lines) + "\n"
+
+
+def _frame_label(name: str, attributes: Dict[str, Any]) -> str:
+    if not attributes:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in attributes.items())}]"
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record a timed span into the tick currently being captured, if any."""
+    capture = _active_capture.get()
+    if capture is None:
+        yield
+        return
+    path = _span_path.get() + (_frame_label(name, attributes),)
+    token = _span_path.set(path)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        capture.add_span(path, time.perf_counter() - started, attributes)
+        _span_path.reset(token)
+
+
+class FlightRecorder:
+    """Opt-in recorder that keeps the captures of the slowest ticks.
+
+    Enabled with ``CRON_FLIGHT_RECORDER=true``. Every tick is captured, but
+    only ticks slower than ``CRON_FLIGHT_RECORDER_THRESHOLD_SECONDS`` (the
+    tick budget by default) are considered, and of those the
+    ``CRON_FLIGHT_RECORDER_CAPACITY`` slowest are kept in a min-heap keyed
+    on duration, so a burst of mildly slow ticks cannot push out the worst
+    one. With
+    ``CRON_FLIGHT_RECORDER_PROFILE=true`` the tick also runs under cProfile.
+    cProfile sees everything on the event loop thread while the tick is
+    running, including concurrent request handlers.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("CRON_FLIGHT_RECORDER") == "true"
+        self.profile = os.getenv("CRON_FLIGHT_RECORDER_PROFILE") == "true"
+        self.threshold_seconds = float(
+            os.getenv(
+                "CRON_FLIGHT_RECORDER_THRESHOLD_SECONDS",
+                os.getenv("CALENDAR_TICK_BUDGET_SECONDS", "8"),
+            )
+        )
+        self.capacity = int(os.getenv("CRON_FLIGHT_RECORDER_CAPACITY", "10"))
+        # (duration, sequence, capture); the fastest kept capture is at [0]
+        self._captures: List[Tuple[float, int, TickCapture]] = []
+        self._ids = itertools.count(1)
+
+    @property
+    def captures(self) -> List[TickCapture]:
+        return [capture for _, _, capture in self._captures]
+
+    def _keep(self, capture: TickCapture, sequence: int):
+        entry = (capture.duration, sequence, capture)
+        if len(self._captures) < self.capacity:
+            heapq.heappush(self._captures, entry)
+        elif self._captures and entry > self._captures[0]:
+            heapq.heapreplace(self._captures, entry)
+
+    @contextmanager
+    def record_tick(self, name: str = "calendar_tick"):
+        if not self.enabled or _active_capture.get() is not None:
+            yield
+            return
+
+        sequence = next(self._ids)
+        capture = TickCapture(f"{int(time.time())}-{sequence}", name)
+        token = _active_capture.set(capture)
+        profiler = None
+        if self.profile:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this thread
+                profiler = None
+        started = time.perf_counter()
+        try:
+            yield capture
+        finally:
+            capture.duration = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            _active_capture.reset(token)
+            if capture.duration >= self.threshold_seconds:
+                if profiler is not None:
+                    profiler.create_stats()
+                    capture.profile_stats = marshal.dumps(profiler.stats)
+                self._keep(capture, sequence)
+
+    def list_captures(self) -> List[Dict[str, Any]]:
+        return sorted(
+            (capture.summary() for capture in self.captures),
+            key=lambda summary: summary["duration_seconds"],
+            reverse=True,
+        )
+
+    def get_capture(self, capture_id: str) -> Optional[TickCapture]:
+        return next((capture for capture in self.captures if capture.id == capture_id), None)
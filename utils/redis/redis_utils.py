@@ -1,22 +1,155 @@
+import os
+import time
 import redis.asyncio as redis
 import json
+from collections import OrderedDict
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+from utils.metrics.metrics_utils import REGISTRY
+from utils.metrics.pipeline_metrics import stage
+
+load_dotenv()
+
+LOCAL_CACHE_LOOKUPS = REGISTRY.counter(
+    "redis_local_cache_lookups_total",
+    "get_cached() lookups by whether the in-process layer answered them.",
+    ["result"],
+)
+
+
+class LocalTTLCache:
+    """Bounded in-process LRU whose entries expire after a few seconds."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: str, ttl_seconds: Optional[float] = None):
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        self._entries.pop(key, None)
+
 
 class RedisManager:
-    def __init__(self, redis_url="redis://localhost:6379"):
-        self.redis = redis.from_url(redis_url, decode_responses=True)
-    
+    """Async Redis client on an explicitly configured connection pool.
+
+    Configured from the environment:
+
+    - ``REDIS_URL``: ``redis://localhost:6379`` by default.
+    - ``REDIS_MAX_CONNECTIONS``: pool size, 50 by default. Callers wait up
+      to ``REDIS_POOL_TIMEOUT_SECONDS`` (5) for a free connection.
+    - ``REDIS_SOCKET_TIMEOUT_SECONDS`` / ``REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS``:
+      5 and 2 by default.
+    - ``REDIS_HEALTH_CHECK_INTERVAL_SECONDS``: idle connections are pinged
+      before reuse after this long, 30 by default.
+    - ``REDIS_LOCAL_CACHE_SIZE`` / ``REDIS_LOCAL_CACHE_TTL_SECONDS``: the
+      in-process layer behind ``get_cached()``, 4096 keys for 30 seconds.
+      A size of 0 turns it off.
+
+    ``get_cached()`` and ``set_cached()`` are opt-in and meant for hot keys
+    that rarely change. This process sees its own writes and deletes at
+    once; a write from another process shows up after the local TTL.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            timeout=float(os.getenv("REDIS_POOL_TIMEOUT_SECONDS", "5")),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "5")),
+            socket_connect_timeout=float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS", "2")),
+            health_check_interval=int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL_SECONDS", "30")),
+            decode_responses=True,
+        )
+        self.redis = redis.Redis(connection_pool=self.pool)
+        self.local_cache = LocalTTLCache(
+            int(os.getenv("REDIS_LOCAL_CACHE_SIZE", "4096")),
+            float(os.getenv("REDIS_LOCAL_CACHE_TTL_SECONDS", "30")),
+        )
+
     async def get(self, key: str) -> str:
-        return await self.redis.get(key)
-    
+        with stage("redis_get", provider="redis"):
+            return await self.redis.get(key)
+
     async def set(self, key: str, value: str, expiration: int):
-        await self.redis.set(key, value, ex=expiration)
-    
+        with stage("redis_set", provider="redis"):
+            await self.redis.set(key, value, ex=expiration)
+
+    async def set_nx(self, key: str, value: str, expiration: int) -> bool:
+        """Set ``key`` only if it does not exist; True when this call set it."""
+        with stage("redis_set_nx", provider="redis"):
+            return bool(await self.redis.set(key, value, ex=expiration, nx=True))
+
+    async def get_cached(self, key: str, local_ttl: Optional[float] = None) -> Optional[str]:
+        """``get()`` served from the in-process layer while it is fresh.
+
+        Misses are not remembered locally, so a key set elsewhere is seen
+        on the next call.
+        """
+        value = self.local_cache.get(key)
+        if value is not None:
+            LOCAL_CACHE_LOOKUPS.inc(result="hit")
+            return value
+        LOCAL_CACHE_LOOKUPS.inc(result="miss")
+        value = await self.get(key)
+        if value is not None:
+            self.local_cache.set(key, value, local_ttl)
+        return value
+
+    async def set_cached(self, key: str, value: str, expiration: int, local_ttl: Optional[float] = None):
+        await self.set(key, value, expiration)
+        self.local_cache.set(key, value, local_ttl)
+
+    async def incr(self, key: str) -> int:
+        with stage("redis_incr", provider="redis"):
+            return await self.redis.incr(key)
+
     async def delete(self, key: str):
-        await self.redis.delete(key)
-    
+        self.local_cache.pop(key)
+        with stage("redis_delete", provider="redis"):
+            await self.redis.delete(key)
+
     async def get_json(self, key: str) -> dict:
         data = await self.get(key)
         return json.loads(data) if data else None
-    
+
     async def set_json(self, key: str, value: dict, expiration: int):
         await self.set(key, json.dumps(value), expiration)
+
+    async def hgetall(self, key: str) -> dict:
+        with stage("redis_hgetall", provider="redis"):
+            return await self.redis.hgetall(key)
+
+    async def hset(self, key: str, mapping: dict):
+        with stage("redis_hset", provider="redis"):
+            await self.redis.hset(key, mapping=mapping)
+
+    async def hdel(self, key: str, *fields: str):
+        if fields:
+            with stage("redis_hdel", provider="redis"):
+                await self.redis.hdel(key, *fields)
+
+    async def close(self):
+        await self.redis.aclose()
+        # A pool passed in is not closed by the client
+        await self.pool.aclose()
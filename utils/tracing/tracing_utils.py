@@ -0,0 +1,393 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from utils.logging.logging_utils import get_logger
+
+load_dotenv()
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("tracing_current_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a W3C traceparent."""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        sampled = bool(int(parts[3][:2], 16) & 1)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class _Trace:
+    __slots__ = ("span_count", "dropped_spans")
+
+    def __init__(self):
+        self.span_count = 0
+        self.dropped_spans = 0
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "error", "trace",
+    )
+
+    def __init__(self, trace: _Trace, trace_id: str, parent_span_id: Optional[str], name: str, kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.trace_id = trace_id
+        self.span_id = _new_id(64)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1_000_000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class InMemorySpanExporter:
+    """Keeps the most recent finished spans for /debug/traces."""
+
+    def __init__(self, capacity: int):
+        self._spans: deque = deque(maxlen=capacity)
+
+    def export(self, spans: List[Span]):
+        self._spans.extend(spans)
+
+    def traces(self) -> List[Dict[str, Any]]:
+        """Summaries of the retained traces, slowest root first."""
+        by_trace: Dict[str, List[Span]] = {}
+        for span in list(self._spans):
+            by_trace.setdefault(span.trace_id, []).append(span)
+        summaries = []
+        for trace_id, spans in by_trace.items():
+            # The root's parent is absent here, or remote when the caller sent a traceparent
+            span_ids = {span.span_id for span in spans}
+            root = next((span for span in spans if span.parent_span_id not in span_ids), spans[-1])
+            summaries.append({
+                "trace_id": trace_id,
+                "name": root.name,
+                "duration_ms": round((root.end_ns - root.start_ns) / 1_000_000, 3),
+                "spans": len(spans),
+                "errors": sum(1 for span in spans if span.error),
+            })
+        return sorted(summaries, key=lambda summary: summary["duration_ms"], reverse=True)
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        return sorted(
+            (span.to_dict() for span in list(self._spans) if span.trace_id == trace_id),
+            key=lambda span: span["start_ns"],
+        )
+
+
+class FileSpanExporter:
+    """Appends spans to a file as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        with open(self.path, "a") as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpSpanExporter:
+    """Posts spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, headers: Dict[str, str], service_name: str):
+        # Only needed when exporting over OTLP, so importing this module stays cheap
+        import httpx
+
+        self.endpoint = endpoint
+        self.headers = headers
+        self.service_name = service_name
+        self._client = httpx.Client(timeout=10)
+
+    def export(self, spans: List[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "editor-worker"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            "parentSpanId": span.parent_span_id or "",
+                            "name": span.name,
+                            "kind": span.kind,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+                            # 1 = OK, 2 = ERROR
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                        }
+                        for span in spans
+                    ],
+                }],
+            }],
+        }
+        response = self._client.post(self.endpoint, json=payload, headers=self.headers)
+        response.raise_for_status()
+
+
+def _otlp_headers(value: str) -> Dict[str, str]:
+    headers = {}
+    for pair in value.split(","):
+        key, _, header_value = pair.partition("=")
+        if key.strip():
+            headers[key.strip()] = header_value.strip()
+    return headers
+
+
+class Tracer:
+    """Head-sampled tracing with in-memory, file and OTLP exporters.
+
+    A new tracer is inert; ``configure()``, called by the app lifespan and
+    by each cron worker process, reads the environment and builds the
+    exporters, so importing this module creates no clients or threads.
+
+    Enabled with ``TRACING_ENABLED=true``. ``start_trace()`` opens a root
+    span and decides once, with probability ``TRACE_SAMPLE_RATIO``, whether
+    the whole trace is recorded. An incoming ``traceparent`` continues the
+    caller's trace id, but its sampled flag is only obeyed with
+    ``TRACE_TRUST_PARENT_SAMPLING=true``, e.g. behind a gateway that sets
+    it; otherwise anyone could force every request to be traced and the
+    local ratio applies. ``span()`` opens a child of the current span and
+    does nothing outside a sampled trace, so unsampled work costs one
+    context variable lookup per span. A trace keeps at most
+    ``TRACE_MAX_SPANS_PER_TRACE`` spans.
+
+    Finished spans are kept in memory (``TRACE_MEMORY_SPANS``, 20000) and
+    are also written, every ``TRACE_EXPORT_INTERVAL_SECONDS`` from a
+    background thread, to ``TRACE_FILE_PATH`` and to the collector at
+    ``OTEL_EXPORTER_OTLP_TRACES_ENDPOINT`` (or ``OTEL_EXPORTER_OTLP_ENDPOINT``
+    plus ``/v1/traces``) when those are set.
+    """
+
+    def __init__(self):
+        self.logger = None
+        self.enabled = False
+        self.sample_ratio = 0.0
+        self.trust_parent_sampling = False
+        self.max_spans_per_trace = 0
+        self.export_interval_seconds = 5.0
+        self.memory = InMemorySpanExporter(0)
+        self.exporters = []
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self):
+        """Read the tracing settings from the environment; safe to call again."""
+        self.shutdown()
+        self.logger = get_logger("Tracer")
+        self.enabled = os.getenv("TRACING_ENABLED") == "true"
+        self.sample_ratio = float(os.getenv("TRACE_SAMPLE_RATIO", "0.1"))
+        self.trust_parent_sampling = os.getenv("TRACE_TRUST_PARENT_SAMPLING") == "true"
+        self.max_spans_per_trace = int(os.getenv("TRACE_MAX_SPANS_PER_TRACE", "10000"))
+        self.export_interval_seconds = float(os.getenv("TRACE_EXPORT_INTERVAL_SECONDS", "5"))
+        self.memory = InMemorySpanExporter(int(os.getenv("TRACE_MEMORY_SPANS", "20000")))
+        self.exporters = []
+        if self.enabled:
+            self._configure_exporters()
+
+    def _configure_exporters(self):
+        file_path = os.getenv("TRACE_FILE_PATH")
+        if file_path:
+            self.exporters.append(FileSpanExporter(file_path))
+        endpoint = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+        if not endpoint and os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT").rstrip("/") + "/v1/traces"
+        if endpoint:
+            self.exporters.append(OtlpHttpSpanExporter(
+                endpoint,
+                _otlp_headers(os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")),
+                os.getenv("OTEL_SERVICE_NAME", "editor-fastapi-backend"),
+            ))
+
+    @contextmanager
+    def start_trace(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Optional[Tuple[str, str, bool]] = None, **attributes):
+        """Open the root span of a new trace, or of the caller's trace when
+        ``parent`` comes from a traceparent header."""
+        if not self.enabled:
+            yield None
+            return
+        if parent is not None and self.trust_parent_sampling:
+            sampled = parent[2]
+        else:
+            sampled = random.random() < self.sample_ratio
+        if not sampled:
+            # Children of an unsampled root must not attach to an outer trace
+            token = _current_span.set(None)
+            try:
+                yield None
+            finally:
+                _current_span.reset(token)
+            return
+        trace_id, parent_span_id = (parent[0], parent[1]) if parent is not None else (_new_id(128), None)
+        with self._open(Span(_Trace(), trace_id, parent_span_id, name, kind, attributes), is_root=True) as root:
+            yield root
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        trace = parent.trace
+        if trace.span_count >= self.max_spans_per_trace:
+            trace.dropped_spans += 1
+            yield None
+            return
+        with self._open(Span(trace, parent.trace_id, parent.span_id, name, kind, attributes)) as span:
+            yield span
+
+    @contextmanager
+    def _open(self, span: Span, is_root: bool = False):
+        span.trace.span_count += 1
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            if is_root and span.trace.dropped_spans:
+                span.attributes["dropped_spans"] = span.trace.dropped_spans
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        self.memory.export([span])
+        if not self.exporters:
+            return
+        with self._lock:
+            self._pending.append(span)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _export_loop(self):
+        while not self._stop.wait(self.export_interval_seconds):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                # Tracing must never take the service down with it
+                self.logger.warning("Span export failed", exporter=type(exporter).__name__, spans=len(spans), error=str(e))
+
+    def shutdown(self):
+        """Stop the export thread and export what is still pending."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.export_interval_seconds + 10)
+        self.flush()
+        self._thread = None
+        self._stop.clear()
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request.
+
+    The span is named after the matched route template, so paths with ids
+    do not each become their own span name.
+    """
+
+    def __init__(self, app, tracer: Optional[Tracer] = None):
+        self.app = app
+        self.tracer = tracer or TRACER
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        method = scope["method"]
+        status_code = None
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with self.tracer.start_trace(f"{method} {scope['path']}", kind=SPAN_KIND_SERVER, parent=traceparent, **{"http.method": method}) as root:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if root is not None:
+                    route = scope.get("route")
+                    if route is not None:
+                        root.name = f"{method} {route.path}"
+                        root.set_attribute("http.route", route.path)
+                    if status_code is not None:
+                        root.set_attribute("http.status_code", status_code)
+
+
+# Process-wide tracer, inert until configure(); worker processes each configure their own
+TRACER = Tracer()